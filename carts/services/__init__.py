@@ -1,3 +1,19 @@
 from .cart import clear_user_cart
+from .version import (
+    bulk_cart_change,
+    bump_cart_version,
+    bump_cart_versions,
+    cart_user_ids_for_product,
+    get_cart_version,
+    in_bulk_cart_change,
+)
 
-__all__ = ["clear_user_cart"]
+__all__ = [
+    "clear_user_cart",
+    "bulk_cart_change",
+    "bump_cart_version",
+    "bump_cart_versions",
+    "cart_user_ids_for_product",
+    "get_cart_version",
+    "in_bulk_cart_change",
+]
@@ -1,8 +1,11 @@
 from carts.models import CartItem
+from carts.services.version import bulk_cart_change
 
 
 def clear_user_cart(user) -> int:
     if not user:
         return 0
-    deleted_count, _ = CartItem.objects.filter(cart__user=user).delete()
+    # 행마다 post_delete 에서 카트를 조회해 버전을 올리지 않도록 한 번만 올린다
+    with bulk_cart_change(user.pk):
+        deleted_count, _ = CartItem.objects.filter(cart__user=user).delete()
     return deleted_count
@@ -0,0 +1,69 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.core.cache import cache
+from django.db import transaction
+
+from carts.models import CartItem
+
+CART_VERSION_PREFIX = "cart:version:"
+
+# 한 유저의 카트 아이템을 한꺼번에 지우는 동안 켠다. 행마다 버전을 올리지 않고 끝날 때 한 번만 올린다
+_bulk_cart_user_id = ContextVar("bulk_cart_user_id", default=None)
+
+
+def _version_key(user_id) -> str:
+    return f"{CART_VERSION_PREFIX}{user_id}"
+
+
+def _initial_version() -> int:
+    # 키가 유실(eviction)되어도 이전 값보다 큰 값에서 다시 시작하도록 ms 단위 시각으로 초기화
+    return int(time.time() * 1000)
+
+
+def get_cart_version(user_id) -> int:
+    key = _version_key(user_id)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, _initial_version(), timeout=None)
+        version = cache.get(key)
+    return int(version)
+
+
+def bump_cart_version(user_id) -> None:
+    if not user_id:
+        return
+    key = _version_key(user_id)
+    cache.add(key, _initial_version(), timeout=None)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, _initial_version(), timeout=None)
+
+
+def cart_user_ids_for_product(product_id) -> list[int]:
+    return list(
+        CartItem.objects.filter(product_id=product_id, cart__isnull=False)
+        .values_list("cart__user_id", flat=True)
+        .distinct()
+    )
+
+
+def bump_cart_versions(user_ids) -> None:
+    for user_id in user_ids:
+        bump_cart_version(user_id)
+
+
+@contextmanager
+def bulk_cart_change(user_id):
+    token = _bulk_cart_user_id.set(user_id)
+    try:
+        yield
+    finally:
+        _bulk_cart_user_id.reset(token)
+    transaction.on_commit(lambda: bump_cart_version(user_id), robust=True)
+
+
+def in_bulk_cart_change() -> bool:
+    return _bulk_cart_user_id.get() is not None
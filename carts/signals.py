@@ -0,0 +1,56 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from carts.models import Cart, CartItem
+from carts.services import bump_cart_version, bump_cart_versions, cart_user_ids_for_product, in_bulk_cart_change
+from products.models import Product
+
+PRICE_FIELDS = ("product_value", "discount_rate")
+
+
+def _cart_user_id(item: CartItem):
+    if not item.cart_id:
+        return None
+    cart = item._state.fields_cache.get("cart")
+    if cart is not None:
+        return cart.user_id
+    return Cart.objects.filter(pk=item.cart_id).values_list("user_id", flat=True).first()
+
+
+@receiver([post_save, post_delete], sender=CartItem)
+def bump_version_on_cart_item_change(sender, instance: CartItem, **kwargs):
+    if in_bulk_cart_change():
+        return  # bulk_cart_change 가 끝날 때 한 번 올린다
+    user_id = _cart_user_id(instance)
+    if user_id:
+        transaction.on_commit(lambda: bump_cart_version(user_id), robust=True)
+
+
+@receiver(pre_save, sender=Product)
+def _mark_price_changed(sender, instance: Product, update_fields=None, **kwargs):
+    instance._price_changed = False
+    if not instance.pk:
+        return
+    if update_fields is not None and not set(update_fields) & set(PRICE_FIELDS):
+        return  # 평점/재고 등 가격과 무관한 저장은 조회 생략
+
+    old = Product.objects.filter(pk=instance.pk).values(*PRICE_FIELDS).first()
+    if old is None:
+        return
+    instance._price_changed = any(old[f] != getattr(instance, f) for f in PRICE_FIELDS)
+
+
+@receiver(post_save, sender=Product)
+def bump_versions_on_price_change(sender, instance: Product, created, **kwargs):
+    if created or not getattr(instance, "_price_changed", False):
+        return
+    product_id = instance.pk
+    transaction.on_commit(lambda: bump_cart_versions(cart_user_ids_for_product(product_id)), robust=True)
+
+
+@receiver(pre_delete, sender=Product)
+def bump_versions_on_product_delete(sender, instance: Product, **kwargs):
+    # 삭제 후에는 cart_items.product 가 NULL 이 되어 대상 카트를 찾을 수 없으므로 삭제 전에 대상 유저를 수집
+    user_ids = cart_user_ids_for_product(instance.pk)
+    transaction.on_commit(lambda: bump_cart_versions(user_ids), robust=True)
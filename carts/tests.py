@@ -1,8 +1,11 @@
-from django.test import TestCase
+from django.core.cache import cache
+from django.test import TestCase, override_settings
 
 from carts.models import Cart, CartItem
+from carts.services import clear_user_cart, get_cart_version
 from products.models import Brand, Category, Product, Tag
 from users.models import User
+from utils.redis_stub import REDIS_STUB_CACHES
 
 
 class CartModelTest(TestCase):
@@ -82,3 +85,30 @@ class CartModelTest(TestCase):
         # 실제 수량 확인
         self.assertEqual(CartItem.objects.filter(cart=self.cart, product=self.product).count(), 1)
         self.assertEqual(CartItem.objects.get(cart=self.cart, product=self.product).amount, 5)
+
+
+@override_settings(CACHES=REDIS_STUB_CACHES)
+class ClearUserCartTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            email="clear@example.com", password="1234", username="비우기", nickname="clear"
+        )
+        self.cart, _ = Cart.objects.get_or_create(user=self.user)
+        self.products = [
+            Product.objects.create(product_name=f"상품{i}", product_value=1000, product_stock=10) for i in range(5)
+        ]
+
+    def _clear(self, count):
+        CartItem.objects.bulk_create(CartItem(cart=self.cart, product=p, amount=1) for p in self.products[:count])
+        version = get_cart_version(self.user.pk)
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            with self.assertNumQueries(2):  # 삭제할 아이템 조회 + DELETE, 아이템 수와 무관
+                self.assertEqual(clear_user_cart(self.user), count)
+        self.assertEqual(len(callbacks), 1)
+        self.assertEqual(get_cart_version(self.user.pk), version + 1)
+
+    def test_clear_bumps_version_once_regardless_of_item_count(self):
+        """카트를 비울 때 아이템마다 카트를 조회하거나 버전을 올리지 않는지 확인"""
+        self._clear(1)
+        self._clear(5)
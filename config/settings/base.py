@@ -19,6 +19,15 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+
+def getenv_bool(key: str, default: bool = False) -> bool:
+    v = os.getenv(key)
+    if v is None:
+        return default
+    v = v.strip().lower()
+    return v in ("1", "true", "t", "yes", "y", "on")
+
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
 
@@ -72,6 +81,7 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "utils.db_router.PrimaryPinMiddleware",
 ]
 
 ROOT_URLCONF = "config.urls"
@@ -103,6 +113,13 @@ DATABASES = {
         "NAME": BASE_DIR / "db.sqlite3",
     }
 }
+# 읽기 복제본 alias. 개발용 SQLite 는 같은 파일을 가리키고, 테스트에서는 별도 DB 로 만들어진다
+DATABASES["replica"] = {**DATABASES["default"]}
+DATABASE_ROUTERS = ["utils.db_router.PrimaryReplicaRouter"]
+# "replica" 로 두면 ReplicaReadMixin 을 쓴 뷰의 조회를 복제본으로 보낸다 (None 이면 모두 default)
+READ_REPLICA_ALIAS = None
+# 쓰기 요청 후 이 시간(초) 동안은 그 유저의 조회를 primary 로 고정한다 (복제 지연 대비)
+REPLICA_PIN_SECONDS = 5
 
 
 # Password validation
@@ -124,6 +141,23 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 
+# Password hashing
+# https://docs.djangoproject.com/en/5.2/topics/auth/passwords/
+# 첫 번째 해셔로 새 비밀번호를 저장하고, 나머지는 기존 해시 검증용으로 남긴다.
+# 다른 해셔로 저장된 비밀번호는 다음 로그인 성공 시 첫 번째 해셔로 자동 재해시된다.
+PASSWORD_HASHER_CHOICES = {
+    "argon2": "users.hashers.Argon2PasswordHasher",
+    "scrypt": "django.contrib.auth.hashers.ScryptPasswordHasher",
+    "pbkdf2": "django.contrib.auth.hashers.PBKDF2PasswordHasher",
+}
+PASSWORD_HASHER = os.getenv("PASSWORD_HASHER", "argon2")
+PASSWORD_HASHERS = [
+    PASSWORD_HASHER_CHOICES[PASSWORD_HASHER],
+    *(path for name, path in PASSWORD_HASHER_CHOICES.items() if name != PASSWORD_HASHER),
+    "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+]
+
+
 # Internationalization
 # https://docs.djangoproject.com/en/5.2/topics/i18n/
 
@@ -152,6 +186,9 @@ REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": ("users.auth.RedisBlacklistJWTAuthentication",),
     "DEFAULT_PERMISSION_CLASSES": ("rest_framework.permissions.IsAuthenticated",),
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
+    # 클라이언트 IP(요청 제한 ip 버킷)를 정할 때 믿을 프록시 수. 0 이면 X-Forwarded-For 를 무시하고 REMOTE_ADDR 를 쓴다.
+    # 리버스 프록시 뒤에 둘 때는 프록시 수만큼 지정해 프록시가 붙인 값만 쓰게 한다 (클라이언트가 보낸 값으로 버킷을 바꾸지 못하게)
+    "NUM_PROXIES": int(os.getenv("NUM_PROXIES", "0")),
 }
 
 SIMPLE_JWT = {
@@ -161,6 +198,28 @@ SIMPLE_JWT = {
     "ALGORITHM": "HS256",
 }
 
+# JWT 인증 캐시 (워커 로컬 TTL/LRU + Redis 스냅샷, pub/sub 로 무효화)
+AUTH_LOCAL_CACHE_MAXSIZE = 10000
+AUTH_BLACKLIST_LOCAL_TTL = 30
+AUTH_USER_LOCAL_TTL = 10
+AUTH_USER_CACHE_TTL = 60 * 5
+
+# 이메일 중복 확인용 Bloom 필터 (build_email_bloom). 2^24 비트(2MB), 해시 7개면 100만 건에서 오탐률 약 0.1%
+EMAIL_BLOOM_BITS = 1 << 24
+EMAIL_BLOOM_HASHES = 7
+
+# 비인증 엔드포인트 토큰 버킷: scope -> {차원: (버스트 용량, 초당 충전 토큰 수)}
+# ip = 클라이언트 IP 별, email = 요청 본문 email 별, route = 엔드포인트 전체 합계
+TOKEN_BUCKET_RATES = {
+    "auth": {"ip": (10, 0.2)},
+    "email_check": {"ip": (30, 2)},
+    # 로그인/가입은 시도마다 비밀번호 해시(기본 Argon2id, 한 번에 메모리 19MiB + 반복 2회)를 계산하므로
+    # 전체 합계(route)로 워커의 CPU 와 동시에 잡히는 해시 메모리의 상한을 둔다
+    "login": {"ip": (10, 0.2), "email": (5, 1 / 60), "route": (40, 20)},
+    "signup": {"ip": (5, 1 / 60), "route": (20, 5)},
+    "token_refresh": {"ip": (30, 0.5)},
+}
+
 # REDIS 설정
 REDIS_URL = os.getenv("REDIS_URL", "redis://127.0.0.1:6379/1")
 
@@ -182,19 +241,33 @@ SPECTACULAR_SETTINGS = {
 
 # 이메일 인증용
 EMAIL_BACKEND = "django.core.mail.backends.smtp.EmailBackend"
-EMAIL_HOST = "smtp.gmail.com"
-EMAIL_PORT = 587
-EMAIL_USE_TLS = True
+EMAIL_HOST = os.getenv("EMAIL_HOST", "smtp.gmail.com")
+EMAIL_PORT = int(os.getenv("EMAIL_PORT", "587"))
+EMAIL_USE_TLS = getenv_bool("EMAIL_USE_TLS", default=True)
+EMAIL_TIMEOUT = 10
 EMAIL_HOST_USER = os.getenv("EMAIL_HOST_USER")
 EMAIL_HOST_PASSWORD = os.getenv("EMAIL_HOST_PASSWORD")
 # FRONTEND_BASE_URL = "https://obestore.o-r.kr"
 DEFAULT_FROM_EMAIL = "ObeStore <3.obestore@gmail.com>"
+EMAIL_RESEND_COOLDOWN = 60
+
+# 메일 발송 큐 (run_mail_worker)
+MAIL_QUEUE_BATCH_SIZE = 50
+MAIL_QUEUE_MAX_ATTEMPTS = 5
+MAIL_QUEUE_RETRY_BASE_DELAY = 30
 
 # 네이버 소셜로그인용
 
 NAVER_CLIENT_ID = os.getenv("NAVER_CLIENT_ID")
 NAVER_CLIENT_SECRET = os.getenv("NAVER_CLIENT_SECRET")
 NAVER_REDIRECT_URI = "https://www.obestore.o-r.kr/auth/naver/callback/"
+NAVER_AUTHORIZE_URL = os.getenv("NAVER_AUTHORIZE_URL", "https://nid.naver.com/oauth2.0/authorize")
+NAVER_TOKEN_URL = os.getenv("NAVER_TOKEN_URL", "https://nid.naver.com/oauth2.0/token")
+NAVER_PROFILE_URL = os.getenv("NAVER_PROFILE_URL", "https://openapi.naver.com/v1/nid/me")
+# 네이버 API 호출 타임아웃 (초). DEADLINE 은 토큰 + 프로필 호출 전체에 대한 상한
+NAVER_HTTP_CONNECT_TIMEOUT = 2
+NAVER_HTTP_TIMEOUT = 3
+NAVER_CALLBACK_DEADLINE = 5
 
 # 포인트 적립
 REVIEW_REWARD_RATE = Decimal("0.10")
@@ -208,20 +281,33 @@ ORDER_POINT_MIN = None
 ORDER_POINT_MAX = None
 ORDER_POINT_ROUND = "floor"
 
+# 주문 미리보기 캐시 (카트 버전이 바뀌면 자동으로 무효화)
+ORDER_PREVIEW_CACHE_TIMEOUT = 60 * 10
+
+# 유저별 기본 배송지 id 캐시 (배송지 변경 시 무효화)
+DEFAULT_ADDRESS_CACHE_TIMEOUT = 60 * 60
+
+# 유저별 찜한 상품 id 집합(Redis SET) 유지 시간. 만료되면 다음 조회 때 DB 에서 다시 만든다
+WISHED_PRODUCT_IDS_TTL = 60 * 60 * 24
+
+# 리뷰 이미지 업로드를 저장소(S3)에 동시에 올리는 스레드 수
+REVIEW_IMAGE_UPLOAD_WORKERS = 4
+# 리뷰 이미지 WebP 변형 (run_review_image_worker). 변형 이름 -> 긴 변 최대 픽셀
+REVIEW_IMAGE_VARIANT_SIZES = {"thumbnail": 200, "medium": 800}
+REVIEW_IMAGE_WEBP_QUALITY = 80
+REVIEW_IMAGE_PROCESS_WORKERS = 2
+REVIEW_IMAGE_QUEUE_BATCH_SIZE = 20
+REVIEW_IMAGE_QUEUE_MAX_ATTEMPTS = 3
+
 
 # 토스
 TOSS_SECRET_KEY = os.getenv("TOSS_SECRET_KEY")
 TOSS_CLIENT_KEY = os.getenv("TOSS_CLIENT_KEY")
+TOSS_API_BASE_URL = os.getenv("TOSS_API_BASE_URL", "https://api.tosspayments.com")
+TOSS_HTTP_CONNECT_TIMEOUT = 3
+TOSS_HTTP_TIMEOUT = 10
 FRONT_RESULT_URL = os.getenv("FRONT_RESULT_URL")
 
-def getenv_bool(key: str, default: bool = False) -> bool:
-    v = os.getenv(key)
-    if v is None:
-        return default
-    v = v.strip().lower()
-    return v in ("1", "true", "t", "yes", "y", "on")
-
-
 USE_TOSS_BRIDGE = getenv_bool("USE_TOSS_BRIDGE", default=True)
 
 # 개발용으로 일단 전부 허용(배포시에는 프런트 주소만 명시해야함)
@@ -20,6 +20,15 @@ DATABASES = {
     }
 }
 
+# 읽기 복제본. DB_REPLICA_HOST 가 없으면 primary 를 가리키며 조회를 나누지 않는다
+DATABASES["replica"] = {
+    **DATABASES["default"],
+    "HOST": os.getenv("DB_REPLICA_HOST", DATABASES["default"]["HOST"]),
+    "PORT": os.getenv("DB_REPLICA_PORT", DATABASES["default"]["PORT"]),
+    "TEST": {"NAME": "test_obestore_replica"},
+}
+READ_REPLICA_ALIAS = "replica" if os.getenv("DB_REPLICA_HOST") else None
+
 # DJANGO STORAGES
 STORAGES = {
     "default": {
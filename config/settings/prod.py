@@ -21,6 +21,38 @@ DATABASES = {
     }
 }
 
+# DB 연결 재사용. 요청마다 TCP 연결/인증/백엔드 fork 를 하지 않도록 한다.
+# DB_POOL=true(기본): psycopg 연결 풀. DB_MAX_CONNECTIONS 를 gunicorn 워커 수(WEB_CONCURRENCY)로 나눠 워커별 상한을 정한다.
+# DB_POOL=false: 워커마다 연결 하나를 DB_CONN_MAX_AGE 초 동안 유지한다.
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", "2"))  # scripts/run.sh 의 gunicorn --workers 와 같은 값
+WEB_THREADS = int(os.getenv("WEB_THREADS", "1"))
+DB_MAX_CONNECTIONS = int(os.getenv("DB_MAX_CONNECTIONS", "20"))  # 이 앱이 쓸 PostgreSQL 연결 예산
+
+if getenv_bool("DB_POOL", default=True):  # noqa
+    # 풀은 워커 프로세스마다 따로 생기므로 예산을 워커 수로 나눈 값이 워커 하나의 상한
+    DB_POOL_MAX_SIZE = max(1, DB_MAX_CONNECTIONS // max(1, WEB_CONCURRENCY))
+    DATABASES["default"]["OPTIONS"] = {
+        "pool": {
+            "min_size": min(WEB_THREADS, DB_POOL_MAX_SIZE),  # 평소 동시에 쓰는 만큼은 미리 열어 둔다
+            "max_size": DB_POOL_MAX_SIZE,
+            "timeout": float(os.getenv("DB_POOL_TIMEOUT", "10")),  # 풀 연결을 기다리는 최대 시간(초)
+            "max_idle": 60 * 5,
+            "max_lifetime": 60 * 30,
+        }
+    }
+else:
+    DATABASES["default"]["CONN_MAX_AGE"] = int(os.getenv("DB_CONN_MAX_AGE", "60"))
+# 풀에서 꺼낼 때/재사용할 때 끊어진 연결인지 먼저 확인한다
+DATABASES["default"]["CONN_HEALTH_CHECKS"] = True
+
+# 읽기 복제본. 풀은 alias 마다 따로 생기므로 DB_MAX_CONNECTIONS 예산은 각 서버에 따로 적용된다
+DATABASES["replica"] = {
+    **DATABASES["default"],
+    "HOST": os.getenv("DB_REPLICA_HOST", DATABASES["default"]["HOST"]),
+    "PORT": os.getenv("DB_REPLICA_PORT", DATABASES["default"]["PORT"]),
+}
+READ_REPLICA_ALIAS = "replica" if os.getenv("DB_REPLICA_HOST") else None
+
 STATIC_ROOT = os.path.join(BASE_DIR, "staticfiles")  # noqa
 
 # DJANGO STORAGES
@@ -3,6 +3,7 @@ from django.urls import include, path
 from drf_spectacular.views import SpectacularAPIView, SpectacularRedocView, SpectacularSwaggerView
 
 from products.views import ProductQnaViewSet
+from utils.db_pool import DatabasePoolStatsView, HealthCheckView
 
 urlpatterns = [
     path("admin/", admin.site.urls),
@@ -18,6 +19,8 @@ urlpatterns = [
     path("", include("orders.urls")),
     path("", include("wishlists.urls")),
     path("reviews/", include("reviews.urls")),
+    path("health/", HealthCheckView.as_view(), name="health"),
+    path("metrics/db-pool/", DatabasePoolStatsView.as_view(), name="db-pool-stats"),
     # OpenAPI JSON Schema
     path("schema/", SpectacularAPIView.as_view(), name="schema"),
     # Swagger UI
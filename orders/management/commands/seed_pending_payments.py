@@ -0,0 +1,45 @@
+import csv
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from orders.models import Order, OrderProduct, Payment
+from products.models import Product
+from users.models import User
+
+PRICE = 1000
+
+
+class Command(BaseCommand):
+    help = (
+        "부하 테스트용으로 결제 대기(ready) 주문을 만들고 토스 승인 콜백에 쓸 orderId,amount 를 CSV 로 저장합니다. "
+        "locust_test/toss_confirm_locustfile.py 와 함께 사용합니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--count", type=int, default=1000)
+        parser.add_argument("--output", default="toss_payments.csv")
+        parser.add_argument("--email", default="bench-toss@obestore.local")
+
+    @transaction.atomic
+    def handle(self, *args, **options):
+        count = options["count"]
+        user, _ = User.objects.get_or_create(
+            email=options["email"],
+            defaults={"username": "bench", "nickname": "bench-toss", "phone_number": "01000000000"},
+        )
+        product = Product.objects.create(product_name="부하 테스트 상품", product_value=PRICE, product_stock=count)
+
+        orders = Order.objects.bulk_create(Order(user=user, subtotal=PRICE, total_payment=PRICE) for _ in range(count))
+        OrderProduct.objects.bulk_create(
+            OrderProduct(order=order, product=product, amount=1, price=PRICE, total_price=PRICE) for order in orders
+        )
+        payments = Payment.objects.bulk_create(
+            Payment(order=order, payment_amount=PRICE, toss_order_id=f"ORD-{order.order_number}") for order in orders
+        )
+
+        with open(options["output"], "w", newline="") as f:
+            writer = csv.writer(f)
+            for payment in payments:
+                writer.writerow([payment.toss_order_id, PRICE])
+        self.stdout.write(f"{count} pending payments written to {options['output']}")
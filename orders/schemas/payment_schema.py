@@ -31,25 +31,6 @@ PaymentSchema = extend_schema_view(
     ),
 )
 
-TossSuccessSchema = extend_schema(
-    summary="Toss 결제 성공 브리지",
-    description="Toss 결제 완료 후 PG/프론트에서 백엔드로 리다이렉트될 때 confirm(승인)을 수행합니다.",
-    tags=["payments"],
-    parameters=[
-        OpenApiParameter(name="paymentKey", type=OpenApiTypes.STR, location="query", required=True),
-        OpenApiParameter(name="orderId", type=OpenApiTypes.STR, location="query", required=True),
-        OpenApiParameter(name="amount", type=OpenApiTypes.INT, location="query", required=True),
-    ],
-    responses=inline_serializer(
-        name="TossSuccessResponse",
-        fields={
-            "status": serializers.CharField(),  # "success"
-            "order_number": serializers.CharField(),  # 내부 주문번호(표시용)
-            "receipt_url": serializers.CharField(allow_null=True, required=False),
-        },
-    ),
-)
-
 TossFailSchema = extend_schema(
     summary="Toss 결제 실패 브리지",
     description="Toss 결제 실패/취소 시 실패 정보를 백엔드로 전달합니다.",
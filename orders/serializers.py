@@ -1,9 +1,12 @@
+from django.db import transaction
 from drf_spectacular.utils import extend_schema_field
 from rest_framework import serializers
 
+from products.models import Product
 from users.models import Address
 
 from .models import Order, OrderProduct, Payment
+from .services.order_service import OrderService
 
 
 class OrderProductSerializer(serializers.ModelSerializer):
@@ -24,10 +27,16 @@ class OrderProductSerializer(serializers.ModelSerializer):
         return images.first().product_card_image.url
 
 
+class OrderProductWriteSerializer(serializers.Serializer):
+    # 상품은 OrderSerializer.validate_order_products 에서 id__in 한 번으로 검증
+    product = serializers.IntegerField()
+    amount = serializers.IntegerField(min_value=1, required=False, default=1)
+
+
 class OrderSerializer(serializers.ModelSerializer):
     user = serializers.PrimaryKeyRelatedField(read_only=True)
     address = serializers.PrimaryKeyRelatedField(queryset=Address.objects.all())
-    order_products = OrderProductSerializer(many=True, write_only=True)
+    order_products = OrderProductWriteSerializer(many=True, write_only=True)
     order_products_detail = OrderProductSerializer(source="order_products", many=True, read_only=True)
 
     class Meta:
@@ -55,12 +64,26 @@ class OrderSerializer(serializers.ModelSerializer):
             "delivery_status",
             "created_at",
             "subtotal",
+            "discount_amount",
+            "delivery_amount",
             "total_payment",
         ]
 
+    def validate_order_products(self, value):
+        if not value:
+            raise serializers.ValidationError("주문 상품이 비어 있습니다.")
+
+        product_ids = {item["product"] for item in value}
+        products = Product.objects.in_bulk(product_ids)
+        missing = sorted(product_ids - products.keys())
+        if missing:
+            raise serializers.ValidationError(f"존재하지 않는 상품입니다: {missing}")
+
+        for item in value:
+            item["product"] = products[item["product"]]
+        return value
+
     def validate(self, data):
-        if data.get("discount_amount", 0) < 0:
-            raise serializers.ValidationError("할인 금액은 0보다 작을 수 없습니다.")
         if data.get("used_point", 0) < 0:
             raise serializers.ValidationError("사용 포인트는 0보다 작을 수 없습니다.")
 
@@ -70,29 +93,42 @@ class OrderSerializer(serializers.ModelSerializer):
 
         return data
 
+    @transaction.atomic
     def create(self, validated_data):
         order_products_data = validated_data.pop("order_products", [])
-        order = Order.objects.create(**validated_data)
 
+        # 금액 계산은 OrderService 와 동일한 규칙(할인가 기준)으로 한 번에 처리
         subtotal = 0
+        discount_amount = 0
+        order_products = []
         for item in order_products_data:
             product = item["product"]
             amount = item.get("amount", 1)
-            price = product.product_value
-            total_price = price * amount
-
-            OrderProduct.objects.create(
-                order=order,
-                product=product,
-                amount=amount,
-                price=price,
-                total_price=total_price,
+            price = OrderService.compute_discounted_price(product)
+
+            discount_amount += (product.product_value - price) * amount
+            subtotal += price * amount
+            order_products.append(
+                OrderProduct(product=product, amount=amount, price=price, total_price=price * amount)
             )
-            subtotal += total_price
 
-        order.subtotal = subtotal
-        order.total_payment = subtotal - order.discount_amount - order.used_point + order.delivery_amount
-        order.save()
+        used_point = validated_data.get("used_point", 0)
+        delivery_amount = OrderService.compute_delivery_amount(subtotal)
+        total_payment = subtotal - used_point + delivery_amount
+        if total_payment < 0:
+            raise serializers.ValidationError({"total_payment": "결제 금액이 0보다 작을 수 없습니다."})
+
+        order = Order.objects.create(
+            **validated_data,
+            subtotal=subtotal,
+            discount_amount=discount_amount,
+            delivery_amount=delivery_amount,
+            total_payment=total_payment,
+        )
+
+        for order_product in order_products:
+            order_product.order = order
+        OrderProduct.objects.bulk_create(order_products)
         return order
 
 
@@ -1,20 +1,30 @@
+import hashlib
+import logging
 from decimal import Decimal
 from typing import Iterable, Optional
 
+from django.conf import settings
+from django.core.cache import cache
 from django.db import transaction
 from rest_framework.exceptions import ValidationError
 
 from carts.models import CartItem
+from carts.services import get_cart_version
 from orders.models import Order, OrderProduct
 from products.models import Product
 from users.models import Address
+from users.services.addresses import get_default_address_id
 from users.services.points import get_point_balance
 
+logger = logging.getLogger(__name__)
+
+PREVIEW_CACHE_PREFIX = "order:preview:"
+
 
 class OrderService:
     @staticmethod
     def _get_cart_items(user, cart_item_ids: Optional[Iterable[int]] = None):
-        qs = CartItem.objects.filter(cart__user=user)
+        qs = CartItem.objects.filter(cart__user=user).select_related("product")
         if cart_item_ids:
             qs = qs.filter(id__in=cart_item_ids)
         if not qs.exists():
@@ -30,20 +40,53 @@ class OrderService:
             return 0
         return BASE_DELIVERY_FEE
 
+    @staticmethod
+    def compute_discounted_price(product) -> int:
+        rate = product.discount_rate or Decimal("0")
+        return int(Decimal(product.product_value) * (Decimal("1") - rate))
+
     @staticmethod
     def compute_expected_point(base: int) -> int:
         return int(base * 0.01)
 
+    @staticmethod
+    def _preview_cache_key(user, cart_item_ids, used_point) -> str:
+        # 카트 버전 + 보유 포인트가 같으면 같은 결과이므로 DB 조회 없이 캐시를 사용
+        selected = ",".join(sorted({str(i) for i in cart_item_ids}))
+        digest = hashlib.md5(selected.encode()).hexdigest()
+        version = get_cart_version(user.pk)
+        return f"{PREVIEW_CACHE_PREFIX}{user.pk}:{version}:{get_point_balance(user)}:{digest}:{used_point}"
+
     @staticmethod
     def preview_order(user, data):
         cart_item_ids = data.get("cart_item_ids") or []
         if cart_item_ids and not isinstance(cart_item_ids, (list, tuple)):
             raise ValidationError({"cart_item_ids": "리스트 형태여야 합니다."})
 
-        cart_items = OrderService._get_cart_items(user, cart_item_ids)
-
         used_point = int(data.get("used_point") or 0)
 
+        try:
+            cache_key = OrderService._preview_cache_key(user, cart_item_ids, used_point)
+            cached = cache.get(cache_key)
+        except Exception:
+            logger.warning("order preview cache unavailable", exc_info=True)
+            cache_key, cached = None, None
+        if cached is not None:
+            return cached
+
+        preview = OrderService._compute_preview(user, cart_item_ids, used_point)
+
+        if cache_key:
+            try:
+                cache.set(cache_key, preview, timeout=getattr(settings, "ORDER_PREVIEW_CACHE_TIMEOUT", 60 * 10))
+            except Exception:
+                logger.warning("order preview cache unavailable", exc_info=True)
+        return preview
+
+    @staticmethod
+    def _compute_preview(user, cart_item_ids, used_point):
+        cart_items = OrderService._get_cart_items(user, cart_item_ids)
+
         user_point = get_point_balance(user)
         if used_point > user_point:
             raise ValidationError({"used_point": f"보유 포인트({user_point})보다 많이 사용할 수 없습니다."})
@@ -60,10 +103,7 @@ class OrderService:
                 continue
 
             original_price = p.product_value
-            rate = p.discount_rate or Decimal("0")
-            discounted_price = int(
-                Decimal(original_price) * (Decimal("1") - rate)
-            )
+            discounted_price = OrderService.compute_discounted_price(p)
             item_discount_total = (original_price - discounted_price) * item.amount
             product_discount_total += item_discount_total
             subtotal += discounted_price * item.amount
@@ -96,12 +136,12 @@ class OrderService:
         address_id = data.get("address")
 
         if address_id:
-            address = Address.objects.filter(id=address_id, user=user).first()
-            if not address:
+            if not Address.objects.filter(id=address_id, user=user).exists():
                 raise ValidationError({"address": "본인 배송지만 사용할 수 있습니다."})
         else:
-            address = Address.objects.filter(user=user, is_default=True).first()
-            if not address:
+            # 기본 배송지 id 는 캐시에서 읽고, 주문에는 id 만 넣으므로 배송지 행을 조회하지 않는다
+            address_id = get_default_address_id(user.pk)
+            if not address_id:
                 raise ValidationError({"address": "배송지 ID를 전달하지 않았고, 기본 배송지도 없습니다."})
 
         cart_item_ids = data.get("cart_item_ids") or []
@@ -132,8 +172,7 @@ class OrderService:
                 raise ValidationError({"stock": f"'{p.product_stock}' 재고 부족 (요청: {item.amount})"})
 
             original_price = p.product_value
-            rate = p.discount_rate or Decimal("0")
-            discounted_price = int(Decimal(original_price) * (Decimal("1") - rate))
+            discounted_price = OrderService.compute_discounted_price(p)
             item_discount_total = (original_price - discounted_price) * item.amount
             product_discount_total += item_discount_total
             subtotal += discounted_price * item.amount
@@ -148,7 +187,7 @@ class OrderService:
 
         order = Order.objects.create(
             user=user,
-            address=address,
+            address_id=address_id,
             subtotal=subtotal,
             discount_amount=discount_amount,
             delivery_amount=delivery_amount,
@@ -161,8 +200,7 @@ class OrderService:
         order_products = []
         for item in cart_items:
             p = item.product
-            rate = p.discount_rate or Decimal("0")
-            discounted_price = int(Decimal(p.product_value) * (Decimal("1") - rate))
+            discounted_price = OrderService.compute_discounted_price(p)
             order_products.append(
                 OrderProduct(
                     order=order,
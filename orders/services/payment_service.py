@@ -1,7 +1,8 @@
 import base64
-import json
+import logging
 
-import requests
+import httpx
+from asgiref.sync import sync_to_async
 from django.conf import settings
 from django.db import transaction
 from django.utils import timezone
@@ -11,6 +12,8 @@ from rest_framework.exceptions import PermissionDenied, ValidationError
 from orders.models import Payment
 from products.models import Product
 
+logger = logging.getLogger(__name__)
+
 
 class PaymentService:
     @staticmethod
@@ -68,9 +71,12 @@ class PaymentService:
         }
 
     @staticmethod
-    @transaction.atomic
-    def confirm_payment(payment_key, order_id, amount):
-        payment = Payment.objects.select_for_update().filter(toss_order_id=order_id).first()
+    def prepare_confirm(order_id, amount):
+        """
+        승인 요청 전 검증. 이미 승인된 결제면 그 결제를, 승인을 요청해도 되면 None 을 돌려준다.
+        토스 응답을 기다리는 동안 행 잠금을 잡고 있지 않도록 재고는 여기서 잠그지 않고 확인만 한다.
+        """
+        payment = Payment.objects.select_related("order").filter(toss_order_id=order_id).first()
         if not payment:
             raise ValidationError({"detail": "결제 정보 없음"})
 
@@ -81,35 +87,35 @@ class PaymentService:
         if payment.payment_status == "success":
             return payment
 
-        ops = list(order.order_products.select_related("product").all())
-        ids = [op.product_id for op in ops if op.product_id]
-        locked = {p.id: p for p in Product.objects.select_for_update().filter(id__in=ids)}
+        shortage = PaymentService._stock_shortage(order.order_products.select_related("product"))
+        if shortage is not None:
+            raise ValidationError({"detail": "재고 부족으로 결제를 진행할 수 없습니다.", "product_id": shortage})
+        return None
+
+    @staticmethod
+    def _stock_shortage(ops, products=None):
+        """재고가 모자란 주문 상품의 product_id (없으면 None)"""
         for op in ops:
-            p = locked.get(op.product_id)
+            p = products.get(op.product_id) if products is not None else op.product
             if (not p) or (getattr(p, "product_stock", 0) < op.amount):
-                raise ValidationError(
-                    {"detail": "재고 부족으로 결제를 진행할 수 없습니다.", "product_id": op.product_id}
-                )
+                return op.product_id
+        return None
 
-        secret = settings.TOSS_SECRET_KEY
-        auth = base64.b64encode((secret + ":").encode()).decode()
-        headers = {"Authorization": f"Basic {auth}", "Content-Type": "application/json"}
-        body = {"paymentKey": payment_key, "orderId": order_id, "amount": amount}
-
-        resp = requests.post(
-            "https://api.tosspayments.com/v1/payments/confirm",
-            data=json.dumps(body),
-            headers=headers,
-            timeout=10,
-        )
+    @staticmethod
+    @transaction.atomic
+    def complete_confirm(payment_key, order_id, status_code, data):
+        """
+        토스 승인 응답을 반영하고 (payment, error) 를 돌려준다.
+        실패 상태가 롤백되지 않도록 예외 대신 error 로 알린다. error["cancel"] 이 True 면 승인된 결제를 취소해야 한다.
+        """
+        payment = Payment.objects.select_for_update(of=("self",)).select_related("order").get(toss_order_id=order_id)
+        order = payment.order
 
-        if resp.status_code != 200:
-            try:
-                data = resp.json()
-                code, msg = data.get("code"), data.get("message")
-            except Exception:
-                code, msg = "UNKNOWN", "승인 실패"
+        if payment.payment_status == "success":
+            # 같은 결제의 콜백이 중복으로 와서 먼저 끝난 쪽이 이미 반영한 경우
+            return payment, None
 
+        def fail(code, msg):
             payment.payment_status = "failed"
             payment.fail_code = code
             payment.fail_message = msg
@@ -117,21 +123,97 @@ class PaymentService:
 
             order.order_status = "주문 실패"
             order.save(update_fields=["order_status", "updated_at"])
-            raise ValidationError({"detail": "결제 승인 실패", "code": code, "message": msg})
+
+        if status_code != 200:
+            code, msg = data.get("code", "UNKNOWN"), data.get("message", "승인 실패")
+            fail(code, msg)
+            return payment, {"detail": "결제 승인 실패", "code": code, "message": msg}
+
+        ops = list(order.order_products.all())
+        ids = [op.product_id for op in ops if op.product_id]
+        locked = {p.id: p for p in Product.objects.select_for_update().order_by("id").filter(id__in=ids)}
+        shortage = PaymentService._stock_shortage(ops, locked)
+        if shortage is not None:
+            # 승인 요청 사이에 다른 결제가 재고를 가져간 경우. 승인된 결제는 호출한 쪽에서 취소한다
+            fail("OUT_OF_STOCK", "재고 부족")
+            return payment, {
+                "detail": "재고 부족으로 결제를 진행할 수 없습니다.",
+                "product_id": shortage,
+                "cancel": True,
+            }
 
         for op in ops:
             p = locked[op.product_id]
             p.product_stock -= op.amount
         Product.objects.bulk_update(locked.values(), ["product_stock"])
 
-        data = resp.json()
         payment.payment_status = "success"
         payment.toss_payment_key = payment_key
-        payment.receipt_url = data.get("receipt", {}).get("url")
+        payment.receipt_url = (data.get("receipt") or {}).get("url")
         payment.approved_at = timezone.now()
         payment.save(update_fields=["payment_status", "toss_payment_key", "receipt_url", "approved_at", "updated_at"])
 
         order.order_status = "주문 완료"
         order.save(update_fields=["order_status", "updated_at"])
 
-        return payment
+        return payment, None
+
+    @staticmethod
+    async def _toss_request(method, path, body=None):
+        secret = settings.TOSS_SECRET_KEY or ""
+        auth = base64.b64encode((secret + ":").encode()).decode()
+        timeout = httpx.Timeout(settings.TOSS_HTTP_TIMEOUT, connect=settings.TOSS_HTTP_CONNECT_TIMEOUT)
+        async with httpx.AsyncClient(base_url=settings.TOSS_API_BASE_URL, timeout=timeout) as client:
+            resp = await client.request(method, path, json=body, headers={"Authorization": f"Basic {auth}"})
+        try:
+            data = resp.json()
+        except ValueError:
+            data = {}
+        return resp.status_code, data
+
+    @staticmethod
+    async def _lookup_approved(payment_key, order_id):
+        """토스 결제 조회 결과가 이 주문의 승인 완료(DONE)면 (200, 결제 객체), 아니면 None"""
+        status_code, data = await PaymentService._toss_request("GET", f"/v1/payments/{payment_key}")
+        if status_code == 200 and data.get("status") == "DONE" and data.get("orderId") == order_id:
+            return status_code, data
+        return None
+
+    @staticmethod
+    async def aconfirm_payment(payment_key, order_id, amount):
+        """
+        토스 결제 승인. DB 작업은 sync_to_async 로 감싸고, 토스 API 를 기다리는 동안에는
+        트랜잭션/행 잠금 없이 이벤트 루프를 양보한다.
+        승인 여부를 확인하지 못한 네트워크 오류(httpx.HTTPError)는 그대로 올린다. 이때 결제는 ready 로 남는다.
+        """
+        done = await sync_to_async(PaymentService.prepare_confirm)(order_id, amount)
+        if done is not None:
+            return done
+
+        body = {"paymentKey": payment_key, "orderId": order_id, "amount": amount}
+        try:
+            status_code, data = await PaymentService._toss_request("POST", "/v1/payments/confirm", body)
+        except httpx.TimeoutException:
+            # 응답만 못 받았을 뿐 토스는 승인했을 수 있으므로 결제 조회로 확인한다
+            approved = await PaymentService._lookup_approved(payment_key, order_id)
+            if approved is None:
+                raise
+            status_code, data = approved
+        else:
+            if status_code != 200 and data.get("code") == "ALREADY_PROCESSED_PAYMENT":
+                # 앞선 승인 요청이 타임아웃났지만 토스에서는 승인된 채로 다시 콜백이 온 경우
+                approved = await PaymentService._lookup_approved(payment_key, order_id)
+                if approved is not None:
+                    status_code, data = approved
+
+        payment, error = await sync_to_async(PaymentService.complete_confirm)(payment_key, order_id, status_code, data)
+        if error is None:
+            return payment
+        if error.pop("cancel", False):
+            try:
+                await PaymentService._toss_request(
+                    "POST", f"/v1/payments/{payment_key}/cancel", {"cancelReason": "재고 부족"}
+                )
+            except httpx.HTTPError:
+                logger.error("failed to cancel approved payment %s", payment_key, exc_info=True)
+        raise ValidationError(error)
@@ -1 +1,270 @@
-# Create your tests here.
+import asyncio
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from carts.models import Cart, CartItem
+from carts.services import get_cart_version
+from orders.models import Order, OrderProduct, Payment
+from orders.serializers import OrderSerializer
+from orders.services.order_service import OrderService
+from products.models import Brand, Category, Product, Tag
+from users.models import Address, User
+from utils.redis_stub import REDIS_STUB_CACHES
+from utils.upstream_stub import UpstreamStub
+
+
+class OrderSerializerCreateTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="order@example.com",
+            password="testpassword",
+            username="주문유저",
+            nickname="ordernick",
+            phone_number="01012345678",
+        )
+        self.address = Address.objects.create(
+            user=self.user,
+            address_name="집",
+            recipient="주문유저",
+            recipient_phone="01012345678",
+            post_code="12345",
+            address="서울시",
+            detail_address="101호",
+            is_default=True,
+        )
+
+        category = Category.objects.create(category_name="카테고리")
+        tag = Tag.objects.create(tag_name="태그")
+        brand = Brand.objects.create(brand_name="브랜드")
+        self.products = Product.objects.bulk_create(
+            [
+                Product(
+                    product_name=f"상품 {i}",
+                    product_value=10000,
+                    product_stock=100,
+                    discount_rate=Decimal("0.10"),
+                    category=category,
+                    tag=tag,
+                    brand=brand,
+                )
+                for i in range(50)
+            ]
+        )
+
+        self.request = RequestFactory().post("/orders/")
+        self.request.user = self.user
+
+    def _create_order(self, products, amount=1):
+        data = {
+            "address": self.address.id,
+            "order_products": [{"product": p.id, "amount": amount} for p in products],
+        }
+        serializer = OrderSerializer(data=data, context={"request": self.request})
+        serializer.is_valid(raise_exception=True)
+        return serializer.save(user=self.user)
+
+    def _count_queries(self, products):
+        with CaptureQueriesContext(connection) as ctx:
+            self._create_order(products)
+        return len(ctx.captured_queries)
+
+    def test_query_count_is_constant_regardless_of_line_count(self):
+        """주문 상품이 1개든 50개든 실행되는 쿼리 수가 같은지 확인"""
+        single = self._count_queries(self.products[:1])
+        many = self._count_queries(self.products)
+
+        self.assertEqual(single, many)
+
+    def test_totals_use_discounted_price(self):
+        """주문 금액이 OrderService 와 같이 할인가 기준으로 계산되는지 확인"""
+        order = self._create_order(self.products[:2], amount=3)
+
+        self.assertEqual(order.subtotal, 9000 * 3 * 2)
+        self.assertEqual(order.discount_amount, 1000 * 3 * 2)
+        self.assertEqual(order.delivery_amount, 0)
+        self.assertEqual(order.total_payment, 54000)
+        self.assertEqual(OrderProduct.objects.filter(order=order).count(), 2)
+        self.assertTrue(OrderProduct.objects.filter(order=order, price=9000, total_price=27000).exists())
+
+    def test_unknown_product_is_rejected(self):
+        """존재하지 않는 상품 id 가 포함되면 검증에서 거절되는지 확인"""
+        data = {
+            "address": self.address.id,
+            "order_products": [{"product": self.products[0].id}, {"product": 999999}],
+        }
+        serializer = OrderSerializer(data=data, context={"request": self.request})
+
+        self.assertFalse(serializer.is_valid())
+        self.assertIn("order_products", serializer.errors)
+
+
+@override_settings(CACHES=REDIS_STUB_CACHES)
+class OrderPreviewCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            email="preview@example.com", password="1234", username="미리보기", nickname="preview"
+        )
+        self.other = User.objects.create_user(
+            email="preview2@example.com", password="1234", username="미리보기2", nickname="preview2"
+        )
+        self.product = Product.objects.create(product_name="미리보기 상품", product_value=10000, product_stock=10)
+        self.cart, _ = Cart.objects.get_or_create(user=self.user)
+        self.item = CartItem.objects.create(cart=self.cart, product=self.product, amount=1)
+        other_cart, _ = Cart.objects.get_or_create(user=self.other)
+        CartItem.objects.create(cart=other_cart, product=self.product, amount=1)
+
+    def _preview(self, user=None):
+        return OrderService.preview_order(user or self.user, {})
+
+    def test_second_identical_preview_runs_no_queries(self):
+        """같은 카트 버전/포인트로 다시 미리보기하면 DB 를 조회하지 않는지 확인"""
+        first = self._preview()
+        with self.assertNumQueries(0):
+            self.assertEqual(self._preview(), first)
+
+    def test_cart_item_changes_bump_version(self):
+        """카트 아이템 추가/수정/삭제가 커밋되면 카트 버전이 바뀌고 미리보기를 다시 계산하는지 확인"""
+        other_product = Product.objects.create(product_name="추가 상품", product_value=5000, product_stock=10)
+        self._assert_change_reprices(
+            lambda: CartItem.objects.create(cart=self.cart, product=other_product, amount=1), 15000
+        )
+        self.item.amount = 3
+        self._assert_change_reprices(self.item.save, 35000)
+        self._assert_change_reprices(self.item.delete, 5000)
+
+    def test_price_change_invalidates_every_cart_holding_product(self):
+        """상품 가격/할인율이 바뀌면 그 상품을 담은 모든 유저의 미리보기가 바뀌는지 확인"""
+        self.assertEqual(self._preview(self.other)["subtotal"], 10000)
+        self.product.product_value = 20000
+        self._assert_change_reprices(self.product.save, 20000)
+        self.assertEqual(self._preview(self.other)["subtotal"], 20000)
+
+        self.product.discount_rate = Decimal("0.50")
+        self._assert_change_reprices(self.product.save, 10000)
+        self.assertEqual(self._preview(self.other)["subtotal"], 10000)
+
+    def test_product_delete_invalidates_carts_that_held_it(self):
+        """상품이 삭제되면 그 상품을 담았던 카트의 미리보기에서 빠지는지 확인"""
+        versions = {user.pk: get_cart_version(user.pk) for user in (self.user, self.other)}
+        self._preview(self.other)
+        self._assert_change_reprices(self.product.delete, 0)
+        self.assertNotEqual(get_cart_version(self.other.pk), versions[self.other.pk])
+        self.assertEqual(self._preview(self.other)["subtotal"], 0)
+
+    def _assert_change_reprices(self, change, subtotal):
+        before = self._preview()
+        version = get_cart_version(self.user.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            change()
+        self.assertNotEqual(get_cart_version(self.user.pk), version)
+        after = self._preview()
+        self.assertNotEqual(after, before)
+        self.assertEqual(after["subtotal"], subtotal)
+
+
+class TossConfirmBridgeTest(TestCase):
+    def setUp(self):
+        self.stub = UpstreamStub().start()
+        self.addCleanup(self.stub.stop)
+        self.settings_override = override_settings(
+            TOSS_API_BASE_URL=self.stub.base_url, TOSS_HTTP_TIMEOUT=1, FRONT_RESULT_URL=None
+        )
+        self.settings_override.enable()
+        self.addCleanup(self.settings_override.disable)
+
+        user = User.objects.create_user(
+            email="toss@example.com",
+            password="testpassword",
+            username="결제유저",
+            nickname="tossnick",
+            phone_number="01012345678",
+        )
+        self.product = Product.objects.create(product_name="결제 상품", product_value=5000, product_stock=3)
+        self.order = Order.objects.create(user=user, subtotal=10000, total_payment=10000)
+        OrderProduct.objects.create(order=self.order, product=self.product, amount=2, price=5000, total_price=10000)
+        self.payment = Payment.objects.create(
+            order=self.order, payment_amount=10000, toss_order_id=f"ORD-{self.order.order_number}"
+        )
+
+    def _confirm(self, payment_key="pk-1"):
+        params = {"paymentKey": payment_key, "orderId": self.payment.toss_order_id, "amount": 10000}
+        return self.async_client.get("/payments/toss/success/", params)
+
+    async def test_confirm_decrements_stock_and_completes_order(self):
+        """비동기 승인 콜백이 토스 응답을 받아 재고를 차감하고 결제/주문을 완료하는지 확인"""
+        response = await self._confirm()
+
+        self.assertEqual(response.status_code, 200)
+        await self.payment.arefresh_from_db()
+        await self.product.arefresh_from_db()
+        await self.order.arefresh_from_db()
+        self.assertEqual(self.payment.payment_status, "success")
+        self.assertEqual(self.payment.toss_payment_key, "pk-1")
+        self.assertEqual(self.product.product_stock, 1)
+        self.assertEqual(self.order.order_status, "주문 완료")
+
+    async def test_duplicate_callback_is_idempotent(self):
+        """같은 콜백이 다시 와도 재고를 두 번 차감하지 않는지 확인"""
+        await self._confirm()
+        response = await self._confirm()
+
+        self.assertEqual(response.status_code, 200)
+        await self.product.arefresh_from_db()
+        self.assertEqual(self.product.product_stock, 1)
+
+    async def test_rejected_payment_is_marked_failed(self):
+        """토스가 승인을 거절하면 400 을 돌려주고 실패 상태가 롤백되지 않고 남는지 확인"""
+        response = await self._confirm("fail-1")
+
+        self.assertEqual(response.status_code, 400)
+        await self.payment.arefresh_from_db()
+        await self.product.arefresh_from_db()
+        self.assertEqual(self.payment.payment_status, "failed")
+        self.assertEqual(self.payment.fail_code, "REJECT_CARD_PAYMENT")
+        self.assertEqual(self.product.product_stock, 3)
+
+    async def test_timeout_keeps_payment_ready_and_retry_applies_approval(self):
+        """승인 응답이 타임아웃나면 502 로 ready 를 유지하고, 토스가 이미 승인한 결제의 재시도는 조회 결과로 완료하는지 확인"""
+        self.stub.latency = 0.5
+        with override_settings(TOSS_HTTP_TIMEOUT=0.2):
+            response = await self._confirm()
+
+        self.assertEqual(response.status_code, 502)
+        await self.payment.arefresh_from_db()
+        self.assertEqual(self.payment.payment_status, "ready")
+        self.assertEqual(self.stub.payments["pk-1"]["status"], "DONE")
+
+        # 토스는 ALREADY_PROCESSED_PAYMENT 로 거절하지만 결제 조회로 승인 완료를 확인해 반영한다
+        self.stub.latency = 0
+        response = await self._confirm()
+
+        self.assertEqual(response.status_code, 200)
+        await self.payment.arefresh_from_db()
+        await self.product.arefresh_from_db()
+        await self.order.arefresh_from_db()
+        self.assertEqual(self.payment.payment_status, "success")
+        self.assertEqual(self.product.product_stock, 1)
+        self.assertEqual(self.order.order_status, "주문 완료")
+
+    async def test_out_of_stock_after_approval_cancels_payment(self):
+        """승인을 기다리는 사이 재고가 팔리면 결제를 실패로 남기고 토스 승인을 취소하는지 확인"""
+
+        async def sell_out():
+            await asyncio.sleep(0.1)
+            await Product.objects.filter(pk=self.product.pk).aupdate(product_stock=1)
+
+        self.stub.latency = 0.3
+        response, _ = await asyncio.gather(self._confirm(), sell_out())
+
+        self.assertEqual(response.status_code, 400)
+        await self.payment.arefresh_from_db()
+        await self.product.arefresh_from_db()
+        self.assertEqual(self.payment.payment_status, "failed")
+        self.assertEqual(self.payment.fail_code, "OUT_OF_STOCK")
+        self.assertEqual(self.product.product_stock, 1)
+        self.assertEqual(self.stub.payments["pk-1"]["status"], "CANCELED")
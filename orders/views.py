@@ -1,21 +1,28 @@
+import logging
 from urllib.parse import urlencode
 
+import httpx
 from django.conf import settings
 from django.db import transaction
+from django.http import JsonResponse
 from django.shortcuts import redirect
+from django.views import View
 from drf_spectacular.utils import extend_schema
 from rest_framework import permissions, status, viewsets
-from rest_framework.exceptions import MethodNotAllowed
+from rest_framework.exceptions import APIException, MethodNotAllowed
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from orders.models import Order, Payment
 from orders.schemas.order_schema import OrderPreviewSchema, OrderSchema
-from orders.schemas.payment_schema import PaymentSchema, TossFailSchema, TossSuccessSchema
+from orders.schemas.payment_schema import PaymentSchema, TossFailSchema
 from orders.serializers import OrderSerializer, PaymentSerializer, ReadyPaymentResponseSerializer
 from orders.services.order_service import OrderService
 from orders.services.payment_service import PaymentService
+from utils.db_router import ReplicaReadMixin
+
+logger = logging.getLogger(__name__)
 
 
 class IsOwnerOrAdmin(permissions.BasePermission):
@@ -31,10 +38,11 @@ class OrderPreview(APIView):
         return Response(data, status=status.HTTP_200_OK)
 
 @OrderSchema
-class OrderViewSet(viewsets.ModelViewSet):
+class OrderViewSet(ReplicaReadMixin, viewsets.ModelViewSet):
     queryset = Order.objects.all().select_related("user", "address").prefetch_related("order_products__product")
     serializer_class = OrderSerializer
     permission_classes = [permissions.IsAuthenticated, IsOwnerOrAdmin]
+    replica_actions = ("list", "retrieve")
 
     http_method_names = ["get", "post", "patch"]
 
@@ -138,33 +146,37 @@ class PaymentViewSet(viewsets.ModelViewSet):
         return Response(ReadyPaymentResponseSerializer(data).data, status=200)
 
 
-@TossSuccessSchema
-class TossSuccessBridge(APIView):
-    permission_classes = [AllowAny]
+class TossSuccessBridge(View):
+    """
+    async 뷰: 토스 승인 API 를 기다리는 동안 워커(이벤트 루프)가 다른 요청을 처리할 수 있다.
+    ORM 작업은 PaymentService 에서 sync_to_async 로 감싼다. (DRF APIView 는 async 를 지원하지 않아 Django View 를 쓴다)
+    """
 
-    @transaction.atomic
-    def get(self, request):
-        payment_key = request.query_params.get("paymentKey")
-        order_id = request.query_params.get("orderId")
-        amount_qs = request.query_params.get("amount")
+    async def get(self, request):
+        payment_key = request.GET.get("paymentKey")
+        order_id = request.GET.get("orderId")
+        amount_qs = request.GET.get("amount")
         if not (payment_key and order_id and amount_qs):
-            return Response({"detail": "필수 파라미터 누락"}, status=400)
+            return JsonResponse({"detail": "필수 파라미터 누락"}, status=400)
         try:
             amount = int(amount_qs)
         except (TypeError, ValueError):
-            return Response({"detail": "amount가 유효하지 않습니다."}, status=400)
+            return JsonResponse({"detail": "amount가 유효하지 않습니다."}, status=400)
 
         try:
-            payment = PaymentService.confirm_payment(payment_key, order_id, amount)
-        except Exception as e:
-            detail = getattr(e, "detail", {"detail": str(e)})
-            return Response(detail, status=400)
+            payment = await PaymentService.aconfirm_payment(payment_key, order_id, amount)
+        except APIException as e:
+            return JsonResponse(e.detail, status=400, json_dumps_params={"ensure_ascii": False})
+        except httpx.HTTPError:
+            # 결제 조회로도 승인 여부를 알 수 없으므로 결제는 ready 로 두고, 같은 콜백을 다시 받으면 승인을 재시도한다
+            logger.warning("toss confirm upstream failed for %s", order_id, exc_info=True)
+            return JsonResponse({"detail": "결제 승인 결과를 확인할 수 없습니다. 잠시 후 다시 시도해주세요."}, status=502)
 
         order = payment.order
 
         front_result = getattr(settings, "FRONT_RESULT_URL", None)
         if not front_result:
-            return Response(
+            return JsonResponse(
                 {
                     "status": "success",
                     "order_number": str(order.order_number),
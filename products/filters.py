@@ -14,15 +14,12 @@ class ProductFilter(filters.FilterSet):
         fields = ["category_name", "min_rating", "has_review", "has_dc_rate"]
 
     def filter_has_review(self, queryset, name, value):
-        from django.db.models import Count
-
-        queryset = queryset.annotate(review_count=Count("product_reviews"))
         if value is None:
             return queryset
         if value:
-            return queryset.filter(review_count__gt=0)
+            return queryset.filter(rating_count__gt=0)
         else:
-            return queryset.filter(review_count=0)
+            return queryset.filter(rating_count=0)
 
     def filter_has_dc_rate(self, queryset, name, value):
         if value is None:
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.18 on 2026-10-19 18:15
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def backfill_rating_counters(apps, schema_editor):
+    Product = apps.get_model("products", "Product")
+    Review = apps.get_model("reviews", "Review")
+    totals = (
+        Review.objects.exclude(product=None)
+        .order_by()
+        .values("product_id")
+        .annotate(rating_sum=Sum("rating"), rating_count=Count("id"))
+    )
+    Product.objects.bulk_update(
+        [
+            Product(pk=row["product_id"], rating_sum=row["rating_sum"], rating_count=row["rating_count"])
+            for row in totals.iterator()
+        ],
+        ["rating_sum", "rating_count"],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0002_initial'),
+        ('reviews', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='rating_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='rating_sum',
+            field=models.DecimalField(decimal_places=1, default=0, max_digits=12),
+        ),
+        migrations.RunPython(backfill_rating_counters, migrations.RunPython.noop),
+    ]
@@ -61,6 +61,9 @@ class Product(TimestampModel):
     product_stock = models.IntegerField(null=False, blank=False)
     discount_rate = models.DecimalField(max_digits=3, decimal_places=2, null=False, blank=False, default=0)
     product_rating = models.DecimalField(max_digits=2, decimal_places=1, null=False, blank=False, default=0)
+    # 리뷰 저장/삭제 시 F() 로 누적하고 product_rating 은 이 두 값에서 계산한다 (reviews.services.ratings)
+    rating_sum = models.DecimalField(max_digits=12, decimal_places=1, default=0)
+    rating_count = models.IntegerField(default=0)
     sales = models.IntegerField(null=False, blank=False, default=0)
     category = models.ForeignKey(Category, on_delete=models.SET_NULL, null=True, related_name="products")
     tag = models.ForeignKey(Tag, on_delete=models.SET_NULL, null=True, related_name="products")
@@ -1,8 +1,10 @@
+from django.db import models
 from drf_spectacular.utils import extend_schema_field
 from rest_framework import serializers
 
 from products.models import BrandImage, Product, ProductImage, ProductQna
 from wishlists.models import Wishlist
+from wishlists.services.wished import wished_among
 
 
 class ProductImageSerializer(serializers.ModelSerializer):
@@ -25,6 +27,17 @@ class BrandImageSerializer(serializers.ModelSerializer):
         fields = ["brand_image"]
 
 
+class ProductListListSerializer(serializers.ListSerializer):
+    def to_representation(self, data):
+        # 목록 전체의 찜 여부를 Redis 한 번(SMISMEMBER)으로 구해 두고 각 상품은 그 결과를 쓴다
+        request = self.context.get("request")
+        if self.context.get("is_wished") is None and request is not None and request.user.is_authenticated:
+            if isinstance(data, models.Manager):
+                data = list(data.all())
+            self.context["wished_product_ids"] = wished_among(request.user.pk, [item.pk for item in data])
+        return super().to_representation(data)
+
+
 class ProductListSerializer(serializers.ModelSerializer):
     category_name = serializers.CharField(source="category.category_name", read_only=True)
     tag_name = serializers.CharField(source="tag.tag_name", read_only=True)
@@ -40,6 +53,7 @@ class ProductListSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Product
+        list_serializer_class = ProductListListSerializer
         fields = [
             "id",
             "product_name",
@@ -73,21 +87,45 @@ class ProductListSerializer(serializers.ModelSerializer):
         except Exception:
             return obj.product_value
 
+    @extend_schema_field(int)
     def get_wishes(self, obj):
+        # 목록 쿼리에서 wish_count 를 annotate 했으면 상품마다 COUNT 하지 않는다
+        if hasattr(obj, "wish_count"):
+            return obj.wish_count
         return Wishlist.objects.filter(product=obj).count()
 
+    @extend_schema_field(bool)
     def get_is_wished(self, obj):
+        # 찜 목록처럼 이미 찜한 상품만 보여주는 경우 context 로 알려주면 조회하지 않는다
+        if self.context.get("is_wished") is not None:
+            return self.context["is_wished"]
         user = self.context["request"].user
         if not user.is_authenticated:
             return False
-        return Wishlist.objects.filter(product=obj, user=user).exists()
+        wished = self.context.get("wished_product_ids")
+        if wished is None:
+            wished = wished_among(user.pk, [obj.pk])
+        return obj.pk in wished
 
 
 class ProductDetailSerializer(ProductListSerializer):
     reviews = serializers.SerializerMethodField()
+    rating_histogram = serializers.SerializerMethodField()
+    keyword_summary = serializers.SerializerMethodField()
 
     class Meta(ProductListSerializer.Meta):
-        fields = ProductListSerializer.Meta.fields + ["reviews"]
+        fields = ProductListSerializer.Meta.fields + ["rating_count", "rating_histogram", "keyword_summary", "reviews"]
+
+    @extend_schema_field({"type": "object", "additionalProperties": {"type": "integer"}})
+    def get_rating_histogram(self, obj):
+        from reviews.services.ratings import rating_histogram  # 순환 참조 방지
+
+        return rating_histogram(obj.pk)
+
+    def get_keyword_summary(self, obj):
+        from reviews.services.keyword_tally import keyword_summary  # 순환 참조 방지
+
+        return keyword_summary(obj.pk)
 
     def get_reviews(self, obj):
         from reviews.serializers import ReviewSerializer  # 순환 참조 방지
@@ -1 +1,45 @@
-# Create your tests here.
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from products.models import Product
+from users.models import User
+
+
+# 복제본 대신 별도 테스트 DB(replica)를 쓰고, primary 고정 표시는 로컬 메모리 캐시에 둔다
+@override_settings(
+    READ_REPLICA_ALIAS="replica",
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+)
+class ReplicaReadTest(TestCase):
+    databases = {"default", "replica"}
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            email="replica@example.com", password="1234", nickname="replica", username="복제"
+        )
+        # 복제 지연 상황: primary 에만 있는 상품과 복제본에만 남아 있는 상품
+        self.primary = Product.objects.create(product_name="새 상품", product_value="1000", product_stock="5")
+        self.replica = Product.objects.using("replica").create(
+            product_name="지연 상품", product_value="1000", product_stock="5"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def _product_names(self):
+        return [item["product_name"] for item in self.client.get("/products/").data]
+
+    def test_reads_follow_replica_until_user_writes(self):
+        """조회 전용 뷰는 복제본에서 읽고, 쓰기 요청을 보낸 유저는 잠시 primary 에서 읽는지 확인"""
+        self.assertEqual(self._product_names(), ["지연 상품"])
+        self.assertEqual(APIClient().get("/products/").data[0]["product_name"], "지연 상품")
+
+        # 쓰기 요청 자체와 그 뒤의 잔액처럼 복제본 대상이 아닌 조회는 primary 로 간다
+        response = self.client.post("/users/me/wishlist/", {"product_id": self.primary.pk})
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(self._product_names(), ["새 상품"])
+        self.assertEqual(self.client.get("/users/me/wishlist/ids/").data, {"product_ids": [self.primary.pk]})
+
+        cache.clear()  # REPLICA_PIN_SECONDS 경과
+        self.assertEqual(self._product_names(), ["지연 상품"])
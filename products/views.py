@@ -1,17 +1,22 @@
-from django.db.models import Count
+from django.db.models import F
 from django_filters.rest_framework import DjangoFilterBackend
 from drf_spectacular.utils import OpenApiResponse, extend_schema, extend_schema_view
 from rest_framework import filters, viewsets
+from rest_framework.decorators import action
 from rest_framework.exceptions import NotFound, ValidationError
 from rest_framework.generics import ListAPIView
 from rest_framework.permissions import AllowAny, IsAdminUser, IsAuthenticated
+from rest_framework.response import Response
 
 from products.filters import ProductFilter
 from products.models import Product, ProductQna
 from products.serializers import ProductListSerializer, ProductQnaCreateSerializer, ProductQnaSerializer
+from reviews.serializers import KeywordSummarySerializer
+from reviews.services.keyword_tally import TOP_KEYWORD_LIMIT, keyword_summary
+from utils.db_router import ReplicaReadMixin
 
 
-class ProductViewSet(viewsets.ReadOnlyModelViewSet):
+class ProductViewSet(ReplicaReadMixin, viewsets.ReadOnlyModelViewSet):
     serializer_class = ProductListSerializer
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_class = ProductFilter
@@ -19,6 +24,7 @@ class ProductViewSet(viewsets.ReadOnlyModelViewSet):
     ordering_fields = ["sales", "product_value", "created_at", "review_count"]
     ordering = ["-created_at"]
     permission_classes = [AllowAny]
+    replica_actions = ("list", "retrieve", "keywords")
 
     def clean_parms(self, request):
         parms = request.query_params.copy()
@@ -35,7 +41,7 @@ class ProductViewSet(viewsets.ReadOnlyModelViewSet):
         ordering_param = self.request.query_params.get("ordering")
 
         if ordering_param and ordering_param.lstrip("-") == "review_count":
-            queryset = queryset.annotate(review_count=Count("product_reviews"))
+            queryset = queryset.annotate(review_count=F("rating_count"))
 
         if ordering_param and ordering_param.lstrip("-") not in self.ordering_fields:
             raise ValidationError({"ordering": "지원하지않음"})
@@ -81,6 +87,20 @@ class ProductViewSet(viewsets.ReadOnlyModelViewSet):
     def retrieve(self, request, *args, **kwargs):
         return super().retrieve(request, *args, **kwargs)
 
+    @extend_schema(
+        summary="상품 리뷰 키워드 요약",
+        description="리뷰에서 많이 선택된 키워드 상위 목록과 긍정/중립/부정별 선택 수를 조회합니다.",
+        responses=OpenApiResponse(KeywordSummarySerializer),
+    )
+    @action(detail=True, methods=["get"], url_path="keywords")
+    def keywords(self, request, pk=None):
+        product = self.get_object()
+        try:
+            limit = min(max(int(request.query_params.get("limit") or TOP_KEYWORD_LIMIT), 1), 20)
+        except ValueError:
+            raise ValidationError({"limit": "숫자를 입력해주세요."})
+        return Response(KeywordSummarySerializer(keyword_summary(product.pk, limit=limit)).data)
+
 
 class ProductQnaViewSet(viewsets.ModelViewSet):
     queryset = ProductQna.objects.all()
@@ -165,7 +185,7 @@ class ProductQnaViewSet(viewsets.ModelViewSet):
         responses=OpenApiResponse(ProductQnaSerializer),
     )
 )
-class ProductQnaListView(ListAPIView):
+class ProductQnaListView(ReplicaReadMixin, ListAPIView):
     serializer_class = ProductQnaSerializer
 
     def get_queryset(self):
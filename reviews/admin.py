@@ -1,6 +1,7 @@
 from django.contrib import admin
 
 from .models import Keyword, Review, ReviewImage, ReviewKeyword
+from .services.search import search_reviews
 
 
 class ReviewImageInline(admin.TabularInline):
@@ -20,6 +21,10 @@ class ReviewAdmin(admin.ModelAdmin):
     list_filter = ("created_at",)
     inlines = [ReviewImageInline, ReviewKeywordInline]
 
+    def get_search_results(self, request, queryset, search_term):
+        # 제목/본문 LIKE 대신 API 와 같은 전문 검색(search_text 인덱스)을 쓴다
+        return search_reviews(queryset, search_term), False
+
 
 @admin.register(ReviewImage)
 class ReviewImageAdmin(admin.ModelAdmin):
@@ -1,12 +1,17 @@
 from django_filters import rest_framework as filters
 
 from reviews.models import Review
+from reviews.services.search import search_reviews
 
 
 class ReviewFilter(filters.FilterSet):
     product_name = filters.CharFilter(field_name="product__product_name", lookup_expr="icontains")
     product_id = filters.CharFilter(field_name="product__id")
+    q = filters.CharFilter(method="filter_q", label="리뷰 제목/본문 검색어")
 
     class Meta:
         model = Review
-        fields = ["product_name", "product_id"]
+        fields = ["product_name", "product_id", "q"]
+
+    def filter_q(self, queryset, name, value):
+        return search_reviews(queryset, value)
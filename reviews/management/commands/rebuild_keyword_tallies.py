@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from reviews.services.keyword_tally import DEFAULT_CHUNK_SIZE, rebuild_keyword_tallies
+
+
+class Command(BaseCommand):
+    help = "리뷰 키워드 기준으로 상품별 키워드 집계(product_keyword_tallies)를 다시 만듭니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        total = 0
+        for count in rebuild_keyword_tallies(chunk_size=options["chunk_size"]):
+            total += count
+        self.stdout.write(self.style.SUCCESS(f"{total}개 상품 키워드 집계 재생성 완료"))
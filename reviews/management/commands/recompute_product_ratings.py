@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from reviews.services.ratings import DEFAULT_CHUNK_SIZE, recompute_product_ratings
+
+
+class Command(BaseCommand):
+    help = "리뷰 테이블 기준으로 상품의 별점 합계/리뷰 수/평균 별점을 다시 계산해 어긋난 값을 보정합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        fixed = 0
+        for count in recompute_product_ratings(chunk_size=options["chunk_size"]):
+            fixed += count
+        self.stdout.write(self.style.SUCCESS(f"{fixed}개 상품 별점 보정 완료"))
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from reviews.services.images import pending_image_ids, queue_image_variants, run_review_image_worker
+
+
+class Command(BaseCommand):
+    help = "리뷰 이미지 변형(WebP 썸네일/중간 크기) 생성 큐를 처리합니다. 렌더링은 프로세스 풀, 업로드는 스레드로 병렬 처리합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=None)
+        parser.add_argument("--poll-timeout", type=int, default=5)
+        parser.add_argument("--once", action="store_true", help="큐가 빌 때까지만 처리하고 종료")
+        parser.add_argument("--backfill", action="store_true", help="변형이 없는 기존 이미지를 먼저 큐에 넣음")
+
+    def handle(self, *args, **options):
+        if options["backfill"]:
+            image_ids = list(pending_image_ids())
+            queue_image_variants(image_ids)
+            self.stdout.write(f"{len(image_ids)}개 이미지를 큐에 넣었습니다.")
+
+        self.stdout.write("review image worker started")
+        run_review_image_worker(
+            batch_size=options["batch_size"], poll_timeout=options["poll_timeout"], once=options["once"]
+        )
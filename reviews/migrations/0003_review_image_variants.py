@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-19 18:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='reviewimage',
+            name='medium_image',
+            field=models.ImageField(blank=True, default='', max_length=255, upload_to=''),
+        ),
+        migrations.AddField(
+            model_name='reviewimage',
+            name='thumbnail_image',
+            field=models.ImageField(blank=True, default='', max_length=255, upload_to=''),
+        ),
+    ]
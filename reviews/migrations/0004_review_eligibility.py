@@ -0,0 +1,66 @@
+# Generated by Django 5.2.18 on 2026-10-19 18:20
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Exists, Max, OuterRef
+
+
+def backfill_review_eligibility(apps, schema_editor):
+    OrderProduct = apps.get_model("orders", "OrderProduct")
+    Review = apps.get_model("reviews", "Review")
+    ReviewEligibility = apps.get_model("reviews", "ReviewEligibility")
+
+    delivered = (
+        OrderProduct.objects.filter(order__delivery_status="배송 완료", order__user__isnull=False, product__isnull=False)
+        .order_by()
+        .values("order__user_id", "product_id")
+        .annotate(
+            delivered_at=Max("order__updated_at"),
+            reviewed=Exists(Review.objects.filter(user_id=OuterRef("order__user_id"), product_id=OuterRef("product_id"))),
+        )
+    )
+    batch = []
+    for row in delivered.iterator(chunk_size=2000):
+        batch.append(
+            ReviewEligibility(
+                user_id=row["order__user_id"],
+                product_id=row["product_id"],
+                reviewed=row["reviewed"],
+                created_at=row["delivered_at"],
+            )
+        )
+        if len(batch) >= 2000:
+            ReviewEligibility.objects.bulk_create(batch, ignore_conflicts=True)
+            batch = []
+    ReviewEligibility.objects.bulk_create(batch, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0002_initial'),
+        ('products', '0003_product_rating_counters'),
+        ('reviews', '0003_review_image_variants'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReviewEligibility',
+            fields=[
+                ('pk', models.CompositePrimaryKey('user', 'product', blank=True, editable=False, primary_key=True, serialize=False)),
+                ('reviewed', models.BooleanField(default=False)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='review_eligibilities', to='products.product')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='review_eligibilities', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': '리뷰 작성 가능 상품',
+                'verbose_name_plural': '리뷰 작성 가능 상품 목록',
+                'db_table': 'review_eligibility',
+            },
+        ),
+        migrations.RunPython(backfill_review_eligibility, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 5.2.18 on 2026-10-19 18:22
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def backfill_keyword_tallies(apps, schema_editor):
+    ReviewKeyword = apps.get_model("reviews", "ReviewKeyword")
+    ProductKeywordTally = apps.get_model("reviews", "ProductKeywordTally")
+    rows = (
+        ReviewKeyword.objects.filter(review__product__isnull=False)
+        .order_by()
+        .values("review__product_id", "keyword_id")
+        .annotate(review_count=Count("id"))
+    )
+    ProductKeywordTally.objects.bulk_create(
+        (
+            ProductKeywordTally(
+                product_id=row["review__product_id"], keyword_id=row["keyword_id"], review_count=row["review_count"]
+            )
+            for row in rows.iterator()
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0003_product_rating_counters'),
+        ('reviews', '0004_review_eligibility'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProductKeywordTally',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('review_count', models.IntegerField(default=0)),
+                ('keyword', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='product_tallies', to='reviews.keyword')),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='keyword_tallies', to='products.product')),
+            ],
+            options={
+                'verbose_name': '상품 키워드 집계',
+                'verbose_name_plural': '상품 키워드 집계 목록',
+                'db_table': 'product_keyword_tallies',
+                'indexes': [models.Index(fields=['product', '-review_count'], name='keyword_tally_top_idx')],
+                'constraints': [models.UniqueConstraint(fields=('product', 'keyword'), name='unique_product_keyword_tally')],
+            },
+        ),
+        migrations.RunPython(backfill_keyword_tallies, migrations.RunPython.noop),
+    ]
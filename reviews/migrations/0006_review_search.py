@@ -0,0 +1,52 @@
+# Generated by Django 5.2.18 on 2026-10-19 18:25
+
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations, models
+
+from utils.search import document_tokens
+
+
+def _search_index():
+    # reviews.services.search 의 검색 식과 같아야 인덱스를 탄다
+    return GinIndex(SearchVector("search_text", config="simple"), name="reviews_search_gin")
+
+
+def backfill_search_text(apps, schema_editor):
+    Review = apps.get_model("reviews", "Review")
+    batch = []
+    for review in Review.objects.only("id", "review_title", "content").iterator(chunk_size=2000):
+        review.search_text = " ".join(document_tokens(f"{review.review_title} {review.content}"))
+        batch.append(review)
+        if len(batch) >= 2000:
+            Review.objects.bulk_update(batch, ["search_text"])
+            batch = []
+    Review.objects.bulk_update(batch, ["search_text"])
+
+
+def create_search_index(apps, schema_editor):
+    # GIN / to_tsvector 는 PostgreSQL 전용. 개발용 SQLite 는 icontains 검색으로 대체한다
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.add_index(apps.get_model("reviews", "Review"), _search_index())
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.remove_index(apps.get_model("reviews", "Review"), _search_index())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0005_product_keyword_tally'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='review',
+            name='search_text',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.RunPython(backfill_search_text, migrations.RunPython.noop),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -1,6 +1,8 @@
 from django.db import models
+from django.utils import timezone
 
 from utils.models import TimestampModel
+from utils.search import document_tokens
 from utils.upload_paths import general_upload_to
 
 
@@ -27,6 +29,8 @@ class Review(TimestampModel):
     )
     user = models.ForeignKey("users.User", on_delete=models.SET_NULL, related_name="user_reviews", null=True)
     keywords = models.ManyToManyField("reviews.Keyword", through="ReviewKeyword", related_name="reviews")
+    # 제목+본문의 검색 토큰 (utils.search.document_tokens). PostgreSQL 에서는 GIN 인덱스로 전문 검색한다
+    search_text = models.TextField(default="", blank=True, editable=False)
 
     class Meta:
         db_table = "reviews"
@@ -34,6 +38,13 @@ class Review(TimestampModel):
         verbose_name = "리뷰"
         verbose_name_plural = "리뷰 목록"
 
+    def save(self, *args, **kwargs):
+        self.search_text = " ".join(document_tokens(f"{self.review_title} {self.content}"))
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and {"review_title", "content"} & set(update_fields):
+            kwargs["update_fields"] = {*update_fields, "search_text"}
+        super().save(*args, **kwargs)
+
 
 class ReviewKeyword(models.Model):
     review = models.ForeignKey("reviews.Review", on_delete=models.CASCADE, related_name="review_keywords")
@@ -47,7 +58,12 @@ class ReviewKeyword(models.Model):
 class ReviewImage(TimestampModel):
     upload_folder = "reviews"
     upload_fk = "review"
+    # 변형 이름 -> 필드. 원본 업로드 후 run_review_image_worker 가 WebP 로 만들어 채운다
+    VARIANT_FIELDS = {"thumbnail": "thumbnail_image", "medium": "medium_image"}
+
     review_image = models.ImageField(upload_to=general_upload_to)
+    thumbnail_image = models.ImageField(max_length=255, blank=True, default="")
+    medium_image = models.ImageField(max_length=255, blank=True, default="")
     review = models.ForeignKey("reviews.Review", on_delete=models.SET_NULL, related_name="review_images", null=True)
 
     class Meta:
@@ -55,3 +71,36 @@ class ReviewImage(TimestampModel):
         ordering = ["-created_at"]
         verbose_name = "리뷰이미지"
         verbose_name_plural = "리뷰이미지 목록"
+
+
+class ReviewEligibility(models.Model):
+    """
+    리뷰를 쓸 수 있는 (유저, 상품). 주문이 배송 완료로 바뀔 때 만들어지고, 리뷰를 쓰면 reviewed 가 True 가 된다.
+    리뷰 작성 가능 여부를 주문/주문상품 조인 대신 기본키 조회 한 번으로 판단하기 위한 테이블.
+    """
+
+    pk = models.CompositePrimaryKey("user", "product")
+    user = models.ForeignKey("users.User", on_delete=models.CASCADE, related_name="review_eligibilities")
+    product = models.ForeignKey("products.Product", on_delete=models.CASCADE, related_name="review_eligibilities")
+    reviewed = models.BooleanField(default=False)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        db_table = "review_eligibility"
+        verbose_name = "리뷰 작성 가능 상품"
+        verbose_name_plural = "리뷰 작성 가능 상품 목록"
+
+
+class ProductKeywordTally(models.Model):
+    """상품별 키워드 언급 리뷰 수. 리뷰 작성/수정/삭제 시 증분으로 갱신한다 (reviews.services.keyword_tally)."""
+
+    product = models.ForeignKey("products.Product", on_delete=models.CASCADE, related_name="keyword_tallies")
+    keyword = models.ForeignKey("reviews.Keyword", on_delete=models.CASCADE, related_name="product_tallies")
+    review_count = models.IntegerField(default=0)
+
+    class Meta:
+        db_table = "product_keyword_tallies"
+        constraints = [models.UniqueConstraint(fields=["product", "keyword"], name="unique_product_keyword_tally")]
+        indexes = [models.Index(fields=["product", "-review_count"], name="keyword_tally_top_idx")]
+        verbose_name = "상품 키워드 집계"
+        verbose_name_plural = "상품 키워드 집계 목록"
@@ -7,7 +7,9 @@ reviews_schema = {
         summary="상품 리뷰 생성", description="상품 리뷰를 생성합니다.", responses=OpenApiResponse(ReviewSerializer)
     ),
     "list": extend_schema(
-        summary="상품 리뷰 조회", description="상품 리뷰를 조회합니다.", responses=OpenApiResponse(ReviewSerializer)
+        summary="상품 리뷰 조회",
+        description="상품 리뷰를 조회합니다. q 로 리뷰 제목/본문을 검색하면 관련도 순으로 정렬됩니다.",
+        responses=OpenApiResponse(ReviewSerializer),
     ),
     "retrieve": extend_schema(
         summary="상품 리뷰 상세 조회",
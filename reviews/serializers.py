@@ -1,16 +1,22 @@
+from django.db import transaction
 from django.db.models import Avg
 from drf_spectacular.utils import extend_schema_field
 from rest_framework import serializers
 
 from .models import Keyword, Review, ReviewImage, ReviewKeyword
+from .services.images import attach_review_images, uploaded_review_images
+from .services.keyword_tally import apply_keyword_deltas
 
 
 class ReviewImageSerializer(serializers.ModelSerializer):
     review_image = serializers.ImageField(use_url=True)
+    # 변형이 아직 만들어지지 않았으면 null
+    thumbnail_image = serializers.ImageField(use_url=True, read_only=True)
+    medium_image = serializers.ImageField(use_url=True, read_only=True)
 
     class Meta:
         model = ReviewImage
-        fields = ["review_image"]
+        fields = ["review_image", "thumbnail_image", "medium_image"]
 
 
 class KeywordSerializer(serializers.ModelSerializer):
@@ -27,6 +33,24 @@ class ReviewKeywordSerializer(serializers.ModelSerializer):
         fields = ["keyword_name"]
 
 
+class KeywordTallySerializer(serializers.Serializer):
+    keyword_id = serializers.IntegerField()
+    keyword_name = serializers.CharField()
+    keyword_type = serializers.CharField()
+    review_count = serializers.IntegerField()
+
+
+class KeywordSummarySerializer(serializers.Serializer):
+    top_keywords = KeywordTallySerializer(many=True)
+    sentiment = serializers.DictField(child=serializers.IntegerField())
+
+
+class ReviewableProductSerializer(serializers.Serializer):
+    product_id = serializers.IntegerField()
+    product_name = serializers.CharField(source="product.product_name")
+    delivered_at = serializers.DateTimeField(source="created_at")
+
+
 class RatingAverageSerializer(serializers.Serializer):
     product_id = serializers.IntegerField(required=True)
     average_rating = serializers.FloatField(read_only=True)
@@ -101,60 +125,62 @@ class ReviewCreateSerializer(serializers.ModelSerializer):
             "review_images"
         ]
 
+    def validate_keyword_ids(self, value):
+        keyword_ids = list(dict.fromkeys(value))
+        existing = set(Keyword.objects.filter(id__in=keyword_ids).values_list("id", flat=True))
+        missing = [kid for kid in keyword_ids if kid not in existing]
+        if missing:
+            raise serializers.ValidationError(f"존재하지 않는 키워드입니다: {missing}")
+        return keyword_ids
+
+    def pop_images(self):
+        images = self.validated_data.pop("review_images", None)
+        if images:
+            return images
+        request = self.context.get("request")
+        return request.FILES.getlist("review_image") if request else []
+
+    def save(self, **kwargs):
+        # 이미지는 트랜잭션 밖에서 먼저 올리고, create/update 의 트랜잭션에서는 저장된 이름만 붙인다
+        if "review_image_names" in kwargs:
+            return super().save(**kwargs)
+        with uploaded_review_images(self.pop_images(), self.instance) as names:
+            return super().save(review_image_names=names, **kwargs)
+
+    @transaction.atomic
     def create(self, validated_data):
         keyword_ids = validated_data.pop("keyword_ids", [])
-        request = self.context.get("request")
+        image_names = validated_data.pop("review_image_names", [])
 
         review = Review.objects.create(**validated_data)
-
-        if keyword_ids:
-            cleaned_keyword_ids = []
-
-            for kid in keyword_ids:
-                if isinstance(kid, str) and kid.isdigit():
-                    try:
-                        cleaned_keyword_ids.append(int(kid))
-                    except ValueError:
-                        continue
-                elif isinstance(kid, int):
-                    cleaned_keyword_ids.append(kid)
-
-            for kid in cleaned_keyword_ids:
-                ReviewKeyword.objects.create(
-                    review=review,
-                    keyword_id=kid
-                )
-
-        if request and request.FILES:
-            images = request.FILES.getlist("review_image")
-            for img in images:
-                ReviewImage.objects.create(
-                    review=review,
-                    review_image=img
-                )
+        ReviewKeyword.objects.bulk_create(
+            [ReviewKeyword(review=review, keyword_id=kid) for kid in keyword_ids], ignore_conflicts=True
+        )
+        apply_keyword_deltas(review.product_id, dict.fromkeys(keyword_ids, 1))
+        attach_review_images(review, image_names)
         return review
 
+    @transaction.atomic
     def update(self, instance, validated_data):
-        request = self.context.get("request")
         keyword_ids = validated_data.pop("keyword_ids", None)
+        image_names = validated_data.pop("review_image_names", [])
 
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
         instance.save()
 
         if keyword_ids is not None:
-            instance.reviewkeyword_set.all().delete()
-            for kid in keyword_ids:
-                ReviewKeyword.objects.create(
-                    review=instance,
-                    keyword_id=kid
-                )
-
-        if request and request.FILES:
-            images = request.FILES.getlist("review_image")
-            for img in images:
-                ReviewImage.objects.create(
-                    review=instance,
-                    review_image=img
-                )
-        return instance
\ No newline at end of file
+            # 전체 삭제 후 재등록 대신 바뀐 키워드만 지우고 추가한다.
+            # 상품 변경과 삭제된 키워드의 집계는 시그널이 맞추고, bulk_create 로 추가한 키워드만 직접 더한다
+            current = set(instance.review_keywords.values_list("keyword_id", flat=True))
+            removed = current - set(keyword_ids)
+            added = [kid for kid in keyword_ids if kid not in current]
+            if removed:
+                instance.review_keywords.filter(keyword_id__in=removed).delete()
+            ReviewKeyword.objects.bulk_create(
+                [ReviewKeyword(review=instance, keyword_id=kid) for kid in added], ignore_conflicts=True
+            )
+            apply_keyword_deltas(instance.product_id, dict.fromkeys(added, 1))
+
+        attach_review_images(instance, image_names)
+        return instance
@@ -0,0 +1,47 @@
+from django.db.models import Exists, OuterRef
+
+from orders.choices import DeliveryStatus
+from orders.models import OrderProduct
+from reviews.models import Review, ReviewEligibility
+
+ALREADY_REVIEWED = "이미 해당 상품에 대한 리뷰를 작성했습니다."
+NOT_DELIVERED = "상품 구매 이력이 없거나 배송이 완료되지 않았습니다."
+
+
+def grant_review_eligibility(order) -> None:
+    """배송 완료된 주문의 상품들을 리뷰 작성 가능 상태로 등록한다. 이미 있는 (유저, 상품)은 그대로 둔다."""
+    if not order.user_id or order.delivery_status != DeliveryStatus.DELIVERED:
+        return
+    rows = (
+        OrderProduct.objects.filter(order=order, product__isnull=False)
+        .order_by()
+        .values("product_id")
+        .distinct()
+        .annotate(reviewed=Exists(Review.objects.filter(user_id=order.user_id, product_id=OuterRef("product_id"))))
+    )
+    ReviewEligibility.objects.bulk_create(
+        [
+            ReviewEligibility(user_id=order.user_id, product_id=row["product_id"], reviewed=row["reviewed"])
+            for row in rows
+        ],
+        ignore_conflicts=True,
+    )
+
+
+def claim_review(user_id, product_id) -> tuple[bool, str]:
+    """
+    리뷰를 쓸 수 있으면 reviewed 를 True 로 바꾸고 (True, 메시지) 를 돌려준다.
+    조건부 UPDATE 한 번이라 같은 상품에 리뷰 요청이 동시에 들어와도 하나만 통과한다.
+    리뷰 저장과 같은 트랜잭션에서 호출해야 저장 실패 시 함께 되돌려진다.
+    """
+    eligibility = ReviewEligibility.objects.filter(pk=(user_id, product_id))
+    if eligibility.filter(reviewed=False).update(reviewed=True):
+        return True, "리뷰 작성이 가능합니다."
+    if eligibility.exists():
+        return False, ALREADY_REVIEWED
+    return False, NOT_DELIVERED
+
+
+def set_reviewed(user_id, product_id, reviewed: bool) -> None:
+    if user_id and product_id:
+        ReviewEligibility.objects.filter(pk=(user_id, product_id)).update(reviewed=reviewed)
@@ -0,0 +1,195 @@
+import logging
+import posixpath
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import transaction
+
+from reviews.models import ReviewImage
+from utils import task_queue
+from utils.images import render_webp_variants
+
+logger = logging.getLogger(__name__)
+
+REVIEW_IMAGE_QUEUE = "review_images"
+
+
+def _io_pool(count: int) -> ThreadPoolExecutor:
+    workers = max(1, min(count, getattr(settings, "REVIEW_IMAGE_UPLOAD_WORKERS", 4)))
+    return ThreadPoolExecutor(max_workers=workers, thread_name_prefix="review-image")
+
+
+def upload_review_images(files, review=None) -> list[str]:
+    """
+    업로드된 이미지 파일을 저장소에 동시에 올리고 저장된 이름을 돌려준다.
+    S3 업로드는 네트워크 대기가 대부분이라 파일 수만큼 순서대로 기다리지 않게 스레드로 나눈다.
+    S3 왕복 동안 DB 트랜잭션과 행 잠금을 잡고 있지 않도록 트랜잭션 밖에서 부른다.
+    (새 리뷰는 아직 id 가 없어 reviews/unassigned/ 아래에 올라간다)
+    """
+    if not files:
+        return []
+    field = ReviewImage._meta.get_field("review_image")
+    names = [field.generate_filename(ReviewImage(review=review), upload.name) for upload in files]
+
+    with _io_pool(len(files)) as pool:
+        futures = [
+            pool.submit(field.storage.save, name, upload, max_length=field.max_length)
+            for name, upload in zip(names, files)
+        ]
+    saved = [future.result() for future in futures if not future.exception()]
+    if len(saved) != len(files):
+        # 일부만 올라갔으면 올라간 파일을 지우고 실패를 그대로 알린다
+        logger.warning("review image upload failed; removing %d uploaded files", len(saved))
+        delete_review_images(saved)
+        raise next(future.exception() for future in futures if future.exception())
+    return saved
+
+
+def delete_review_images(names) -> None:
+    storage = ReviewImage._meta.get_field("review_image").storage
+    for name in names:
+        try:
+            storage.delete(name)
+        except Exception:
+            logger.warning("failed to delete review image %s", name, exc_info=True)
+
+
+@contextmanager
+def uploaded_review_images(files, review=None):
+    """
+    이미지를 먼저 올리고 저장된 이름을 넘긴다. 블록이 예외로 끝나면(블록 안의 트랜잭션이 롤백되면)
+    올린 파일을 지운다. 롤백을 알 수 있도록 바깥 트랜잭션 없이 쓴다.
+    """
+    names = upload_review_images(files, review)
+    try:
+        yield names
+    except BaseException:
+        delete_review_images(names)
+        raise
+
+
+def attach_review_images(review, names) -> list[ReviewImage]:
+    """미리 올린 이미지로 ReviewImage 를 bulk_create 한 번에 만든다. 썸네일/중간 크기 WebP 는 커밋 후 큐에 넣는다."""
+    if not names:
+        return []
+    images = ReviewImage.objects.bulk_create(ReviewImage(review=review, review_image=name) for name in names)
+
+    image_ids = [image.pk for image in images]
+    transaction.on_commit(lambda: queue_image_variants(image_ids), robust=True)
+    return images
+
+
+def queue_image_variants(image_ids) -> None:
+    try:
+        for image_id in image_ids:
+            task_queue.enqueue(REVIEW_IMAGE_QUEUE, {"image_id": image_id, "attempts": 0})
+    except Exception:
+        # 큐에 못 넣어도 원본은 저장되어 있으므로 run_review_image_worker --backfill 로 다시 만들 수 있다
+        logger.warning("failed to queue review image variants %s", list(image_ids), exc_info=True)
+
+
+def variant_name(original: str, variant: str) -> str:
+    stem, _ = posixpath.splitext(original)
+    return f"{stem}_{variant}.webp"
+
+
+def _read(storage, name: str) -> bytes:
+    with storage.open(name, "rb") as f:
+        return f.read()
+
+
+def process_review_images(image_ids, executor=None) -> list[int]:
+    """
+    원본을 읽어(스레드) WebP 변형을 만들고(프로세스 풀) 변형을 동시에 올린 뒤(스레드) 필드를 한 번에 저장한다.
+    executor 를 넘기지 않으면 이번 호출에만 쓰는 프로세스 풀을 만든다. 처리하지 못한 image id 목록을 돌려준다.
+    """
+    images = list(ReviewImage.objects.filter(pk__in=image_ids).exclude(review_image=""))
+    if not images:
+        return []
+    storage = ReviewImage._meta.get_field("review_image").storage
+    sizes = settings.REVIEW_IMAGE_VARIANT_SIZES
+    quality = getattr(settings, "REVIEW_IMAGE_WEBP_QUALITY", 80)
+    failed = set()
+
+    with _io_pool(len(images)) as pool:
+        reads = [pool.submit(_read, storage, image.review_image.name) for image in images]
+
+    own_executor = executor is None
+    if own_executor:
+        executor = ProcessPoolExecutor(max_workers=getattr(settings, "REVIEW_IMAGE_PROCESS_WORKERS", 2))
+    try:
+        renders = {}
+        for image, read in zip(images, reads):
+            if read.exception():
+                logger.warning("failed to read review image %s", image.pk, exc_info=read.exception())
+                failed.add(image.pk)
+                continue
+            renders[image.pk] = executor.submit(render_webp_variants, read.result(), sizes, quality)
+        variants = {}
+        for image_id, render in renders.items():
+            if render.exception():
+                logger.warning("failed to render review image %s", image_id, exc_info=render.exception())
+                failed.add(image_id)
+            else:
+                variants[image_id] = render.result()
+    finally:
+        if own_executor:
+            executor.shutdown()
+
+    uploads = []
+    with _io_pool(sum(map(len, variants.values()))) as pool:
+        for image in images:
+            for variant, data in variants.get(image.pk, {}).items():
+                name = variant_name(image.review_image.name, variant)
+                uploads.append((image, variant, pool.submit(storage.save, name, ContentFile(data))))
+
+    for image, variant, upload in uploads:
+        if upload.exception():
+            logger.warning(
+                "failed to upload %s variant of review image %s", variant, image.pk, exc_info=upload.exception()
+            )
+            failed.add(image.pk)
+        else:
+            setattr(image, ReviewImage.VARIANT_FIELDS[variant], upload.result())
+    ReviewImage.objects.bulk_update(
+        [image for image in images if image.pk in variants and image.pk not in failed],
+        list(ReviewImage.VARIANT_FIELDS.values()),
+    )
+    return sorted(failed)
+
+
+def pending_image_ids():
+    """변형이 아직 없는 리뷰 이미지 id (큐 적재 실패분 복구용)"""
+    return (
+        ReviewImage.objects.filter(thumbnail_image="")
+        .exclude(review_image="")
+        .order_by("pk")
+        .values_list("pk", flat=True)
+    )
+
+
+def retry_later(payload: dict) -> None:
+    payload = {**payload, "attempts": payload.get("attempts", 0) + 1}
+    if payload["attempts"] >= getattr(settings, "REVIEW_IMAGE_QUEUE_MAX_ATTEMPTS", 3):
+        logger.error("review image %s dropped after %s attempts", payload["image_id"], payload["attempts"])
+        task_queue.dead_letter(REVIEW_IMAGE_QUEUE, payload)
+        return
+    task_queue.schedule_retry(REVIEW_IMAGE_QUEUE, payload, 30 * 2 ** (payload["attempts"] - 1))
+
+
+def run_review_image_worker(*, batch_size: int | None = None, poll_timeout: int = 5, once: bool = False) -> None:
+    """프로세스 풀은 워커가 살아 있는 동안 재사용해 배치마다 프로세스를 새로 띄우지 않는다."""
+    batch_size = batch_size or getattr(settings, "REVIEW_IMAGE_QUEUE_BATCH_SIZE", 20)
+    with ProcessPoolExecutor(max_workers=getattr(settings, "REVIEW_IMAGE_PROCESS_WORKERS", 2)) as executor:
+        while True:
+            payloads = task_queue.dequeue_batch(REVIEW_IMAGE_QUEUE, batch_size, timeout=poll_timeout)
+            if not payloads:
+                if once:
+                    return
+                continue
+            failed = set(process_review_images([payload["image_id"] for payload in payloads], executor))
+            for payload in payloads:
+                if payload["image_id"] in failed:
+                    retry_later(payload)
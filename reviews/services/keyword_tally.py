@@ -0,0 +1,87 @@
+from django.db import connection, transaction
+from django.db.models import Count, Sum
+
+from products.models import Product
+from reviews.models import Keyword, ProductKeywordTally, ReviewKeyword
+
+TOP_KEYWORD_LIMIT = 5
+DEFAULT_CHUNK_SIZE = 500
+
+
+def apply_keyword_deltas(product_id, deltas: dict[int, int]) -> None:
+    """
+    {keyword_id: 변화량} 을 상품의 키워드 집계에 INSERT ... ON CONFLICT DO UPDATE 한 번으로 더한다.
+    0 이하가 된 행은 지워 상위 키워드 조회에 남지 않게 한다.
+    """
+    deltas = {keyword_id: delta for keyword_id, delta in deltas.items() if delta}
+    if not product_id or not deltas:
+        return
+    table = connection.ops.quote_name(ProductKeywordTally._meta.db_table)
+    values = ", ".join(["(%s, %s, %s)"] * len(deltas))
+    # 키워드 id 순으로 넣어 동시에 갱신하는 트랜잭션끼리 같은 순서로 행을 잠근다
+    params = [value for keyword_id, delta in sorted(deltas.items()) for value in (product_id, keyword_id, delta)]
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {table} (product_id, keyword_id, review_count) VALUES {values} "
+            f"ON CONFLICT (product_id, keyword_id) "
+            f"DO UPDATE SET review_count = {table}.review_count + EXCLUDED.review_count",
+            params,
+        )
+        if any(delta < 0 for delta in deltas.values()):
+            cursor.execute(f"DELETE FROM {table} WHERE product_id = %s AND review_count <= 0", [product_id])
+
+
+def keyword_summary(product_id, limit: int = TOP_KEYWORD_LIMIT) -> dict:
+    """상위 키워드와 긍정/중립/부정별 언급 수. 리뷰 키워드가 아닌 집계 테이블만 읽는다."""
+    tallies = ProductKeywordTally.objects.filter(product_id=product_id)
+    top = tallies.select_related("keyword").order_by("-review_count", "keyword_id")[:limit]
+    sentiment = dict.fromkeys((value for value, _ in Keyword.KEYWORD_TYPE_CHOICES), 0)
+    for keyword_type, total in (
+        tallies.order_by()
+        .values("keyword__keyword_type")
+        .annotate(total=Sum("review_count"))
+        .values_list("keyword__keyword_type", "total")
+    ):
+        sentiment[keyword_type] = total
+    return {
+        "top_keywords": [
+            {
+                "keyword_id": tally.keyword_id,
+                "keyword_name": tally.keyword.keyword_name,
+                "keyword_type": tally.keyword.keyword_type,
+                "review_count": tally.review_count,
+            }
+            for tally in top
+        ],
+        "sentiment": sentiment,
+    }
+
+
+@transaction.atomic
+def _rebuild_chunk(product_ids: list[int]) -> None:
+    # 리뷰 저장은 같은 트랜잭션에서 상품 행(별점 합계)을 갱신하므로, 상품을 잠가 재계산 중 들어오는 증분과 겹치지 않게 한다
+    list(Product.objects.select_for_update().filter(pk__in=product_ids).values_list("pk", flat=True))
+    ProductKeywordTally.objects.filter(product_id__in=product_ids).delete()
+    rows = (
+        ReviewKeyword.objects.filter(review__product_id__in=product_ids)
+        .order_by()
+        .values("review__product_id", "keyword_id")
+        .annotate(review_count=Count("id"))
+    )
+    ProductKeywordTally.objects.bulk_create(
+        ProductKeywordTally(
+            product_id=row["review__product_id"], keyword_id=row["keyword_id"], review_count=row["review_count"]
+        )
+        for row in rows
+    )
+
+
+def rebuild_keyword_tallies(*, chunk_size: int = DEFAULT_CHUNK_SIZE):
+    """리뷰 키워드 기준으로 상품별 키워드 집계를 상품 chunk 단위로 다시 만든다. 처리한 상품 수를 chunk 마다 yield 한다."""
+    last_id = 0
+    while product_ids := list(
+        Product.objects.filter(pk__gt=last_id).order_by("pk").values_list("pk", flat=True)[:chunk_size]
+    ):
+        last_id = product_ids[-1]
+        _rebuild_chunk(product_ids)
+        yield len(product_ids)
@@ -0,0 +1,84 @@
+from decimal import ROUND_HALF_UP, Decimal
+
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum
+
+from products.models import Product
+from reviews.models import Review
+
+RATING_QUANTUM = Decimal("0.1")
+HISTOGRAM_STARS = range(1, 6)
+DEFAULT_CHUNK_SIZE = 500
+
+
+def average_rating(rating_sum, rating_count) -> Decimal:
+    if not rating_count:
+        return Decimal("0")
+    return (Decimal(rating_sum) / rating_count).quantize(RATING_QUANTUM, rounding=ROUND_HALF_UP)
+
+
+@transaction.atomic
+def apply_rating_delta(product_id, sum_delta, count_delta: int) -> None:
+    """
+    상품의 rating_sum / rating_count 에 변화량을 F() 로 더하고 product_rating 을 다시 계산한다.
+    리뷰 전체 AVG 를 다시 구하지 않고, 동시에 들어온 리뷰끼리 결과를 덮어쓰지도 않는다.
+    """
+    sum_delta = Decimal(str(sum_delta))
+    if not product_id or (not sum_delta and not count_delta):
+        return
+    products = Product.objects.filter(pk=product_id)
+    if not products.update(rating_sum=F("rating_sum") + sum_delta, rating_count=F("rating_count") + count_delta):
+        return
+    # 위 UPDATE 로 행 잠금을 잡은 상태라 커밋 전까지 다른 리뷰의 갱신이 끼어들지 않는다
+    rating_sum, rating_count = products.values_list("rating_sum", "rating_count").get()
+    products.update(product_rating=average_rating(rating_sum, rating_count))
+
+
+def rating_histogram(product_id) -> dict[str, int]:
+    """별점 구간별 리뷰 수 ({"1": n, ..., "5": n}). 4.5점은 4점 구간에 들어간다."""
+    counts = Review.objects.filter(product_id=product_id).aggregate(
+        **{str(star): Count("id", filter=Q(rating__gte=star, rating__lt=star + 1)) for star in HISTOGRAM_STARS}
+    )
+    return {star: counts[star] or 0 for star in map(str, HISTOGRAM_STARS)}
+
+
+@transaction.atomic
+def _recompute_chunk(product_ids: list[int]) -> int:
+    # 계산 중에 리뷰 갱신이 끼어들지 않도록 chunk 의 상품을 잠근 뒤 합계를 구한다
+    products = list(
+        Product.objects.select_for_update()
+        .filter(pk__in=product_ids)
+        .order_by("pk")
+        .only("id", "rating_sum", "rating_count", "product_rating")
+    )
+    totals = {
+        product_id: (rating_sum, rating_count)
+        for product_id, rating_sum, rating_count in Review.objects.filter(product_id__in=product_ids)
+        .order_by()
+        .values("product_id")
+        .annotate(rating_sum=Sum("rating"), rating_count=Count("id"))
+        .values_list("product_id", "rating_sum", "rating_count")
+    }
+
+    changed = []
+    for product in products:
+        rating_sum, rating_count = totals.get(product.pk, (Decimal("0"), 0))
+        expected = (rating_sum, rating_count, average_rating(rating_sum, rating_count))
+        if (product.rating_sum, product.rating_count, product.product_rating) != expected:
+            product.rating_sum, product.rating_count, product.product_rating = expected
+            changed.append(product)
+    Product.objects.bulk_update(changed, ["rating_sum", "rating_count", "product_rating"])
+    return len(changed)
+
+
+def recompute_product_ratings(*, chunk_size: int = DEFAULT_CHUNK_SIZE):
+    """
+    리뷰 테이블 기준으로 상품의 rating_sum / rating_count / product_rating 을 다시 맞춘다.
+    QuerySet.update 등 시그널을 거치지 않은 변경으로 생긴 차이를 고칠 때 사용하며, 보정한 상품 수를 chunk 마다 yield 한다.
+    """
+    last_id = 0
+    while product_ids := list(
+        Product.objects.filter(pk__gt=last_id).order_by("pk").values_list("pk", flat=True)[:chunk_size]
+    ):
+        last_id = product_ids[-1]
+        yield _recompute_chunk(product_ids)
@@ -0,0 +1,37 @@
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db import connection
+from django.db.models import Q
+
+from utils.search import query_tokens
+
+# 마이그레이션(0006_review_search)의 GIN 인덱스 식과 같아야 한다
+SEARCH_CONFIG = "simple"
+SEARCH_VECTOR = SearchVector("search_text", config=SEARCH_CONFIG)
+
+
+def full_text_search_enabled() -> bool:
+    return connection.vendor == "postgresql"
+
+
+def _tsquery(tokens) -> str:
+    # 토큰은 \w 문자만 남긴 값이라 그대로 raw tsquery 에 넣어도 안전하다
+    return " & ".join(f"{token}:*" if prefix else token for token, prefix in tokens)
+
+
+def search_reviews(queryset, q: str):
+    """
+    리뷰 제목/본문 검색. PostgreSQL 은 search_text 의 GIN 인덱스로 찾고 search_rank 를 붙인다.
+    그 외(개발용 SQLite)는 검색어 단어마다 제목/본문 icontains 로 대체한다.
+    """
+    tokens = query_tokens(q or "")
+    if not tokens:
+        return queryset
+    if full_text_search_enabled():
+        query = SearchQuery(_tsquery(tokens), config=SEARCH_CONFIG, search_type="raw")
+        return queryset.annotate(search_vector=SEARCH_VECTOR, search_rank=SearchRank(SEARCH_VECTOR, query)).filter(
+            search_vector=query
+        )
+
+    for word in q.split():
+        queryset = queryset.filter(Q(review_title__icontains=word) | Q(content__icontains=word))
+    return queryset
@@ -4,13 +4,17 @@ from decimal import ROUND_CEILING, ROUND_FLOOR, ROUND_HALF_UP, Decimal, InvalidO
 
 from django.conf import settings
 from django.db import IntegrityError, transaction
-from django.db.models import Avg
-from django.db.models.signals import post_delete, post_save
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
 
+from orders.choices import DeliveryStatus
+from orders.models import Order
 from users.services.points import PointError, apply_point_delta
 
-from .models import Review
+from .models import Review, ReviewKeyword
+from .services.eligibility import grant_review_eligibility, set_reviewed
+from .services.keyword_tally import apply_keyword_deltas
+from .services.ratings import apply_rating_delta
 
 
 def _earn_rate() -> Decimal:
@@ -103,16 +107,103 @@ def award_points_for_review(sender, instance: "Review", created: bool, **kwargs)
 
     transaction.on_commit(_apply)
 
-@receiver([post_save, post_delete], sender=Review)
-def update_product_rating(sender, instance, **kwargs):
-    product = getattr(instance, "product", None)
-    if not product:
+
+@receiver(pre_save, sender=Review)
+def remember_previous_rating(sender, instance, update_fields=None, **kwargs):
+    instance._rating_before = None
+    if not instance.pk:
+        return
+    if update_fields is not None and not {"rating", "product"} & set(update_fields):
+        return  # 별점/상품과 무관한 저장은 조회 생략
+    instance._rating_before = Review.objects.filter(pk=instance.pk).values_list("product_id", "rating").first()
+
+
+@receiver(post_save, sender=Review)
+def update_product_rating(sender, instance, created, **kwargs):
+    rating = Decimal(str(instance.rating))
+    if created:
+        apply_rating_delta(instance.product_id, rating, 1)
+        return
+
+    before = getattr(instance, "_rating_before", None)
+    if before is None:
+        return
+    old_product_id, old_rating = before
+    if old_product_id == instance.product_id:
+        apply_rating_delta(instance.product_id, rating - old_rating, 0)
+    else:
+        apply_rating_delta(old_product_id, -old_rating, -1)
+        apply_rating_delta(instance.product_id, rating, 1)
+
+
+@receiver(post_delete, sender=Review)
+def remove_product_rating(sender, instance, **kwargs):
+    apply_rating_delta(instance.product_id, -Decimal(str(instance.rating)), -1)
+
+
+@receiver(post_save, sender=Review)
+def move_keyword_tallies(sender, instance, created, **kwargs):
+    # 리뷰의 상품이 바뀌면 리뷰 키워드 집계를 새 상품으로 옮긴다 (이전 상품은 remember_previous_rating 이 기록)
+    before = getattr(instance, "_rating_before", None)
+    if created or before is None or before[0] == instance.product_id:
+        return
+    keyword_ids = list(instance.review_keywords.values_list("keyword_id", flat=True))
+    apply_keyword_deltas(before[0], dict.fromkeys(keyword_ids, -1))
+    apply_keyword_deltas(instance.product_id, dict.fromkeys(keyword_ids, 1))
+
+
+# 리뷰 키워드를 한 행씩 저장/삭제하는 경로(관리자 인라인, 리뷰 삭제 CASCADE 등)의 상품 키워드 집계.
+# ReviewCreateSerializer 는 bulk_create(시그널 없음)로 추가한 키워드만 직접 더한다.
+@receiver(pre_save, sender=ReviewKeyword)
+def remember_previous_keyword(sender, instance, **kwargs):
+    instance._keyword_before = None
+    if instance.pk:
+        instance._keyword_before = (
+            ReviewKeyword.objects.filter(pk=instance.pk).values_list("review__product_id", "keyword_id").first()
+        )
+
+
+@receiver(post_save, sender=ReviewKeyword)
+def add_keyword_tally(sender, instance, created, **kwargs):
+    product_id = instance.review.product_id
+    before = getattr(instance, "_keyword_before", None)
+    if not created:
+        if before is None or before == (product_id, instance.keyword_id):
+            return
+        apply_keyword_deltas(before[0], {before[1]: -1})
+    apply_keyword_deltas(product_id, {instance.keyword_id: 1})
+
+
+@receiver(post_delete, sender=ReviewKeyword)
+def remove_keyword_tally(sender, instance, **kwargs):
+    # 리뷰와 함께 지워질 때도 CASCADE 는 리뷰 키워드를 먼저 지우므로 리뷰의 상품을 읽을 수 있다
+    apply_keyword_deltas(instance.review.product_id, {instance.keyword_id: -1})
+
+
+@receiver(post_save, sender=Review)
+def mark_product_reviewed(sender, instance, created, **kwargs):
+    if created:
+        set_reviewed(instance.user_id, instance.product_id, True)
+
+
+@receiver(post_delete, sender=Review)
+def unmark_product_reviewed(sender, instance, **kwargs):
+    set_reviewed(instance.user_id, instance.product_id, False)
+
+
+@receiver(pre_save, sender=Order)
+def remember_delivery_status(sender, instance, update_fields=None, **kwargs):
+    instance._was_delivered = False
+    if not instance.pk or instance.delivery_status != DeliveryStatus.DELIVERED:
+        return
+    if update_fields is not None and "delivery_status" not in update_fields:
+        instance._was_delivered = True  # 배송 상태를 저장하지 않는 경우 (조회 생략)
         return
+    instance._was_delivered = Order.objects.filter(pk=instance.pk, delivery_status=DeliveryStatus.DELIVERED).exists()
 
-    def _update():
-        avg_rating = product.product_reviews.aggregate(avg=Avg("rating"))["avg"]
-        product.product_rating = avg_rating or 0
-        product.save(update_fields=["product_rating"])
 
-    # commit 후 실행
-    transaction.on_commit(_update)
\ No newline at end of file
+@receiver(post_save, sender=Order)
+def grant_review_eligibility_on_delivery(sender, instance, **kwargs):
+    # 배송 완료로 바뀐 순간에만 주문 상품을 리뷰 작성 가능 목록에 넣는다
+    if instance.delivery_status == DeliveryStatus.DELIVERED and not getattr(instance, "_was_delivered", True):
+        grant_review_eligibility(instance)
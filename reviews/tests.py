@@ -1,7 +1,24 @@
-from django.test import TestCase
+import os
+import shutil
+import tempfile
+from decimal import Decimal
+from io import BytesIO, StringIO
 
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from PIL import Image
+from rest_framework.test import APIClient
+
+from orders.models import Order, OrderProduct
 from products.models import Brand, Category, Product, Tag
-from reviews.models import Keyword, Review, ReviewKeyword
+from reviews.models import Keyword, ProductKeywordTally, Review, ReviewEligibility, ReviewImage, ReviewKeyword
+from reviews.serializers import ReviewCreateSerializer, ReviewImageSerializer
+from reviews.services.eligibility import claim_review
+from reviews.services.images import process_review_images
+from reviews.services.ratings import rating_histogram
 from users.models import User
 
 
@@ -54,3 +71,448 @@ class ReviewModelTest(TestCase):
     def test_review_keyword_relation(self):
         ReviewKeyword.objects.create(review=self.review, keyword=self.keyword)
         self.assertIn(self.keyword, self.review.keywords.all())
+
+
+# dev 설정의 S3 대신 로컬 저장소로 이미지 URL 을 만든다
+@override_settings(
+    STORAGES={
+        "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+        "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+    }
+)
+class ReviewListQueryTest(TestCase):
+    def setUp(self):
+        self.category = Category.objects.create(category_name="카테고리")
+        self.brand = Brand.objects.create(brand_name="브랜드")
+        self.tag = Tag.objects.create(tag_name="태그")
+        self.keywords = [
+            Keyword.objects.create(keyword_name="갓성비", keyword_type="positive"),
+            Keyword.objects.create(keyword_name="배송빠름", keyword_type="positive"),
+        ]
+        self.client = APIClient()
+
+    def _create_reviews(self, count):
+        for i in range(count):
+            user = User.objects.create_user(
+                email=f"reviewer{Review.objects.count()}@example.com",
+                password="1234",
+                nickname=f"nick{Review.objects.count()}",
+                username="리뷰어",
+            )
+            product = Product.objects.create(
+                product_name=f"상품{i}",
+                product_value="1000",
+                product_stock="5",
+                category=self.category,
+                brand=self.brand,
+                tag=self.tag,
+            )
+            review = Review.objects.create(review_title="제목", content="내용", rating="4", product=product, user=user)
+            for keyword in self.keywords:
+                ReviewKeyword.objects.create(review=review, keyword=keyword)
+            ReviewImage.objects.create(review=review, review_image="reviews/sample.jpg")
+
+    def _list_queries(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get("/reviews/")
+        self.assertEqual(response.status_code, 200)
+        return response, len(ctx.captured_queries)
+
+    def test_list_query_count_does_not_grow_with_rows(self):
+        """리뷰 수가 늘어나도 /reviews/ 쿼리 수가 같은지 확인"""
+        self._create_reviews(2)
+        response, small = self._list_queries()
+        self.assertEqual(len(response.data["results"]), 2)
+
+        self._create_reviews(5)
+        response, large = self._list_queries()
+        self.assertEqual(len(response.data["results"]), 7)
+        self.assertEqual(small, large)
+        self.assertEqual(len(response.data["results"][0]["review_keyword"]), 2)
+
+    def test_cursor_pagination_and_count_ordering(self):
+        """커서로 다음 페이지를 이어 받고, 리뷰 수 정렬도 집계 없이 저장된 값으로 하는지 확인"""
+        self._create_reviews(3)
+        response = self.client.get("/reviews/", {"page_size": 2})
+        self.assertEqual(len(response.data["results"]), 2)
+        self.assertIsNotNone(response.data["next"])
+        next_page = self.client.get(response.data["next"])
+        self.assertEqual(len(next_page.data["results"]), 1)
+
+        for params in ({}, {"ordering": "-product_review_count"}):
+            with CaptureQueriesContext(connection) as ctx:
+                response = self.client.get("/reviews/", params)
+            self.assertEqual(response.status_code, 200)
+            self.assertNotIn("COUNT(", ctx.captured_queries[0]["sql"].upper())
+
+
+class ProductRatingTest(TestCase):
+    def setUp(self):
+        self.category = Category.objects.create(category_name="카테고리")
+        self.brand = Brand.objects.create(brand_name="브랜드")
+        self.tag = Tag.objects.create(tag_name="태그")
+        self.products = [
+            Product.objects.create(
+                product_name=f"상품{i}",
+                product_value="1000",
+                product_stock="5",
+                category=self.category,
+                brand=self.brand,
+                tag=self.tag,
+            )
+            for i in range(2)
+        ]
+
+    def _review(self, rating, product=None):
+        index = Review.objects.count()
+        user = User.objects.create_user(
+            email=f"rater{index}@example.com", password="1234", nickname=f"rater{index}", username="평가자"
+        )
+        return Review.objects.create(
+            review_title="제목", content="내용", rating=rating, product=product or self.products[0], user=user
+        )
+
+    def _stored(self, product):
+        product.refresh_from_db()
+        return product.rating_sum, product.rating_count, product.product_rating
+
+    def test_counters_follow_create_update_delete(self):
+        """리뷰 생성/수정/상품 변경/삭제에 따라 합계·개수·평균이 증분으로 맞게 바뀌는지 확인"""
+        first, second = self.products
+        review = self._review("4")
+        self._review("5")
+        self.assertEqual(self._stored(first), (Decimal("9"), 2, Decimal("4.5")))
+
+        review.rating = Decimal("2.5")
+        review.save()
+        self.assertEqual(self._stored(first), (Decimal("7.5"), 2, Decimal("3.8")))
+
+        review.product = second
+        review.save()
+        self.assertEqual(self._stored(first), (Decimal("5"), 1, Decimal("5")))
+        self.assertEqual(self._stored(second), (Decimal("2.5"), 1, Decimal("2.5")))
+
+        review.delete()
+        self.assertEqual(self._stored(second), (Decimal("0"), 0, Decimal("0")))
+
+    def test_recompute_and_histogram(self):
+        """시그널을 거치지 않은 변경을 재계산 명령이 보정하고, 별점 분포가 구간별로 집계되는지 확인"""
+        product = self.products[0]
+        for rating in ("5", "4.5", "4", "1"):
+            self._review(rating)
+        Review.objects.filter(rating=1).update(rating=3)
+        Product.objects.filter(pk=product.pk).update(rating_sum=0, rating_count=0, product_rating=0)
+
+        out = StringIO()
+        call_command("recompute_product_ratings", stdout=out)
+        self.assertIn("1개 상품", out.getvalue())
+        self.assertEqual(self._stored(product), (Decimal("16.5"), 4, Decimal("4.1")))
+        self.assertEqual(rating_histogram(product.pk), {"1": 0, "2": 0, "3": 1, "4": 2, "5": 1})
+
+
+@override_settings(
+    STORAGES={
+        "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+        "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+    }
+)
+class ReviewWriteTest(TestCase):
+    def setUp(self):
+        self.media_root = media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        media_override = override_settings(MEDIA_ROOT=media_root)
+        media_override.enable()
+        self.addCleanup(media_override.disable)
+
+        self.user = User.objects.create_user(
+            email="writer@example.com", password="1234", nickname="writer", username="작성자"
+        )
+        self.product = Product.objects.create(product_name="상품", product_value="1000", product_stock="5")
+        self.keywords = [Keyword.objects.create(keyword_name=f"키워드{i}", keyword_type="positive") for i in range(6)]
+
+    def _image(self, name):
+        buffer = BytesIO()
+        Image.new("RGB", (4, 4)).save(buffer, format="PNG")
+        return SimpleUploadedFile(name, buffer.getvalue(), content_type="image/png")
+
+    def _create(self, keyword_ids, images=()):
+        serializer = ReviewCreateSerializer(
+            data={
+                "review_title": "제목",
+                "content": "내용",
+                "rating": "4",
+                "product": self.product.pk,
+                "keyword_ids": keyword_ids,
+                "review_images": list(images),
+            }
+        )
+        serializer.is_valid(raise_exception=True)
+        return serializer.save(user=self.user)
+
+    def _keyword_ids(self, review):
+        return set(review.review_keywords.values_list("keyword_id", flat=True))
+
+    def test_create_query_count_does_not_grow_with_keywords(self):
+        """키워드 수와 상관없이 리뷰 생성 쿼리 수가 같은지 확인"""
+        with CaptureQueriesContext(connection) as few:
+            self._create([self.keywords[0].pk])
+        Review.objects.all().delete()
+        with CaptureQueriesContext(connection) as many:
+            review = self._create([keyword.pk for keyword in self.keywords])
+        self.assertEqual(len(few.captured_queries), len(many.captured_queries))
+        self.assertEqual(len(self._keyword_ids(review)), 6)
+
+    def test_invalid_keyword_and_update_diff(self):
+        """없는 키워드는 거절하고, 수정 시 바뀐 키워드만 반영되며 이미지가 한 번에 저장되는지 확인"""
+        serializer = ReviewCreateSerializer(
+            data={
+                "review_title": "제목",
+                "content": "내용",
+                "rating": "4",
+                "product": self.product.pk,
+                "keyword_ids": [0],
+            }
+        )
+        self.assertFalse(serializer.is_valid())
+        self.assertIn("keyword_ids", serializer.errors)
+
+        k1, k2, k3 = (keyword.pk for keyword in self.keywords[:3])
+        review = self._create([k1, k2, k2], images=[self._image("a.png"), self._image("b.png")])
+        self.assertEqual(self._keyword_ids(review), {k1, k2})
+        self.assertEqual(review.review_images.count(), 2)
+        kept = review.review_keywords.get(keyword_id=k2).pk
+
+        serializer = ReviewCreateSerializer(review, data={"keyword_ids": [k2, k3]}, partial=True)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        self.assertEqual(self._keyword_ids(review), {k2, k3})
+        self.assertEqual(review.review_keywords.get(keyword_id=k2).pk, kept)
+        for image in review.review_images.all():
+            self.assertTrue(image.review_image.storage.exists(image.review_image.name))
+
+    def test_uploads_are_removed_when_review_is_rejected(self):
+        """이미지는 트랜잭션 전에 올라가고, 리뷰를 쓸 수 없어 롤백되면 올린 파일이 지워지는지 확인"""
+        client = APIClient()
+        client.force_authenticate(self.user)
+        response = client.post(
+            "/reviews/",
+            {
+                "review_title": "제목",
+                "content": "내용",
+                "rating": "4",
+                "product": self.product.pk,
+                "review_images": [self._image("a.png"), self._image("b.png")],
+            },
+            format="multipart",
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(ReviewImage.objects.exists())
+        uploaded = [name for _, _, names in os.walk(self.media_root) for name in names]
+        self.assertEqual(uploaded, [])
+
+    def test_variants_are_rendered_as_webp(self):
+        """원본 저장 후 워커 처리로 WebP 썸네일/중간 크기가 만들어지고 직렬화에 노출되는지 확인"""
+        buffer = BytesIO()
+        Image.new("RGB", (1600, 1200), "red").save(buffer, format="JPEG")
+        review = self._create([], images=[SimpleUploadedFile("big.jpg", buffer.getvalue(), content_type="image/jpeg")])
+        image = review.review_images.get()
+        self.assertEqual(ReviewImageSerializer(image).data["thumbnail_image"], None)
+
+        self.assertEqual(process_review_images([image.pk]), [])
+        image.refresh_from_db()
+        for field, max_side in (("thumbnail_image", 200), ("medium_image", 800)):
+            with Image.open(getattr(image, field).path) as variant:
+                self.assertEqual(variant.format, "WEBP")
+                self.assertEqual(max(variant.size), max_side)
+
+        data = ReviewImageSerializer(image).data
+        self.assertTrue(data["thumbnail_image"].endswith("_thumbnail.webp"))
+        self.assertTrue(data["medium_image"].endswith("_medium.webp"))
+
+
+class ReviewEligibilityTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="buyer@example.com", password="1234", nickname="buyer", username="구매자"
+        )
+        self.products = [
+            Product.objects.create(product_name=f"상품{i}", product_value="1000", product_stock="5") for i in range(2)
+        ]
+        self.order = Order.objects.create(user=self.user)
+        for product in self.products:
+            OrderProduct.objects.create(order=self.order, product=product, price=1000, total_price=1000)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def _post_review(self, product):
+        return self.client.post(
+            "/reviews/",
+            {"review_title": "제목", "content": "내용", "rating": "5", "product": product.pk},
+            format="json",
+        )
+
+    def test_delivery_grants_and_review_consumes_eligibility(self):
+        """배송 완료 시 작성 가능 목록이 생기고, 리뷰 작성/삭제에 따라 reviewed 가 바뀌는지 확인"""
+        self.assertEqual(self._post_review(self.products[0]).status_code, 400)
+
+        self.order.delivery_status = "배송 완료"
+        self.order.save()
+        response = self.client.get("/reviews/writable/")
+        self.assertEqual({row["product_id"] for row in response.data["results"]}, {p.pk for p in self.products})
+
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertTrue(claim_review(self.user.pk, self.products[0].pk)[0])
+        self.assertEqual(len(ctx.captured_queries), 1)
+        ReviewEligibility.objects.filter(pk=(self.user.pk, self.products[0].pk)).update(reviewed=False)
+
+        self.assertEqual(self._post_review(self.products[0]).status_code, 201)
+        second = self._post_review(self.products[0])
+        self.assertEqual(second.status_code, 400)
+        self.assertEqual(str(second.data["detail"]), "이미 해당 상품에 대한 리뷰를 작성했습니다.")
+        response = self.client.get("/reviews/writable/")
+        self.assertEqual([row["product_id"] for row in response.data["results"]], [self.products[1].pk])
+
+        Review.objects.get(user=self.user, product=self.products[0]).delete()
+        self.assertFalse(ReviewEligibility.objects.get(pk=(self.user.pk, self.products[0].pk)).reviewed)
+
+
+class KeywordTallyTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="tally@example.com", password="1234", nickname="tally", username="집계"
+        )
+        self.products = [
+            Product.objects.create(product_name=f"상품{i}", product_value="1000", product_stock="5") for i in range(2)
+        ]
+        self.good, self.cheap, self.bad = (
+            Keyword.objects.create(keyword_name="좋아요", keyword_type="positive"),
+            Keyword.objects.create(keyword_name="저렴해요", keyword_type="positive"),
+            Keyword.objects.create(keyword_name="별로예요", keyword_type="negative"),
+        )
+
+    def _save(self, data, instance=None):
+        serializer = ReviewCreateSerializer(instance, data=data, partial=instance is not None)
+        serializer.is_valid(raise_exception=True)
+        return serializer.save(user=self.user)
+
+    def _tallies(self, product):
+        return dict(ProductKeywordTally.objects.filter(product=product).values_list("keyword_id", "review_count"))
+
+    def test_tallies_follow_review_changes(self):
+        """리뷰 작성/키워드 수정/상품 변경/삭제에 따라 상품 키워드 집계가 증분으로 맞춰지는지 확인"""
+        first, second = self.products
+        base = {"review_title": "제목", "content": "내용", "rating": "4"}
+        review = self._save({**base, "product": first.pk, "keyword_ids": [self.good.pk, self.cheap.pk]})
+        self._save({**base, "product": first.pk, "keyword_ids": [self.good.pk, self.bad.pk]})
+        self.assertEqual(self._tallies(first), {self.good.pk: 2, self.cheap.pk: 1, self.bad.pk: 1})
+
+        self._save({"keyword_ids": [self.good.pk, self.bad.pk]}, instance=review)
+        self.assertEqual(self._tallies(first), {self.good.pk: 2, self.bad.pk: 2})
+
+        self._save({"product": second.pk}, instance=review)
+        self.assertEqual(self._tallies(first), {self.good.pk: 1, self.bad.pk: 1})
+        self.assertEqual(self._tallies(second), {self.good.pk: 1, self.bad.pk: 1})
+
+        review.delete()
+        self.assertEqual(self._tallies(second), {})
+
+        response = APIClient().get(f"/products/{first.pk}/keywords/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["sentiment"], {"positive": 1, "neutral": 0, "negative": 1})
+        self.assertEqual(response.data["top_keywords"][0]["keyword_name"], "좋아요")
+        detail = APIClient().get(f"/products/{first.pk}/")
+        self.assertEqual(detail.data["keyword_summary"], response.data)
+
+        ProductKeywordTally.objects.all().delete()
+        call_command("rebuild_keyword_tallies", stdout=StringIO())
+        self.assertEqual(self._tallies(first), {self.good.pk: 1, self.bad.pk: 1})
+
+    def test_admin_inline_changes_update_tallies(self):
+        """관리자 화면에서 리뷰 상품과 키워드 인라인을 바꿔도 집계가 rebuild 없이 맞는지 확인"""
+        first, second = self.products
+        review = self._save(
+            {
+                "review_title": "제목",
+                "content": "내용",
+                "rating": "4",
+                "product": first.pk,
+                "keyword_ids": [self.good.pk, self.cheap.pk],
+            }
+        )
+        admin = User.objects.create_superuser(email="admin@example.com", password="1234", username="관리자")
+        self.client.force_login(admin)
+        good_row, cheap_row = review.review_keywords.order_by("keyword_id")
+
+        response = self.client.post(
+            f"/admin/reviews/review/{review.pk}/change/",
+            {
+                "review_title": "제목",
+                "content": "내용",
+                "rating": "4",
+                "product": second.pk,
+                "user": self.user.pk,
+                "review_images-TOTAL_FORMS": "0",
+                "review_images-INITIAL_FORMS": "0",
+                "review_keywords-TOTAL_FORMS": "3",
+                "review_keywords-INITIAL_FORMS": "2",
+                "review_keywords-0-id": good_row.pk,
+                "review_keywords-0-review": review.pk,
+                "review_keywords-0-keyword": self.good.pk,
+                "review_keywords-1-id": cheap_row.pk,
+                "review_keywords-1-review": review.pk,
+                "review_keywords-1-keyword": self.cheap.pk,
+                "review_keywords-1-DELETE": "on",
+                "review_keywords-2-review": review.pk,
+                "review_keywords-2-keyword": self.bad.pk,
+            },
+        )
+
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(self._tallies(first), {})
+        self.assertEqual(self._tallies(second), {self.good.pk: 1, self.bad.pk: 1})
+
+
+class ReviewSearchTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="search@example.com", password="1234", nickname="search", username="검색"
+        )
+        self.product = Product.objects.create(product_name="상품", product_value="1000", product_stock="5")
+
+    def _review(self, title, content):
+        return Review.objects.create(
+            user=self.user, product=self.product, review_title=title, content=content, rating=Decimal("4")
+        )
+
+    def _search(self, q):
+        response = APIClient().get("/reviews/", {"q": q})
+        self.assertEqual(response.status_code, 200)
+        return [item["id"] for item in response.data["results"]]
+
+    def test_korean_search(self):
+        """조사/어미가 붙은 한국어 본문도 어간 일부와 영문 접두어로 찾고, 수정하면 검색 대상도 바뀌는지 확인"""
+        fast = self._review("배송 후기", "배송이 빨라요")
+        phone = self._review("갤럭시s24 케이스", "색상이 예뻐요")
+        self._review("보통", "그냥 그래요")
+
+        self.assertEqual(self._search("빨라"), [fast.pk])
+        self.assertEqual(self._search("배송 빨라"), [fast.pk])
+        self.assertEqual(self._search("갤럭"), [phone.pk])
+        self.assertEqual(self._search("S2"), [phone.pk])
+        self.assertEqual(self._search("환불"), [])
+        # 검색 토큰이 없는 검색어는 필터 없이 최신순 목록을 돌려준다
+        self.assertEqual(len(self._search("!!!")), 3)
+        self.assertEqual(len(self._search("?")), 3)
+
+        phone.content = "배송도 빨라요"
+        phone.save(update_fields=["content"])
+        self.assertCountEqual(self._search("빨라"), [fast.pk, phone.pk])
+
+    def test_search_ranks_by_relevance(self):
+        """PostgreSQL 에서는 검색어가 더 많이 나온 리뷰가 먼저 오는지 확인"""
+        if connection.vendor != "postgresql":
+            self.skipTest("관련도 정렬은 PostgreSQL 전문 검색에서만 지원")
+        once = self._review("후기", "배송이 빨라요")
+        twice = self._review("빨라요", "배송이 정말 빨라요")
+        self.assertEqual(self._search("빨라"), [twice.pk, once.pk])
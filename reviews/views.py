@@ -1,31 +1,59 @@
+from django.db import transaction
+from django.db.models import F, Prefetch
 from django_filters.rest_framework import DjangoFilterBackend
+from drf_spectacular.utils import OpenApiResponse, extend_schema
 from rest_framework import status, viewsets
+from rest_framework.decorators import action
 from rest_framework.exceptions import NotAuthenticated, ValidationError
 from rest_framework.filters import OrderingFilter
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 
-from orders.models import Order, OrderProduct
 from reviews.filters import ReviewFilter
-from reviews.models import Keyword, Review, ReviewImage, ReviewKeyword
+from reviews.models import Keyword, Review, ReviewEligibility, ReviewImage, ReviewKeyword
 from reviews.schema import reviews_schema
 from reviews.serializers import (
     KeywordSerializer,
+    ReviewableProductSerializer,
     ReviewCreateSerializer,
     ReviewImageSerializer,
     ReviewKeywordSerializer,
     ReviewSerializer,
 )
+from reviews.services.eligibility import claim_review
+from reviews.services.images import uploaded_review_images
+from reviews.services.search import full_text_search_enabled
+from utils.db_router import ReplicaReadMixin
+from utils.paginations import CreatedAtCursorPagination
+from utils.search import query_tokens
 
 
-class ReviewViewSet(viewsets.ModelViewSet):
+class ReviewableProductPagination(CreatedAtCursorPagination):
+    ordering = ("-created_at", "-product_id")
+
+    def get_ordering(self, request, queryset, view):
+        # 리뷰 목록의 OrderingFilter 설정과 무관하게 항상 배송 완료 최신순
+        return self.ordering
+
+
+class ReviewViewSet(ReplicaReadMixin, viewsets.ModelViewSet):
     queryset = Review.objects.all()
+    replica_actions = ("list",)
     serializer_class = ReviewSerializer
     filter_backends = [DjangoFilterBackend, OrderingFilter]
     filterset_class = ReviewFilter
+    pagination_class = CreatedAtCursorPagination
 
     ordering_fields = ["rating", "created_at", "product_review_count"]
-    ordering = ["-created_at"]
+
+    @property
+    def ordering(self):
+        # 검색어가 있으면 별도 ordering 을 주지 않는 한 관련도(search_rank) 순으로 보여준다.
+        # "!!!" 처럼 토큰이 없는 검색어는 search_reviews 가 search_rank 를 붙이지 않으므로 최신순
+        request = getattr(self, "request", None)
+        if request is not None and full_text_search_enabled() and query_tokens(request.query_params.get("q", "")):
+            return ["-search_rank", "-id"]
+        return ["-created_at", "-id"]
 
     @reviews_schema["list"]
     def list(self, request, *args, **kwargs):
@@ -44,9 +72,17 @@ class ReviewViewSet(viewsets.ModelViewSet):
         return super().list(request, *args, **kwargs)
 
     def get_queryset(self):
-        from django.db.models import Count
+        # 응답에 쓰는 연관 객체는 목록 크기와 상관없이 고정된 쿼리 수로 가져온다
+        queryset = Review.objects.select_related("user", "product").prefetch_related(
+            Prefetch("review_keywords", queryset=ReviewKeyword.objects.select_related("keyword")),
+            "review_images",
+        )
 
-        return Review.objects.annotate(product_review_count=Count("product__product_reviews"))
+        # 상품별 리뷰 수는 집계 대신 상품에 저장된 rating_count 를 쓰고, 그 값으로 정렬할 때만 붙인다
+        ordering_param = self.request.query_params.get("ordering")
+        if ordering_param and ordering_param.lstrip("-") == "product_review_count":
+            queryset = queryset.annotate(product_review_count=F("product__rating_count"))
+        return queryset
 
     def get_permissions(self):
         if self.action == "list":
@@ -64,12 +100,14 @@ class ReviewViewSet(viewsets.ModelViewSet):
         if product is None:
             raise ValidationError({"product": "상품은 필수입니다."})
 
-        writable, message = self.check_writable(product)
+        # 이미지는 review_eligibility 행 잠금을 잡기 전에 올리고, 작성할 수 없거나 롤백되면 지운다
+        with uploaded_review_images(serializer.pop_images()) as image_names, transaction.atomic():
+            writable, message = self.check_writable(product)
 
-        if not writable:
-            raise ValidationError({"detail": message})
+            if not writable:
+                raise ValidationError({"detail": message})
 
-        serializer.save(user=user)
+            serializer.save(user=user, review_image_names=image_names)
 
     def get_serializer_class(self):
         if self.action in ["create", "update", "partial_update"]:
@@ -82,23 +120,20 @@ class ReviewViewSet(viewsets.ModelViewSet):
         if not user or user.is_anonymous:
             return False, "로그인이 필요합니다."
 
-        if Review.objects.filter(user=user, product=product).exists():
-            return False, "이미 해당 상품에 대한 리뷰를 작성했습니다."
-
-        delivered_orders = Order.objects.filter(
-            user=user,
-            delivery_status="배송 완료"
-        )
-
-        purchased = OrderProduct.objects.filter(
-            order__in=delivered_orders,
-            product=product
-        ).exists()
-
-        if not purchased:
-            return False, "상품 구매 이력이 없거나 배송이 완료되지 않았습니다."
-
-        return True, "리뷰 작성이 가능합니다."
+        # 배송 완료 시 채워지는 review_eligibility 를 기본키로 조회하며, 작성 가능하면 바로 reviewed 로 표시한다
+        return claim_review(user.pk, product.pk)
+
+    @extend_schema(
+        summary="리뷰 작성 가능 상품 조회",
+        description="배송 완료된 주문 상품 중 아직 리뷰를 쓰지 않은 상품을 배송 완료 최신순으로 조회합니다.",
+        responses=OpenApiResponse(ReviewableProductSerializer(many=True)),
+    )
+    @action(detail=False, methods=["get"], url_path="writable")
+    def writable(self, request):
+        queryset = ReviewEligibility.objects.filter(user=request.user, reviewed=False).select_related("product")
+        paginator = ReviewableProductPagination()
+        page = paginator.paginate_queryset(queryset, request, view=self)
+        return paginator.get_paginated_response(ReviewableProductSerializer(page, many=True).data)
 
     @reviews_schema["create"]
     def create(self, request, *args, **kwargs):
@@ -9,5 +9,14 @@ echo "=== Running Django migrations ==="
 
 /root/.local/bin/poetry run python manage.py collectstatic --noinput
 
+# SERVER_MODE=asgi: gunicorn 이 uvicorn 워커를 관리하고 async 뷰(토스 승인, 네이버 콜백)가 업스트림을 기다리는 동안
+# 같은 워커가 다른 요청을 처리한다. ASGI 에서는 요청마다 다른 스레드에서 ORM 이 돌 수 있어 DB_POOL=true(기본)로 쓴다.
+# SERVER_MODE=wsgi(기본): 기존 sync 워커
+if [ "${SERVER_MODE:-wsgi}" = "asgi" ]; then
+    echo "=== Starting Gunicorn server (uvicorn workers) ==="
+    exec /root/.local/bin/poetry run gunicorn --bind 0.0.0.0:8000 config.asgi:application \
+        --workers "${WEB_CONCURRENCY:-2}" --worker-class uvicorn_worker.UvicornWorker
+fi
+
 echo "=== Starting Gunicorn server ==="
-/root/.local/bin/poetry run gunicorn --bind 0.0.0.0:8000 config.wsgi:application --workers 2
\ No newline at end of file
+exec /root/.local/bin/poetry run gunicorn --bind 0.0.0.0:8000 config.wsgi:application --workers "${WEB_CONCURRENCY:-2}" --threads "${WEB_THREADS:-1}"
@@ -1,8 +1,12 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from django.contrib.auth.forms import UserChangeForm, UserCreationForm
+from django.db import transaction
+from django.forms.models import BaseInlineFormSet
 
-from .models import Address, Point, User
+from .auth import invalidate_user_cache
+from .models import Address, Point, PointMonthlySummary, User
+from .services.addresses import set_default_address
 
 
 class MyUserCreationForm(UserCreationForm):
@@ -46,13 +50,24 @@ class AddressInline(admin.TabularInline):
     ordering = ("updated_at",)
 
 
+class LatestPointFormSet(BaseInlineFormSet):
+    def get_queryset(self):
+        # 전체 내역은 포인트 내역 관리 화면에서 확인 (유저 변경 화면에서는 최근 N건만)
+        if not hasattr(self, "_latest_queryset"):
+            self._latest_queryset = super().get_queryset()[: PointInline.max_rows]
+        return self._latest_queryset
+
+
 class PointInline(admin.TabularInline):
     model = Point
+    formset = LatestPointFormSet
     extra = 0
+    max_rows = 50
     fields = ("balance", "amount", "created_at", "updated_at")
     readonly_fields = ("balance", "amount", "created_at", "updated_at")
     can_delete = False
-    ordering = ("updated_at", "-id")
+    ordering = ("-created_at", "-id")
+    verbose_name_plural = f"최근 포인트 내역 ({max_rows}건)"
 
 
 @admin.register(User)
@@ -111,17 +126,23 @@ class UserAdmin(BaseUserAdmin):
 
     @admin.action(description="선택한 사용자를 활성화(active)로 변경")
     def mark_active(self, request, queryset):
+        user_ids = list(queryset.values_list("pk", flat=True))
         updated = queryset.update(status="active")
+        invalidate_user_cache(*user_ids)
         self.message_user(request, f"{updated}명의 사용자가 활성화되었습니다.")
 
     @admin.action(description="선택한 사용자를 비활성화(ready)로 변경")
     def mark_ready(self, request, queryset):
+        user_ids = list(queryset.values_list("pk", flat=True))
         updated = queryset.update(status="ready")
+        invalidate_user_cache(*user_ids)
         self.message_user(request, f"{updated}명의 사용자가 비활성화(ready)되었습니다.")
 
     @admin.action(description="선택한 사용자를 휴면(dormancy)으로 변경")
     def mark_dormancy(self, request, queryset):
+        user_ids = list(queryset.values_list("pk", flat=True))
         updated = queryset.update(status="dormancy")
+        invalidate_user_cache(*user_ids)
         self.message_user(request, f"{updated}명의 사용자가 휴면 처리되었습니다.")
 
     actions = (
@@ -152,6 +173,17 @@ class AddressAdmin(admin.ModelAdmin):
     list_select_related = ("user",)
     readonly_fields = ()
 
+    @transaction.atomic
+    def save_model(self, request, obj, form, change):
+        # 기본 배송지 지정은 기존 기본 배송지 해제와 함께 처리해야 부분 유니크 제약에 걸리지 않음
+        make_default = obj.is_default and "is_default" in form.changed_data
+        if make_default:
+            obj.is_default = False
+        super().save_model(request, obj, form, change)
+        if make_default:
+            set_default_address(obj.user_id, obj.pk)
+            obj.is_default = True
+
 
 @admin.register(Point)
 class PointAdmin(admin.ModelAdmin):
@@ -173,3 +205,17 @@ class PointAdmin(admin.ModelAdmin):
     # 포인트 삭제 금지
     def has_delete_permission(self, request, obj=None):
         return False
+
+
+@admin.register(PointMonthlySummary)
+class PointMonthlySummaryAdmin(admin.ModelAdmin):
+    list_display = ("id", "user", "month", "earned", "spent", "entry_count")
+    list_filter = ("month",)
+    search_fields = ("user__email",)
+    list_select_related = ("user",)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
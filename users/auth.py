@@ -1,24 +1,197 @@
+import logging
+import os
+import threading
+import time
 from datetime import datetime, timezone
 
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
 from django_redis import get_redis_connection
 from rest_framework_simplejwt.authentication import JWTAuthentication
 from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from utils.local_cache import LocalTTLCache
+
+logger = logging.getLogger(__name__)
 
 BLACKLIST_PREFIX = "jwt:blacklist:"
+USER_CACHE_PREFIX = "auth:user:"
+USER_GENERATION_PREFIX = "auth:user-gen:"
+INVALIDATION_CHANNEL = "auth:invalidate"
+
+# 비밀번호 해시는 캐시에 올리지 않는다 (스냅샷 유저에서는 deferred 필드로 남음)
+USER_SNAPSHOT_EXCLUDE = {"password"}
+
+_blacklist_cache = LocalTTLCache(
+    maxsize=getattr(settings, "AUTH_LOCAL_CACHE_MAXSIZE", 10000),
+    ttl=getattr(settings, "AUTH_BLACKLIST_LOCAL_TTL", 30),
+)
+_user_cache = LocalTTLCache(
+    maxsize=getattr(settings, "AUTH_LOCAL_CACHE_MAXSIZE", 10000),
+    ttl=getattr(settings, "AUTH_USER_LOCAL_TTL", 10),
+)
 
 
 def _redis():
     return get_redis_connection("default")
 
 
+class _InvalidationListener:
+    """
+    워커 프로세스마다 하나씩 뜨는 Redis pub/sub 구독 스레드.
+    구독이 살아 있을 때만 로컬 캐시에 '블랙리스트 아님'/유저 스냅샷을 저장한다.
+    """
+
+    def __init__(self):
+        self._pid = None
+        self._lock = threading.Lock()
+        self.connected = threading.Event()
+        self.generation = 0
+
+    def ensure_started(self):
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            # fork 된 워커는 부모의 스레드/캐시를 물려받지 않도록 새로 시작
+            self._pid = os.getpid()
+            self.connected.clear()
+            self.reset()
+            threading.Thread(target=self._run, name="auth-invalidation-listener", daemon=True).start()
+
+    def reset(self):
+        self.generation += 1
+        _blacklist_cache.clear()
+        _user_cache.clear()
+
+    def can_cache(self, generation: int) -> bool:
+        # 조회 도중 무효화 메시지를 받았다면 (generation 변경) 로컬에 저장하지 않음
+        return self.connected.is_set() and generation == self.generation
+
+    def handle(self, data):
+        if isinstance(data, bytes):
+            data = data.decode()
+        kind, _, value = data.partition(":")
+        self.generation += 1
+        if kind == "jti":
+            _blacklist_cache.set(value, True)
+        elif kind == "user":
+            _user_cache.delete(value)
+
+    def _run(self):
+        backoff = 1
+        while True:
+            pubsub = None
+            try:
+                pubsub = _redis().pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(INVALIDATION_CHANNEL)
+                # 구독 전이나 끊겨 있던 동안 놓쳤을 수 있는 무효화를 반영
+                self.reset()
+                self.connected.set()
+                backoff = 1
+                for message in pubsub.listen():
+                    self.handle(message["data"])
+            except Exception:
+                logger.warning("auth invalidation listener disconnected", exc_info=True)
+            finally:
+                self.connected.clear()
+                self.reset()
+                if pubsub is not None:
+                    try:
+                        pubsub.close()
+                    except Exception:
+                        pass
+            time.sleep(backoff)
+            backoff = min(backoff * 2, 30)
+
+
+_listener = _InvalidationListener()
+
+
+def _publish(message: str):
+    try:
+        _redis().publish(INVALIDATION_CHANNEL, message)
+    except Exception:
+        logger.warning("failed to publish auth invalidation %s", message, exc_info=True)
+
+
 def blacklist_jti(jti: str, exp_timestamp: int):
     now = int(datetime.now(timezone.utc).timestamp())
     ttl = max(exp_timestamp - now, 1)
     _redis().setex(f"{BLACKLIST_PREFIX}{jti}", ttl, 1)
+    _blacklist_cache.set(jti, True)
+    _publish(f"jti:{jti}")
 
 
 def is_blacklisted(jti: str) -> bool:
-    return _redis().get(f"{BLACKLIST_PREFIX}{jti}") is not None
+    _listener.ensure_started()
+    cached = _blacklist_cache.get(jti)
+    if cached is not None:
+        return cached
+
+    generation = _listener.generation
+    blacklisted = _redis().get(f"{BLACKLIST_PREFIX}{jti}") is not None
+    if blacklisted or _listener.can_cache(generation):
+        _blacklist_cache.set(jti, blacklisted)
+    return blacklisted
+
+
+def _user_snapshot(user) -> dict:
+    return {
+        f.attname: getattr(user, f.attname)
+        for f in user._meta.concrete_fields
+        if f.attname not in USER_SNAPSHOT_EXCLUDE
+    }
+
+
+def _user_from_snapshot(snapshot: dict):
+    field_names = [name for name in snapshot if not name.startswith("_")]
+    return get_user_model().from_db(DEFAULT_DB_ALIAS, field_names, [snapshot[name] for name in field_names])
+
+
+def get_cached_user(user_id):
+    """로컬 캐시 -> Redis 스냅샷 -> DB 순서로 유저를 조회한다. 없으면 None."""
+    _listener.ensure_started()
+    local_key = str(user_id)
+    snapshot = _user_cache.get(local_key)
+    if snapshot is not None:
+        return _user_from_snapshot(snapshot)
+
+    local_generation = _listener.generation
+    snapshot_key = f"{USER_CACHE_PREFIX}{user_id}"
+    generation_key = f"{USER_GENERATION_PREFIX}{user_id}"
+    cached = cache.get_many([snapshot_key, generation_key])
+    generation = cached.get(generation_key, 0)
+
+    snapshot = cached.get(snapshot_key)
+    if snapshot is None or snapshot.get("_generation") != generation:
+        user = get_user_model().objects.filter(pk=user_id).first()
+        if user is None:
+            return None
+        # 조회 직후 무효화가 일어나면 generation 이 올라가므로 이 스냅샷은 다음 조회에서 버려진다
+        snapshot = {**_user_snapshot(user), "_generation": generation}
+        cache.set(snapshot_key, snapshot, timeout=getattr(settings, "AUTH_USER_CACHE_TTL", 60 * 5))
+
+    if _listener.can_cache(local_generation):
+        _user_cache.set(local_key, snapshot)
+    return _user_from_snapshot(snapshot)
+
+
+def invalidate_user_cache(*user_ids):
+    for user_id in user_ids:
+        _user_cache.delete(str(user_id))
+        try:
+            generation_key = f"{USER_GENERATION_PREFIX}{user_id}"
+            cache.add(generation_key, 0, timeout=None)
+            cache.incr(generation_key)
+            cache.delete(f"{USER_CACHE_PREFIX}{user_id}")
+        except Exception:
+            logger.warning("failed to invalidate cached user %s", user_id, exc_info=True)
+        _publish(f"user:{user_id}")
 
 
 class RedisBlacklistJWTAuthentication(JWTAuthentication):
@@ -50,3 +223,20 @@ class RedisBlacklistJWTAuthentication(JWTAuthentication):
         if is_blacklisted(jti):
             raise AuthenticationFailed("Token blacklisted")
         return token
+
+    def get_user(self, validated_token):
+        if api_settings.CHECK_REVOKE_TOKEN:
+            # 비밀번호 해시 비교가 필요하므로 캐시를 쓰지 않음
+            return super().get_user(validated_token)
+
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken("Token contained no recognizable user identification")
+
+        user = get_cached_user(user_id)
+        if user is None:
+            raise AuthenticationFailed("User not found", code="user_not_found")
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed("User is inactive", code="user_inactive")
+        return user
@@ -0,0 +1,13 @@
+from django.contrib.auth.hashers import Argon2PasswordHasher as BaseArgon2PasswordHasher
+
+
+class Argon2PasswordHasher(BaseArgon2PasswordHasher):
+    """
+    작은 인스턴스용으로 조정한 Argon2id (OWASP 권장 최소값: 메모리 19MiB, 반복 2회, 병렬도 1).
+    Django 기본값(100MiB, 병렬도 8)은 동시 로그인이 몰리면 메모리가 먼저 바닥난다.
+    알고리즘 이름은 그대로 "argon2" 라서 파라미터가 다른 기존 해시도 검증되고, 다음 로그인 때 이 값으로 재해시된다.
+    """
+
+    time_cost = 2
+    memory_cost = 19 * 1024
+    parallelism = 1
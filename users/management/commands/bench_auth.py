@@ -0,0 +1,68 @@
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.tokens import AccessToken
+
+from users.auth import BLACKLIST_PREFIX, RedisBlacklistJWTAuthentication, _listener, _redis
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = "JWT 인증 1회당 오버헤드(블랙리스트 확인 + 유저 조회)를 로컬 캐시 적용 전/후로 비교합니다. (Redis, DB 필요)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=2000)
+        parser.add_argument("--email", default="bench-auth@obestore.local")
+
+    def handle(self, *args, **options):
+        user, created = User.objects.get_or_create(
+            email=options["email"],
+            defaults={"username": "bench", "nickname": "bench", "phone_number": "01000000000", "status": "active"},
+        )
+        if created:
+            user.set_unusable_password()
+            user.save(update_fields=["password"])
+
+        token = AccessToken.for_user(user)
+        request = RequestFactory().get("/users/me", HTTP_AUTHORIZATION=f"Bearer {token}")
+        auth = RedisBlacklistJWTAuthentication()
+        raw_token = auth.get_raw_token(auth.get_header(request))
+
+        def before():
+            # 기존 경로: 토큰 검증 + Redis GET + user SELECT
+            validated = JWTAuthentication.get_validated_token(auth, raw_token)
+            _redis().get(f"{BLACKLIST_PREFIX}{validated['jti']}")
+            return JWTAuthentication.get_user(auth, validated)
+
+        def after():
+            return auth.authenticate(request)
+
+        _listener.ensure_started()
+        if not _listener.connected.wait(timeout=5):
+            self.stderr.write("pub/sub 구독에 실패해 로컬 캐시가 비활성화된 상태로 측정합니다.")
+
+        iterations = options["iterations"]
+        for name, fn in (("before", before), ("after", after)):
+            fn()  # 워밍업 (캐시 채우기)
+            with CaptureQueriesContext(connection) as ctx:
+                fn()
+            timings = []
+            for _ in range(iterations):
+                start = time.perf_counter()
+                fn()
+                timings.append((time.perf_counter() - start) * 1_000_000)
+            timings.sort()
+            self.stdout.write(
+                f"[{name}] iterations={iterations} "
+                f"mean={statistics.fmean(timings):.1f}us "
+                f"p50={timings[len(timings) // 2]:.1f}us "
+                f"p99={timings[int(len(timings) * 0.99) - 1]:.1f}us "
+                f"db_queries/req={len(ctx.captured_queries)}"
+            )
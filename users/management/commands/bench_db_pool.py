@@ -0,0 +1,93 @@
+import time
+
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import RequestFactory
+
+# 모드 -> DATABASES["default"] 에 덮어쓸 값
+MODES = {
+    "none": {"CONN_MAX_AGE": 0, "CONN_HEALTH_CHECKS": False},
+    "persistent": {"CONN_MAX_AGE": 600, "CONN_HEALTH_CHECKS": True},
+    "pool": {"CONN_MAX_AGE": 0, "CONN_HEALTH_CHECKS": True, "pool": {"min_size": 1, "max_size": 2}},
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "연결 재사용 방식(none / persistent / pool)별로 가벼운 엔드포인트(기본 /health/)의 요청 지연 p50/p99 를 "
+        "측정합니다. 요청 시작/종료 시그널까지 실제 WSGI 핸들러로 처리하므로 요청마다 연결을 닫고 여는 비용이 포함됩니다. "
+        "(PostgreSQL 필요)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=200)
+        parser.add_argument("--path", default="/health/")
+        parser.add_argument("--host", default="localhost", help="ALLOWED_HOSTS 에 있는 호스트")
+        parser.add_argument("--modes", nargs="+", default=list(MODES), help=f"측정할 모드 ({', '.join(MODES)})")
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            raise CommandError("PostgreSQL 에서만 측정할 수 있습니다.")
+        unknown = set(options["modes"]) - set(MODES)
+        if unknown:
+            raise CommandError(f"알 수 없는 모드입니다: {', '.join(sorted(unknown))}")
+
+        handler = WSGIHandler()
+        environ = RequestFactory(SERVER_NAME=options["host"])._base_environ(
+            PATH_INFO=options["path"], REQUEST_METHOD="GET"
+        )
+        original = {**connection.settings_dict, "OPTIONS": dict(connection.settings_dict["OPTIONS"])}
+
+        def request():
+            # response.close() 에서 request_finished 가 나가며 CONN_MAX_AGE / 풀 설정대로 연결을 닫거나 반납한다
+            response = handler(dict(environ), lambda status, headers: None)
+            response.close()
+            if response.status_code != 200:
+                raise CommandError(f"{options['path']} 응답이 {response.status_code} 입니다.")
+
+        try:
+            for mode in options["modes"]:
+                self._configure(self._mode_settings(original, MODES[mode]))
+                request()  # 워밍업 (풀 열기)
+
+                timings = []
+                for _ in range(options["requests"]):
+                    start = time.perf_counter()
+                    request()
+                    timings.append((time.perf_counter() - start) * 1000)
+
+                timings.sort()
+                line = (
+                    f"[{mode}] requests={len(timings)} "
+                    f"p50={timings[len(timings) // 2]:.2f}ms "
+                    f"p99={timings[max(int(len(timings) * 0.99) - 1, 0)]:.2f}ms"
+                )
+                if connection.pool is not None:
+                    stats = connection.pool.get_stats()
+                    line += (
+                        f" pool_size={stats.get('pool_size')} connections_num={stats.get('connections_num', 0)}"
+                        f" requests_wait_ms={stats.get('requests_wait_ms', 0)}"
+                    )
+                self.stdout.write(line)
+        finally:
+            self._configure(original)
+
+    @staticmethod
+    def _mode_settings(original, mode):
+        options = {key: value for key, value in original["OPTIONS"].items() if key != "pool"}
+        if "pool" in mode:
+            options["pool"] = mode["pool"]
+        return {
+            **original,
+            "CONN_MAX_AGE": mode["CONN_MAX_AGE"],
+            "CONN_HEALTH_CHECKS": mode["CONN_HEALTH_CHECKS"],
+            "OPTIONS": options,
+        }
+
+    @staticmethod
+    def _configure(settings_dict):
+        connection.close()
+        if connection.pool is not None:
+            connection.close_pool()
+        connection.settings_dict.update(settings_dict)
@@ -0,0 +1,72 @@
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import get_hasher
+from django.core.management.base import BaseCommand, CommandError
+from django.test import RequestFactory
+from django.test.utils import override_settings
+
+from users.serializers import LoginSerializer
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = "해셔별 로그인(LoginSerializer: authenticate + JWT 발급) 지연 p50/p99 와 로그인 1회당 CPU 시간을 측정합니다. (DB 필요)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=50)
+        parser.add_argument("--email", default="bench-login@obestore.local")
+        parser.add_argument("--password", default="bench-login-Passw0rd!")
+        parser.add_argument(
+            "--hashers",
+            nargs="+",
+            default=list(settings.PASSWORD_HASHER_CHOICES),
+            help=f"측정할 해셔 ({', '.join(settings.PASSWORD_HASHER_CHOICES)})",
+        )
+
+    def handle(self, *args, **options):
+        unknown = set(options["hashers"]) - set(settings.PASSWORD_HASHER_CHOICES)
+        if unknown:
+            raise CommandError(f"알 수 없는 해셔입니다: {', '.join(sorted(unknown))}")
+
+        email, password = options["email"], options["password"]
+        user, _ = User.objects.get_or_create(
+            email=email,
+            defaults={"username": "bench", "nickname": "bench", "phone_number": "01000000000", "status": "active"},
+        )
+        request = RequestFactory().post("/auth/login")
+        iterations = options["iterations"]
+
+        def login():
+            serializer = LoginSerializer(data={"email": email, "password": password}, context={"request": request})
+            serializer.is_valid(raise_exception=True)
+            return serializer.save()
+
+        for name in options["hashers"]:
+            # 측정 중에는 해당 해셔만 두어 재해시가 일어나지 않게 한다
+            with override_settings(PASSWORD_HASHERS=[settings.PASSWORD_HASHER_CHOICES[name]]):
+                user.set_password(password)
+                user.save(update_fields=["password"])
+                login()  # 워밍업
+
+                timings = []
+                cpu_start = time.process_time()
+                for _ in range(iterations):
+                    start = time.perf_counter()
+                    login()
+                    timings.append((time.perf_counter() - start) * 1000)
+                cpu_per_login = (time.process_time() - cpu_start) * 1000 / iterations
+                algorithm = get_hasher().algorithm
+
+            timings.sort()
+            self.stdout.write(
+                f"[{name}] algorithm={algorithm} iterations={iterations} "
+                f"p50={timings[len(timings) // 2]:.1f}ms "
+                f"p99={timings[max(int(len(timings) * 0.99) - 1, 0)]:.1f}ms "
+                f"cpu/login={cpu_per_login:.1f}ms"
+            )
+
+        user.set_unusable_password()
+        user.save(update_fields=["password"])
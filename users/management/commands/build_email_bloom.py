@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from users.services.email_bloom import build_email_bloom
+
+
+class Command(BaseCommand):
+    help = "가입된 이메일로 Redis Bloom 필터를 새로 만듭니다. (이메일 중복 확인에서 DB 조회를 줄이기 위함)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=5000)
+
+    def handle(self, *args, **options):
+        count = build_email_bloom(chunk_size=options["chunk_size"])
+        self.stdout.write(self.style.SUCCESS(f"이메일 {count}개로 Bloom 필터 생성 완료"))
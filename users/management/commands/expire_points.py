@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from users.services.point_batch import DEFAULT_CHUNK_SIZE, expire_points
+
+
+class Command(BaseCommand):
+    help = "소멸일이 지난 적립 포인트를 일괄 소멸시킵니다. 주기적으로(cron) 실행하며, 중단되어도 이어서 처리합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        total = 0
+        for expired in expire_points(chunk_size=options["chunk_size"]):
+            total += expired
+            self.stdout.write(f"{expired}건 소멸 (누적 {total}건)")
+        self.stdout.write(self.style.SUCCESS(f"포인트 소멸 {total}건 완료"))
@@ -0,0 +1,58 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from users.models import User
+from users.services.point_batch import DEFAULT_CHUNK_SIZE, grant_points_bulk
+
+
+def _read_user_ids(path: str):
+    with open(path) as f:
+        for line_no, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            try:
+                yield int(line)
+            except ValueError:
+                raise CommandError(f"{path}:{line_no} 올바른 user id 가 아닙니다: {line}")
+
+
+class Command(BaseCommand):
+    help = (
+        "캠페인 포인트를 일괄 지급합니다. user id 파일(한 줄에 하나) 또는 활성 유저 전체를 대상으로 하며, "
+        "중단되어도 같은 --campaign 으로 다시 실행하면 지급되지 않은 유저만 이어서 처리합니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--campaign", required=True, help="캠페인 식별자 (event_key 에 사용)")
+        parser.add_argument("--amount", type=int, required=True)
+        target = parser.add_mutually_exclusive_group(required=True)
+        target.add_argument("--file", help="user id 목록 파일")
+        target.add_argument("--active-users", action="store_true", help="status=active 인 유저 전체")
+        parser.add_argument("--expires-in-days", type=int, default=None, help="지급분 소멸까지의 일수")
+        parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        campaign = options["campaign"]
+        if len(campaign) > 80 or ":" in campaign:
+            raise CommandError("--campaign 은 ':' 없이 80자 이하여야 합니다.")
+        if options["amount"] <= 0:
+            raise CommandError("--amount 는 0보다 커야 합니다.")
+
+        users = _read_user_ids(options["file"]) if options["file"] else User.objects.filter(status="active")
+        expires_at = None
+        if options["expires_in_days"] is not None:
+            expires_at = timezone.now() + timedelta(days=options["expires_in_days"])
+
+        total = 0
+        for chunk_no, granted in enumerate(
+            grant_points_bulk(
+                users, options["amount"], campaign=campaign, expires_at=expires_at, chunk_size=options["chunk_size"]
+            ),
+            start=1,
+        ):
+            total += granted
+            self.stdout.write(f"chunk {chunk_no}: {granted}명 지급 (누적 {total}명)")
+        self.stdout.write(self.style.SUCCESS(f"[{campaign}] {total}명에게 {options['amount']}포인트 지급 완료"))
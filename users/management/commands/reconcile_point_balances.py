@@ -0,0 +1,83 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Exists, F, OuterRef, Sum, Window
+from django.db.models.functions import RowNumber
+
+from users.auth import invalidate_user_cache
+from users.models import Point, User
+
+
+def ledger_mismatches():
+    """
+    User.point_balance 가 원장 합계와 다른 유저를 (user_id, point_balance, ledger_sum, last_balance) 로 반환.
+    유저별 루프 대신 윈도우 함수 한 번으로 합계와 마지막 내역을 같이 구한다.
+    """
+    latest = (
+        Point.objects.annotate(
+            ledger_sum=Window(Sum("amount"), partition_by=[F("user_id")]),
+            row_number=Window(
+                RowNumber(), partition_by=[F("user_id")], order_by=[F("created_at").desc(), F("id").desc()]
+            ),
+        )
+        .filter(row_number=1)
+        .exclude(user__point_balance=F("ledger_sum"))
+        .values_list("user_id", "user__point_balance", "ledger_sum", "balance")
+    )
+    yield from latest.iterator(chunk_size=2000)
+
+    # 내역이 하나도 없는데 잔액이 남아 있는 유저
+    orphans = (
+        User.objects.exclude(point_balance=0)
+        .filter(~Exists(Point.objects.filter(user_id=OuterRef("pk"))))
+        .values_list("id", "point_balance")
+    )
+    for user_id, balance in orphans.iterator(chunk_size=2000):
+        yield user_id, balance, 0, None
+
+
+class Command(BaseCommand):
+    help = "User.point_balance 와 포인트 원장 합계(SUM(amount))를 일괄 비교합니다. --fix 로 원장 기준으로 맞춥니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--fix", action="store_true")
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        mismatched = []
+        for user_id, balance, ledger_sum, last_balance in ledger_mismatches():
+            mismatched.append(user_id)
+            self.stdout.write(
+                f"user={user_id} point_balance={balance} ledger_sum={ledger_sum} last_ledger_balance={last_balance}"
+            )
+
+        self.stdout.write(f"불일치 {len(mismatched)}명")
+        if not options["fix"] or not mismatched:
+            return
+
+        batch_size = options["batch_size"]
+        fixed = 0
+        for i in range(0, len(mismatched), batch_size):
+            fixed += self._fix(mismatched[i : i + batch_size])
+        self.stdout.write(self.style.SUCCESS(f"{fixed}명 잔액 보정 완료"))
+
+    @transaction.atomic
+    def _fix(self, user_ids) -> int:
+        # 비교 이후 적립/사용이 있었을 수 있으므로 잠근 뒤 합계를 다시 계산
+        users = list(User.objects.select_for_update().filter(id__in=user_ids).order_by("id").only("id", "point_balance"))
+        sums = dict(
+            Point.objects.filter(user_id__in=user_ids)
+            .order_by()
+            .values("user_id")
+            .annotate(total=Sum("amount"))
+            .values_list("user_id", "total")
+        )
+        changed = []
+        for user in users:
+            total = sums.get(user.id, 0)
+            if user.point_balance != total:
+                user.point_balance = total
+                changed.append(user)
+        User.objects.bulk_update(changed, ["point_balance"])
+        ids = [user.id for user in changed]
+        transaction.on_commit(lambda: invalidate_user_cache(*ids), robust=True)
+        return len(changed)
@@ -0,0 +1,49 @@
+from datetime import date, datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Max, Min
+from django.utils import timezone
+
+from users.models import Point, PointMonthlySummary
+from users.services.point_summary import next_month, rollup_point_summaries
+
+
+def _parse_month(value: str) -> date:
+    try:
+        return datetime.strptime(value, "%Y-%m").date()
+    except ValueError:
+        raise CommandError(f"월 형식이 올바르지 않습니다: {value} (YYYY-MM)")
+
+
+class Command(BaseCommand):
+    help = "마감된 달의 포인트 내역을 PointMonthlySummary 로 집계합니다. 기본값은 마지막 요약 다음 달부터 지난달까지."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--since", help="집계 시작 월 (YYYY-MM). 이미 집계된 달을 다시 계산할 때 사용")
+
+    def handle(self, *args, **options):
+        until = timezone.localdate().replace(day=1)
+
+        if options["since"]:
+            since = _parse_month(options["since"])
+        else:
+            last = PointMonthlySummary.objects.aggregate(month=Max("month"))["month"]
+            if last is not None:
+                since = next_month(last)
+            else:
+                first = Point.objects.aggregate(created_at=Min("created_at"))["created_at"]
+                if first is None:
+                    self.stdout.write("집계할 포인트 내역이 없습니다.")
+                    return
+                since = timezone.localtime(first).date().replace(day=1)
+
+        if since >= until:
+            self.stdout.write("새로 마감된 달이 없습니다.")
+            return
+
+        month = since
+        while month < until:
+            count = rollup_point_summaries(month, next_month(month))
+            self.stdout.write(f"{month:%Y-%m}: {count}건")
+            month = next_month(month)
+        self.stdout.write(self.style.SUCCESS("완료"))
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from utils.mail import run_mail_worker
+
+
+class Command(BaseCommand):
+    help = "메일 발송 큐를 처리합니다. 배치마다 SMTP 연결 하나를 재사용하고, 실패한 메일은 지연 재시도합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=None)
+        parser.add_argument("--poll-timeout", type=int, default=5)
+        parser.add_argument("--once", action="store_true", help="큐가 빌 때까지만 처리하고 종료")
+
+    def handle(self, *args, **options):
+        self.stdout.write("mail worker started")
+        run_mail_worker(batch_size=options["batch_size"], poll_timeout=options["poll_timeout"], once=options["once"])
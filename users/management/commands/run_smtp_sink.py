@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from utils.smtp_sink import SMTPSink
+
+
+class Command(BaseCommand):
+    help = "로컬 개발/부하 측정용 SMTP 서버를 띄웁니다. (EMAIL_HOST=127.0.0.1 EMAIL_PORT=<port> EMAIL_USE_TLS=false)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--host", default="127.0.0.1")
+        parser.add_argument("--port", type=int, default=1025)
+
+    def handle(self, *args, **options):
+        sink = SMTPSink(options["host"], options["port"])
+        self.stdout.write(f"smtp sink listening on {sink.host}:{sink.port}")
+        try:
+            sink.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            sink.stop()
+            self.stdout.write(f"connections={sink.connection_count} messages={len(sink.messages)}")
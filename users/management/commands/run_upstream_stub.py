@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from utils.upstream_stub import UpstreamStub
+
+
+class Command(BaseCommand):
+    help = (
+        "외부 API(네이버 OAuth, 토스페이먼츠) 스텁 서버를 띄웁니다. 부하 테스트 시 "
+        "NAVER_TOKEN_URL=<stub>/oauth2.0/token NAVER_PROFILE_URL=<stub>/v1/nid/me TOSS_API_BASE_URL=<stub> 로 지정하세요."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--host", default="127.0.0.1")
+        parser.add_argument("--port", type=int, default=9000)
+        parser.add_argument("--latency", type=float, default=0.5, help="응답 지연(초)")
+        parser.add_argument("--verbose", action="store_true")
+
+    def handle(self, *args, **options):
+        stub = UpstreamStub(options["host"], options["port"], latency=options["latency"], verbose=options["verbose"])
+        self.stdout.write(f"upstream stub listening on {stub.base_url} (latency={options['latency']}s)")
+        try:
+            stub.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            stub.stop()
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.18 on 2026-10-19 17:50
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0003_alter_sociallogin_provider_user_id'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PointMonthlySummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField(verbose_name='월')),
+                ('earned', models.IntegerField(default=0, verbose_name='적립 합계')),
+                ('spent', models.IntegerField(default=0, verbose_name='사용 합계')),
+                ('entry_count', models.IntegerField(default=0, verbose_name='내역 수')),
+            ],
+            options={
+                'verbose_name': '월별 포인트 요약',
+                'verbose_name_plural': '월별 포인트 요약 목록',
+                'db_table': 'point_monthly_summaries',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='point',
+            index=models.Index(fields=['user', '-created_at', '-id'], name='points_user_created_idx'),
+        ),
+        migrations.AddField(
+            model_name='pointmonthlysummary',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='point_summaries', to=settings.AUTH_USER_MODEL, verbose_name='회원번호'),
+        ),
+        migrations.AddConstraint(
+            model_name='pointmonthlysummary',
+            constraint=models.UniqueConstraint(fields=('user', 'month'), name='unique_point_summary_user_month'),
+        ),
+    ]
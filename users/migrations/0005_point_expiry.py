@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-19 17:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0004_point_summary'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='point',
+            name='expires_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='소멸 예정일'),
+        ),
+        migrations.AddField(
+            model_name='point',
+            name='is_expired',
+            field=models.BooleanField(default=False, verbose_name='소멸 처리 여부'),
+        ),
+        migrations.AddIndex(
+            model_name='point',
+            index=models.Index(condition=models.Q(('expires_at__isnull', False), ('is_expired', False)), fields=['expires_at'], name='points_pending_expiry_idx'),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-19 18:03
+
+from django.db import migrations, models
+
+
+def backfill_login_type(apps, schema_editor):
+    User = apps.get_model("users", "User")
+    SocialLogin = apps.get_model("users", "SocialLogin")
+    providers = SocialLogin.objects.order_by().values_list("provider", flat=True).distinct()
+    for provider in providers:
+        User.objects.filter(social_logins__provider=provider).update(login_type=provider)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0005_point_expiry'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='login_type',
+            field=models.CharField(choices=[('email', 'email'), ('naver', 'naver')], default='email', max_length=20, verbose_name='로그인 방식'),
+        ),
+        migrations.RunPython(backfill_login_type, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-19 18:05
+
+from django.db import migrations, models
+
+
+def dedupe_default_addresses(apps, schema_editor):
+    # 제약을 걸기 전에 기본 배송지가 여러 개인 유저는 가장 최근에 수정한 것만 남긴다
+    Address = apps.get_model("users", "Address")
+    duplicated = (
+        Address.objects.filter(is_default=True)
+        .order_by()
+        .values("user_id")
+        .annotate(count=models.Count("id"))
+        .filter(count__gt=1)
+        .values_list("user_id", flat=True)
+    )
+    for user_id in duplicated:
+        keep = Address.objects.filter(user_id=user_id, is_default=True).order_by("-updated_at", "-id").first()
+        Address.objects.filter(user_id=user_id, is_default=True).exclude(pk=keep.pk).update(is_default=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0006_user_login_type'),
+    ]
+
+    operations = [
+        migrations.RunPython(dedupe_default_addresses, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='address',
+            constraint=models.UniqueConstraint(condition=models.Q(('is_default', True)), fields=('user',), name='unique_default_address_per_user'),
+        ),
+    ]
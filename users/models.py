@@ -34,6 +34,10 @@ class User(AbstractBaseUser, PermissionsMixin, TimestampModel):
         ("active", "활성화"),
         ("dormancy", "휴면상태"),
     )
+    LOGIN_TYPE_CHOICES = (
+        ("email", "email"),
+        ("naver", "naver"),
+    )
 
     email = models.EmailField(max_length=100, null=False, unique=True, verbose_name="이메일")
     password = models.CharField(max_length=255, null=False, verbose_name="비밀번호")
@@ -43,6 +47,8 @@ class User(AbstractBaseUser, PermissionsMixin, TimestampModel):
     is_staff = models.BooleanField(default=False, verbose_name="관리자권한")
     status = models.CharField(max_length=10, choices=STATUS_CHOICES, default="ready", verbose_name="계정상태")
     point_balance = models.IntegerField(default=0)
+    # SocialLogin 을 매번 조회하지 않도록 가입/소셜 연동 시점에 기록 (NaverCallbackView 에서 갱신)
+    login_type = models.CharField(max_length=20, choices=LOGIN_TYPE_CHOICES, default="email", verbose_name="로그인 방식")
 
     objects = UserManager()
 
@@ -101,6 +107,12 @@ class Address(TimestampModel):
         verbose_name_plural = "배송지 목록"
         ordering = ("-updated_at",)  # 최신 내역이 위로 오도록
         db_table = "addresses"
+        constraints = [
+            # 유저당 기본 배송지는 하나만 (변경은 users.services.addresses.set_default_address)
+            models.UniqueConstraint(
+                fields=["user"], condition=models.Q(is_default=True), name="unique_default_address_per_user"
+            ),
+        ]
 
     def __str__(self):
         return self.address_name
@@ -112,9 +124,39 @@ class Point(TimestampModel):
     amount = models.IntegerField(verbose_name="포인트 변화량")
 
     event_key = models.CharField(max_length=120, null=True, blank=True, unique=True, verbose_name="이벤트 키")
+    expires_at = models.DateTimeField(null=True, blank=True, verbose_name="소멸 예정일")
+    is_expired = models.BooleanField(default=False, verbose_name="소멸 처리 여부")
 
     class Meta:
         verbose_name = "포인트 내역"
         verbose_name_plural = "포인트 내역 목록"
         ordering = ("-updated_at",)
         db_table = "points"
+        indexes = [
+            # 내역 커서 페이지네이션 (user 별 created_at, id 역순)
+            models.Index(fields=["user", "-created_at", "-id"], name="points_user_created_idx"),
+            # 소멸 배치가 아직 처리하지 않은 적립분만 빠르게 찾도록
+            models.Index(
+                fields=["expires_at"],
+                name="points_pending_expiry_idx",
+                condition=models.Q(is_expired=False, expires_at__isnull=False),
+            ),
+        ]
+
+
+class PointMonthlySummary(models.Model):
+    """마감된 달의 포인트 적립/사용 합계 (rollup_point_summaries 커맨드로 생성)"""
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="point_summaries", verbose_name="회원번호")
+    month = models.DateField(verbose_name="월")  # 해당 월 1일
+    earned = models.IntegerField(default=0, verbose_name="적립 합계")
+    spent = models.IntegerField(default=0, verbose_name="사용 합계")
+    entry_count = models.IntegerField(default=0, verbose_name="내역 수")
+
+    class Meta:
+        verbose_name = "월별 포인트 요약"
+        verbose_name_plural = "월별 포인트 요약 목록"
+        db_table = "point_monthly_summaries"
+        constraints = [
+            models.UniqueConstraint(fields=["user", "month"], name="unique_point_summary_user_month"),
+        ]
@@ -1,10 +1,11 @@
 from django.contrib.auth import authenticate, get_user_model, password_validation
-from django.db import IntegrityError
+from django.db import IntegrityError, transaction
 from rest_framework import serializers
 from rest_framework.validators import UniqueValidator
 from rest_framework_simplejwt.tokens import RefreshToken
 
 from users.models import Address, Point
+from users.services.addresses import set_default_address
 
 User = get_user_model()
 
@@ -38,9 +39,7 @@ class SignUpSerializer(serializers.ModelSerializer):
         validated_data.pop("email_checked", None)
         pwd = validated_data.pop("password")
         try:
-            user = User.objects.create_user(password=pwd, **validated_data, status="ready")
-            user._login_type = "email"
-            return user
+            return User.objects.create_user(password=pwd, **validated_data, status="ready")
         except IntegrityError:
             raise serializers.ValidationError({"email": "이미 등록된 이메일입니다."})
 
@@ -75,7 +74,7 @@ class MeUpdateSerializer(serializers.ModelSerializer):
         fields = ["password"]
 
     def validate_password(self, value):
-        if self.instance.social_logins.exists():
+        if self.instance.login_type != "email":
             raise serializers.ValidationError("소셜 로그인 회원은 비밀번호를 변경할 수 없습니다.")
 
         password_validation.validate_password(value, user=self.instance)
@@ -89,19 +88,11 @@ class MeUpdateSerializer(serializers.ModelSerializer):
 
 
 class MeSerializer(serializers.ModelSerializer):
-    login_type = serializers.SerializerMethodField()
-
     class Meta:
         model = User
         fields = ["email", "username", "nickname", "phone_number","login_type"]
         read_only_fields = ["email", "username", "nickname", "phone_number", "login_type"]
 
-    def get_login_type(self, obj):
-        social_login = obj.social_logins.first()
-        if social_login:
-            return social_login.provider
-        return "email"
-
 
 class AddressSerializer(serializers.ModelSerializer):
     class Meta:
@@ -109,27 +100,33 @@ class AddressSerializer(serializers.ModelSerializer):
         fields = ["id", "address_name", "recipient", "recipient_phone", "post_code", "address", "detail_address", "is_default"]
         read_only_fields = ["id"]
 
-    def _clear_other_defaults(self, user):
-        Address.objects.filter(user=user, is_default=True).update(is_default=False)
-
+    @transaction.atomic
     def create(self, validated_data):
         user = self.context["request"].user
         validated_data["user"] = user
-        is_default = validated_data.get("is_default", False)
-
-        if not Address.objects.filter(user=user).exists():
-            validated_data["is_default"] = True
-        elif is_default:
-            self._clear_other_defaults(user)
-        return super().create(validated_data)
-
+        # 기본 배송지가 없으면(첫 배송지 등) 새 배송지를 기본으로. 캐시는 커밋 후에야 갱신되므로 DB 로 판단한다
+        make_default = (
+            validated_data.pop("is_default", False)
+            or not Address.objects.filter(user=user, is_default=True).exists()
+        )
+
+        address = super().create(validated_data)
+        if make_default:
+            set_default_address(user.pk, address.pk)
+            address.is_default = True
+        return address
+
+    @transaction.atomic
     def update(self, instance, validated_data):
-        user = instance.user
-        is_default = validated_data.get("is_default", None)
-
-        if is_default:
-            self._clear_other_defaults(user)
-        return super().update(instance, validated_data)
+        make_default = validated_data.get("is_default") is True and not instance.is_default
+        if make_default:
+            validated_data.pop("is_default")
+
+        instance = super().update(instance, validated_data)
+        if make_default:
+            set_default_address(instance.user_id, instance.pk)
+            instance.is_default = True
+        return instance
 
     def validate(self, attrs):
         return attrs
@@ -142,5 +139,12 @@ class PointListSerializer(serializers.ModelSerializer):
         read_only_fields = fields
 
 
+class PointMonthlySummarySerializer(serializers.Serializer):
+    month = serializers.DateField(format="%Y-%m", read_only=True)
+    earned = serializers.IntegerField(read_only=True)
+    spent = serializers.IntegerField(read_only=True)
+    entry_count = serializers.IntegerField(read_only=True)
+
+
 class PointBalanceSerializer(serializers.Serializer):
     balance = serializers.IntegerField(read_only=True)
@@ -0,0 +1,106 @@
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, connection, transaction
+
+from users.models import Address
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ADDRESS_PREFIX = "address:default:"
+DEFAULT_ADDRESS_GENERATION_PREFIX = "address:default-gen:"
+# 기본 배송지가 없다는 사실도 캐시해서 매번 조회하지 않도록
+NO_DEFAULT = 0
+
+
+def _cache_key(user_id) -> str:
+    return f"{DEFAULT_ADDRESS_PREFIX}{user_id}"
+
+
+def _generation_key(user_id) -> str:
+    return f"{DEFAULT_ADDRESS_GENERATION_PREFIX}{user_id}"
+
+
+def _query_default_address_id(user_id) -> int | None:
+    return Address.objects.filter(user_id=user_id, is_default=True).values_list("id", flat=True).first()
+
+
+def get_default_address_id(user_id) -> int | None:
+    """
+    조회 전용 (주문 미리보기 등). 캐시 값은 저장할 때의 generation 과 함께 두고, 배송지가 바뀌어
+    generation 이 올라간 뒤에는 버린다. 배송지를 바꾸는 쪽은 캐시가 아니라 DB 로 판단해야 한다.
+    """
+    key, generation_key = _cache_key(user_id), _generation_key(user_id)
+    try:
+        cached = cache.get_many([key, generation_key])
+    except Exception:
+        logger.warning("default address cache unavailable", exc_info=True)
+        return _query_default_address_id(user_id)
+
+    generation = cached.get(generation_key, 0)
+    entry = cached.get(key)
+    if isinstance(entry, tuple) and entry[1] == generation:
+        return entry[0] or None
+
+    # 커밋 전 값을 읽고 커밋 후에 저장하더라도, 그 사이 무효화로 generation 이 올라가 다음 조회에서 버려진다
+    address_id = _query_default_address_id(user_id)
+    try:
+        cache.set(key, (address_id or NO_DEFAULT, generation), timeout=settings.DEFAULT_ADDRESS_CACHE_TIMEOUT)
+    except Exception:
+        logger.warning("failed to cache default address for user %s", user_id, exc_info=True)
+    return address_id
+
+
+def _delete_cached_default(user_id) -> None:
+    try:
+        generation_key = _generation_key(user_id)
+        cache.add(generation_key, 0, timeout=None)
+        cache.incr(generation_key)
+        cache.delete(_cache_key(user_id))
+    except Exception:
+        logger.warning("failed to invalidate default address for user %s", user_id, exc_info=True)
+
+
+def invalidate_default_address(user_id) -> None:
+    transaction.on_commit(lambda: _delete_cached_default(user_id), robust=True)
+
+
+def _switch_default(user_id, address_id) -> bool:
+    table = connection.ops.quote_name(Address._meta.db_table)
+    if connection.vendor == "postgresql":
+        # 한 문장으로 기존 기본 배송지를 해제하고 새 배송지를 지정한다.
+        # 스칼라 서브쿼리가 cleared CTE 를 먼저 끝까지 실행시키므로, 새 행을 갱신할 때는 기존 기본 행이
+        # 이미 해제된 상태라 부분 유니크 인덱스에 걸리지 않는다.
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"WITH cleared AS ("
+                f"  UPDATE {table} SET is_default = FALSE"
+                f"  WHERE user_id = %s AND is_default AND id <> %s RETURNING id"
+                f") "
+                f"UPDATE {table} SET is_default = TRUE "
+                f"WHERE id = %s AND user_id = %s AND (SELECT COUNT(*) FROM cleared) >= 0 RETURNING id",
+                [user_id, address_id, address_id, user_id],
+            )
+            return cursor.fetchone() is not None
+
+    # SQLite 등: 같은 트랜잭션 안에서 두 문장으로 처리
+    Address.objects.filter(user_id=user_id, is_default=True).exclude(pk=address_id).update(is_default=False)
+    return Address.objects.filter(pk=address_id, user_id=user_id).update(is_default=True) == 1
+
+
+def set_default_address(user_id, address_id) -> None:
+    """
+    user 의 기본 배송지를 address_id 로 바꾼다. (user) WHERE is_default 부분 유니크 인덱스가 있으므로
+    동시에 다른 배송지를 기본으로 바꾸는 요청과 겹치면 IntegrityError 가 나고, 그때는 한 번 다시 시도한다.
+    """
+    for attempt in range(2):
+        try:
+            with transaction.atomic():
+                if not _switch_default(user_id, address_id):
+                    raise Address.DoesNotExist(f"address {address_id} does not belong to user {user_id}")
+                invalidate_default_address(user_id)
+            return
+        except IntegrityError:
+            if attempt:
+                raise
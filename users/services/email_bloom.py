@@ -0,0 +1,101 @@
+import hashlib
+import logging
+
+from django.conf import settings
+from django.utils import timezone
+from django_redis import get_redis_connection
+
+from users.models import User
+
+logger = logging.getLogger(__name__)
+
+BLOOM_KEY = "users:email-bloom"
+BLOOM_READY_KEY = "users:email-bloom:ready"
+BLOOM_BUILD_KEY = "users:email-bloom:building"
+
+
+def _redis():
+    return get_redis_connection("default")
+
+
+def _normalize(email: str) -> str:
+    return email.strip().lower()
+
+
+def _positions(email: str) -> list[int]:
+    # 해시 두 개를 조합해 k 개의 비트 위치를 만든다 (Kirsch-Mitzenmacher)
+    digest = hashlib.blake2b(_normalize(email).encode(), digest_size=16).digest()
+    h1 = int.from_bytes(digest[:8], "big")
+    h2 = int.from_bytes(digest[8:], "big") | 1
+    size = settings.EMAIL_BLOOM_BITS
+    return [(h1 + i * h2) % size for i in range(settings.EMAIL_BLOOM_HASHES)]
+
+
+def add_email(email: str, key: str = BLOOM_KEY, pipe=None) -> None:
+    target = pipe if pipe is not None else _redis().pipeline(transaction=False)
+    for position in _positions(email):
+        target.setbit(key, position, 1)
+    if pipe is None:
+        target.execute()
+
+
+def might_contain(email: str) -> bool | None:
+    """
+    False 면 확실히 가입되지 않은 이메일, True 면 가입됐을 수 있음(DB 확인 필요).
+    필터가 아직 만들어지지 않았거나 Redis 를 쓸 수 없으면 None.
+    """
+    try:
+        pipe = _redis().pipeline(transaction=False)
+        pipe.exists(BLOOM_READY_KEY)
+        for position in _positions(email):
+            pipe.getbit(BLOOM_KEY, position)
+        ready, *bits = pipe.execute()
+    except Exception:
+        logger.warning("email bloom filter unavailable", exc_info=True)
+        return None
+    if not ready:
+        return None
+    return all(bits)
+
+
+def build_email_bloom(chunk_size: int = 5000) -> int:
+    """
+    가입된 이메일 전체로 필터를 새로 만들고 원자적으로 교체한다.
+    빌드 도중 가입한 유저가 빠지지 않도록 교체 후 빌드 시작 이후 가입자를 한 번 더 추가한다.
+    """
+    redis = _redis()
+    started_at = timezone.now()
+    redis.delete(BLOOM_BUILD_KEY)
+
+    count = 0
+    pipe = redis.pipeline(transaction=False)
+    for email in User.objects.order_by("pk").values_list("email", flat=True).iterator(chunk_size=chunk_size):
+        add_email(email, BLOOM_BUILD_KEY, pipe)
+        count += 1
+        if count % chunk_size == 0:
+            pipe.execute()
+    # 비트 하나는 세워 두어야 빈 DB 에서도 RENAME 할 키가 생긴다
+    pipe.setbit(BLOOM_BUILD_KEY, 0, 0)
+    pipe.execute()
+
+    redis.rename(BLOOM_BUILD_KEY, BLOOM_KEY)
+    redis.set(BLOOM_READY_KEY, 1)
+
+    late = User.objects.filter(created_at__gte=started_at).values_list("email", flat=True)
+    pipe = redis.pipeline(transaction=False)
+    for email in late:
+        add_email(email, BLOOM_KEY, pipe)
+    pipe.execute()
+    return count
+
+
+def add_email_safely(email: str) -> None:
+    try:
+        add_email(email)
+    except Exception:
+        # 추가에 실패하면 이 이메일이 '확실히 없음'으로 오판될 수 있으므로 필터를 꺼서 DB 로 확인하게 한다
+        logger.exception("failed to add email to bloom filter; disabling filter until rebuilt")
+        try:
+            _redis().delete(BLOOM_READY_KEY)
+        except Exception:
+            pass
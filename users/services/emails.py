@@ -0,0 +1,18 @@
+from django.template.loader import render_to_string
+
+from utils.mail import queue_mail
+
+VERIFY_EMAIL_SUBJECT = "[ObeStore] 이메일 인증을 완료해주세요."
+
+
+def send_verify_email(user, verify_url: str) -> None:
+    html = render_to_string(
+        "emails/verify_email.html",
+        {
+            "username": user.username,
+            "verify_url": verify_url,
+            "preheader": "버튼을 눌러 ObeStore 이메일 인증을 완료하세요.",
+        },
+    )
+    text = f"다음 링크를 클릭해 인증을 완료하세요:\n{verify_url}"
+    queue_mail(VERIFY_EMAIL_SUBJECT, text, [user.email], html=html)
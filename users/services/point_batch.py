@@ -0,0 +1,139 @@
+from collections import defaultdict
+from itertools import islice
+
+from django.db import connection, transaction
+from django.db.models import QuerySet
+from django.utils import timezone
+
+from users.auth import invalidate_user_cache
+from users.models import Point, User
+
+DEFAULT_CHUNK_SIZE = 1000
+
+
+def grant_event_key(campaign: str, user_id: int) -> str:
+    return f"grant:{campaign}:{user_id}"
+
+
+def expire_event_key(point_id: int) -> str:
+    return f"expire:{point_id}"
+
+
+def _chunks(iterable, size: int):
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def _apply_deltas(deltas: dict[int, int]) -> dict[int, int]:
+    """
+    {user_id: delta} 를 UPDATE ... FROM (VALUES ...) 한 번으로 반영하고 {user_id: 새 잔액} 을 돌려준다.
+    존재하지 않는 유저나 잔액이 음수가 되는 유저는 결과에서 빠진다.
+    """
+    if not deltas:
+        return {}
+    table = connection.ops.quote_name(User._meta.db_table)
+    values = ", ".join(["(CAST(%s AS bigint), CAST(%s AS integer))"] * len(deltas))
+    params = [value for item in deltas.items() for value in item]
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"WITH v(id, delta) AS (VALUES {values}) "
+            f"UPDATE {table} SET point_balance = {table}.point_balance + v.delta FROM v "
+            f"WHERE {table}.id = v.id AND {table}.point_balance + v.delta >= 0 "
+            f"RETURNING {table}.id, {table}.point_balance",
+            params,
+        )
+        return dict(cursor.fetchall())
+
+
+def _invalidate_on_commit(user_ids):
+    user_ids = list(user_ids)
+    if user_ids:
+        transaction.on_commit(lambda: invalidate_user_cache(*user_ids), robust=True)
+
+
+@transaction.atomic
+def _grant_chunk(user_ids: list[int], amount: int, campaign: str, expires_at) -> int:
+    keys = {user_id: grant_event_key(campaign, user_id) for user_id in user_ids}
+    # 중단 후 재실행하면 이미 지급된 유저는 event_key 로 걸러진다
+    done = set(Point.objects.filter(event_key__in=keys.values()).values_list("user_id", flat=True))
+    balances = _apply_deltas({user_id: amount for user_id in user_ids if user_id not in done})
+
+    Point.objects.bulk_create(
+        [
+            Point(user_id=user_id, amount=amount, balance=balance, event_key=keys[user_id], expires_at=expires_at)
+            for user_id, balance in balances.items()
+        ]
+    )
+    _invalidate_on_commit(balances)
+    return len(balances)
+
+
+def grant_points_bulk(users, amount: int, *, campaign: str, expires_at=None, chunk_size: int = DEFAULT_CHUNK_SIZE):
+    """
+    users(유저 QuerySet 또는 user id 목록)에게 campaign 포인트를 chunk 단위로 지급한다.
+    chunk 마다 한 트랜잭션이며 event_key 가 grant:{campaign}:{user_id} 로 고정되어 있어 몇 번을 재실행해도 한 번만 지급된다.
+    지급된 유저 수를 chunk 마다 yield 한다.
+    """
+    if amount <= 0:
+        raise ValueError("지급 포인트는 0보다 커야 합니다.")
+    if isinstance(users, QuerySet):
+        users = users.order_by("pk").values_list("pk", flat=True).iterator(chunk_size=chunk_size)
+    for chunk in _chunks(users, chunk_size):
+        yield _grant_chunk(sorted(set(chunk)), amount, campaign, expires_at)
+
+
+@transaction.atomic
+def _expire_chunk(user_ids: list[int], now) -> int:
+    # 소멸분 계산 동안 잔액이 바뀌지 않도록 chunk 의 유저와 대상 적립분을 한 번에 잠근다
+    balances = dict(
+        User.objects.select_for_update().filter(id__in=user_ids).order_by("id").values_list("id", "point_balance")
+    )
+    grants = list(
+        Point.objects.select_for_update()
+        .filter(user_id__in=user_ids, is_expired=False, expires_at__lte=now)
+        .order_by("user_id", "expires_at", "id")
+    )
+
+    # 사용한 포인트를 적립분별로 추적하지 않으므로, 남은 잔액 한도 안에서 먼저 만료되는 적립분부터 차감
+    deltas = defaultdict(int)
+    rows = []
+    for grant in grants:
+        remaining = balances.get(grant.user_id, 0)
+        deducted = min(grant.amount, remaining)
+        if deducted <= 0:
+            continue
+        balances[grant.user_id] = remaining - deducted
+        deltas[grant.user_id] -= deducted
+        rows.append(
+            Point(
+                user_id=grant.user_id,
+                amount=-deducted,
+                balance=balances[grant.user_id],
+                event_key=expire_event_key(grant.pk),
+            )
+        )
+
+    Point.objects.filter(pk__in=[grant.pk for grant in grants]).update(is_expired=True)
+    _apply_deltas(deltas)
+    Point.objects.bulk_create(rows)
+    _invalidate_on_commit(deltas)
+    return len(rows)
+
+
+def expire_points(now=None, *, chunk_size: int = DEFAULT_CHUNK_SIZE):
+    """
+    expires_at 이 지난 적립분을 유저 chunk 단위로 소멸시킨다. 처리한 적립분은 is_expired 로 표시되므로
+    중단되어도 다음 실행에서 남은 것부터 이어서 처리한다. 소멸 내역 수를 chunk 마다 yield 한다.
+    """
+    now = now or timezone.now()
+    while True:
+        user_ids = list(
+            Point.objects.filter(is_expired=False, expires_at__lte=now)
+            .order_by("user_id")
+            .values_list("user_id", flat=True)
+            .distinct()[:chunk_size]
+        )
+        if not user_ids:
+            return
+        yield _expire_chunk(user_ids, now)
@@ -0,0 +1,79 @@
+from datetime import date, datetime
+
+from django.db.models import Count, DateField, Q, Sum
+from django.db.models.functions import Coalesce, TruncMonth
+from django.utils import timezone
+
+from users.models import Point, PointMonthlySummary
+
+ROLLUP_BATCH_SIZE = 1000
+
+
+def month_start(value: date) -> datetime:
+    return timezone.make_aware(datetime(value.year, value.month, 1))
+
+
+def next_month(value: date) -> date:
+    return date(value.year + value.month // 12, value.month % 12 + 1, 1)
+
+
+def monthly_point_totals(queryset):
+    """user, 월 단위 적립/사용 합계. month 는 TIME_ZONE 기준 월의 1일(date)."""
+    return (
+        queryset.annotate(month=TruncMonth("created_at", output_field=DateField()))
+        .order_by()
+        .values("user_id", "month")
+        .annotate(
+            earned=Coalesce(Sum("amount", filter=Q(amount__gt=0)), 0),
+            spent=Coalesce(-Sum("amount", filter=Q(amount__lt=0)), 0),
+            entry_count=Count("id"),
+        )
+    )
+
+
+def get_monthly_summary(user) -> list[dict]:
+    """
+    마감된 달은 PointMonthlySummary 에서, 마지막 요약 이후의 달은 원장에서 바로 집계해 최신순으로 반환.
+    요약 커맨드는 빈 달 없이 이어서 실행되므로, 마지막 요약 이후 구간만 원장에서 읽으면 된다.
+    """
+    rollups = list(
+        PointMonthlySummary.objects.filter(user=user)
+        .order_by("-month")
+        .values("month", "earned", "spent", "entry_count")
+    )
+
+    live_qs = Point.objects.filter(user=user)
+    if rollups:
+        live_qs = live_qs.filter(created_at__gte=month_start(next_month(rollups[0]["month"])))
+    live = [
+        {key: row[key] for key in ("month", "earned", "spent", "entry_count")}
+        for row in monthly_point_totals(live_qs).order_by("-month")
+    ]
+    return live + rollups
+
+
+def rollup_point_summaries(since: date, until: date) -> int:
+    """[since, until) 구간의 월별 요약을 upsert 한다. until 은 보통 이번 달 1일(마감되지 않은 달 제외)."""
+    rows = monthly_point_totals(
+        Point.objects.filter(created_at__gte=month_start(since), created_at__lt=month_start(until))
+    )
+    count = 0
+    batch = []
+    for row in rows.iterator(chunk_size=ROLLUP_BATCH_SIZE):
+        batch.append(PointMonthlySummary(**row))
+        if len(batch) >= ROLLUP_BATCH_SIZE:
+            count += _upsert_summaries(batch)
+            batch = []
+    if batch:
+        count += _upsert_summaries(batch)
+    return count
+
+
+def _upsert_summaries(summaries) -> int:
+    PointMonthlySummary.objects.bulk_create(
+        summaries,
+        update_conflicts=True,
+        unique_fields=["user", "month"],
+        update_fields=["earned", "spent", "entry_count"],
+    )
+    return len(summaries)
@@ -1,5 +1,7 @@
-from django.db import transaction
+from django.db import connection, transaction
+from django.utils import timezone
 
+from users.auth import invalidate_user_cache
 from users.models import Point, User
 
 
@@ -7,36 +9,60 @@ class PointError(Exception):
     pass
 
 
+def _insert_ledger_row(cursor, user_id: int, delta: int, event_key: str | None, now) -> int | None:
+    """포인트 내역을 먼저 넣어 event_key 를 선점한다. 이미 처리된 키면 None."""
+    qn = connection.ops.quote_name
+    point = Point(user_id=user_id, amount=delta, balance=0, event_key=event_key, created_at=now, updated_at=now)
+    fields = [f for f in Point._meta.concrete_fields if not f.primary_key]
+    sql = (
+        f"INSERT INTO {qn(Point._meta.db_table)} ({', '.join(qn(f.column) for f in fields)}) "
+        f"VALUES ({', '.join(['%s'] * len(fields))})"
+    )
+    if event_key:
+        sql += f" ON CONFLICT ({qn('event_key')}) DO NOTHING"
+    cursor.execute(
+        sql + f" RETURNING {qn('id')}", [f.get_db_prep_save(getattr(point, f.attname), connection) for f in fields]
+    )
+    row = cursor.fetchone()
+    return row[0] if row else None
+
+
 @transaction.atomic
 def apply_point_delta(user: User, delta: int, *, event_key: str | None) -> Point:
-    user_locked = User.objects.select_for_update().get(pk=user.pk)
+    """
+    유저 행을 SELECT ... FOR UPDATE 로 잡지 않고 조건부 UPDATE 한 번으로 잔액을 바꾼다.
+    1) INSERT ... ON CONFLICT (event_key) DO NOTHING 으로 이벤트를 선점 (중복 이벤트면 기존 내역 반환)
+    2) UPDATE ... SET point_balance = point_balance + delta WHERE point_balance + delta >= 0 RETURNING
+    3) 돌려받은 잔액을 내역에 기록
+    잔액이 부족하면 PointError 로 트랜잭션(선점한 내역 포함)을 롤백한다.
+    """
+    qn = connection.ops.quote_name
+    now = timezone.now()
+    with connection.cursor() as cursor:
+        point_id = _insert_ledger_row(cursor, user.pk, delta, event_key, now)
+        if point_id is None:
+            return Point.objects.get(event_key=event_key)
 
-    new_balance = user_locked.point_balance + delta
-    if new_balance < 0:
-        raise PointError("포인트 잔액이 부족합니다.")
-
-    if event_key:
-        point, created = Point.objects.get_or_create(
-            user = user_locked,
-            event_key = event_key,
-            defaults={
-                "amount": delta,
-                "balance": new_balance,
-            }
-        )
-        if not created:
-            return point
-    else:
-        point = Point.objects.create(
-            user=user_locked,
-            amount=delta,
-            balance=new_balance,
-            event_key=None,
+        cursor.execute(
+            f"UPDATE {qn(User._meta.db_table)} SET point_balance = point_balance + %s "
+            "WHERE id = %s AND point_balance + %s >= 0 RETURNING point_balance",
+            [delta, user.pk, delta],
         )
+        row = cursor.fetchone()
+        if row is None:
+            raise PointError("포인트 잔액이 부족합니다.")
+        new_balance = row[0]
 
-    user_locked.point_balance = new_balance
-    user_locked.save(update_fields=["point_balance"])
+    Point.objects.filter(pk=point_id).update(balance=new_balance)
+    user.point_balance = new_balance
+    # save() 를 거치지 않으므로 post_save 대신 직접 인증 캐시를 무효화
+    transaction.on_commit(lambda: invalidate_user_cache(user.pk), robust=True)
 
+    point = Point(
+        id=point_id, user=user, amount=delta, balance=new_balance, event_key=event_key, created_at=now, updated_at=now
+    )
+    point._state.adding = False
+    point._state.db = connection.alias
     return point
 
 
@@ -1,11 +1,35 @@
-from django.db.models.signals import post_save
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
 from carts.models import Cart
-from users.models import User
+from users.auth import invalidate_user_cache
+from users.models import Address, User
+from users.services.addresses import invalidate_default_address
+from users.services.email_bloom import add_email_safely
 
 
 @receiver(post_save, sender=User)
 def create_cart_for_new_user(sender, instance, created, **kwargs):
     if created:
-        Cart.objects.create(user=instance)
\ No newline at end of file
+        Cart.objects.create(user=instance)
+
+
+@receiver([post_save, post_delete], sender=User)
+def invalidate_cached_user(sender, instance, created=False, **kwargs):
+    if created:
+        return
+    user_id = instance.pk
+    transaction.on_commit(lambda: invalidate_user_cache(user_id), robust=True)
+
+
+@receiver(post_save, sender=User)
+def add_email_to_bloom(sender, instance, created, **kwargs):
+    if created:
+        email = instance.email
+        transaction.on_commit(lambda: add_email_safely(email), robust=True)
+
+
+@receiver([post_save, post_delete], sender=Address)
+def invalidate_default_address_cache(sender, instance, **kwargs):
+    invalidate_default_address(instance.user_id)
@@ -1 +1,668 @@
-# Create your tests here.
+import json
+import threading
+from datetime import timedelta
+from io import StringIO
+from unittest import skipUnless
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.cache import cache
+from django.core.mail import get_connection
+from django.core.management import call_command
+from django.db import IntegrityError, connection, connections, transaction
+from django.test import RequestFactory, SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from users.auth import USER_CACHE_PREFIX, _listener, _user_cache, get_cached_user
+from users.management.commands.reconcile_point_balances import ledger_mismatches
+from users.models import Address, Point, SocialLogin, User
+from users.serializers import AddressSerializer, LoginSerializer
+from users.services.addresses import (
+    NO_DEFAULT,
+    _cache_key,
+    _generation_key,
+    get_default_address_id,
+    set_default_address,
+)
+from users.services.email_bloom import might_contain
+from users.services.point_batch import expire_points, grant_points_bulk
+from users.services.point_summary import get_monthly_summary, month_start, rollup_point_summaries
+from users.services.points import PointError, apply_point_delta
+from utils import task_queue
+from utils.mail import MAIL_QUEUE, deliver_batch, queue_mail, retry_later, run_mail_worker
+from utils.redis_stub import REDIS_STUB_CACHES
+from utils.smtp_sink import SMTPSink
+from utils.upstream_stub import UpstreamStub
+
+
+def _payload(to, subject="제목"):
+    return {"subject": subject, "body": "본문", "html": "<p>본문</p>", "from_email": "noreply@obestore.local", "to": [to]}
+
+
+class DeliverBatchTest(SimpleTestCase):
+    def setUp(self):
+        self.sink = SMTPSink(reject_recipients={"bounce@example.com"}).start()
+        self.addCleanup(self.sink.stop)
+        self.settings_override = override_settings(
+            EMAIL_BACKEND="django.core.mail.backends.smtp.EmailBackend",
+            EMAIL_HOST=self.sink.host,
+            EMAIL_PORT=self.sink.port,
+            EMAIL_USE_TLS=False,
+            EMAIL_HOST_USER="",
+            EMAIL_HOST_PASSWORD="",
+        )
+        self.settings_override.enable()
+        self.addCleanup(self.settings_override.disable)
+
+    def test_batch_reuses_single_connection(self):
+        """배치 안의 메일이 SMTP 연결 하나로 발송되는지 확인"""
+        failed = deliver_batch([_payload(f"user{i}@example.com") for i in range(5)], get_connection())
+
+        self.assertEqual(failed, [])
+        self.assertEqual(len(self.sink.messages), 5)
+        self.assertEqual(self.sink.connection_count, 1)
+
+    def test_refused_recipient_is_returned_for_retry(self):
+        """거절된 수신자만 실패 목록으로 돌아오고 나머지는 계속 발송되는지 확인"""
+        bounce = _payload("bounce@example.com")
+        failed = deliver_batch([_payload("a@example.com"), bounce, _payload("b@example.com")], get_connection())
+
+        self.assertEqual(failed, [bounce])
+        self.assertEqual([m["to"] for m in self.sink.messages], [["a@example.com"], ["b@example.com"]])
+
+
+@override_settings(
+    CACHES=REDIS_STUB_CACHES,
+    EMAIL_BACKEND="django.core.mail.backends.smtp.EmailBackend",
+    EMAIL_USE_TLS=False,
+    EMAIL_HOST_USER="",
+    EMAIL_HOST_PASSWORD="",
+)
+class MailQueueTest(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.sink = SMTPSink().start()
+        self.addCleanup(self.sink.stop)
+        self.settings_override = override_settings(EMAIL_HOST=self.sink.host, EMAIL_PORT=self.sink.port)
+        self.settings_override.enable()
+        self.addCleanup(self.settings_override.disable)
+
+    def test_worker_reuses_connection_across_batches(self):
+        """큐가 비기 전까지는 배치가 바뀌어도 SMTP 연결 하나로 보내는지 확인"""
+        for i in range(5):
+            queue_mail("제목", "본문", [f"user{i}@example.com"])
+
+        run_mail_worker(batch_size=2, poll_timeout=1, once=True)
+
+        self.assertEqual(len(self.sink.messages), 5)
+        self.assertEqual(self.sink.connection_count, 1)
+
+    @override_settings(MAIL_QUEUE_MAX_ATTEMPTS=2)
+    def test_retry_later_backs_off_then_dead_letters(self):
+        """실패한 메일은 지연 큐로 옮기고, 최대 시도 횟수에 닿으면 dead letter 로 보내는지 확인"""
+        payload = {**_payload("retry@example.com"), "attempts": 0}
+        redis = task_queue._redis()
+
+        retry_later(payload)
+        delayed = redis.zrange(task_queue._key(MAIL_QUEUE, ":delayed"), 0, -1)
+        self.assertEqual([json.loads(raw)["attempts"] for raw in delayed], [1])
+
+        retry_later({**payload, "attempts": 1})
+        dead = redis.lrange(task_queue._key(MAIL_QUEUE, ":dead"), 0, -1)
+        self.assertEqual([json.loads(raw)["attempts"] for raw in dead], [2])
+
+
+@override_settings(CACHES=REDIS_STUB_CACHES)
+class EmailResendTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        User.objects.create_user(
+            email="Resend@Example.com",
+            password="testpassword",
+            username="재발송유저",
+            nickname="resendnick",
+            phone_number="01012345678",
+        )
+
+    def test_resend_queues_mail_once_per_cooldown(self):
+        """대소문자만 다른 주소도 같은 유저에게 메일을 보내고, 쿨다운 동안은 429 를 돌려주는지 확인"""
+        response = self.client.post("/users/email/resend", {"email": "resend@example.com"})
+
+        self.assertEqual(response.status_code, 200)
+        queued = task_queue.dequeue_batch(MAIL_QUEUE, 10, timeout=1)
+        self.assertEqual([payload["to"] for payload in queued], [["Resend@example.com"]])
+
+        response = self.client.post("/users/email/resend", {"email": "RESEND@example.com "})
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response["Retry-After"], "60")
+        self.assertEqual(task_queue.dequeue_batch(MAIL_QUEUE, 10, timeout=1), [])
+
+
+@override_settings(
+    CACHES=REDIS_STUB_CACHES,
+    TOKEN_BUCKET_RATES={"login": {"ip": (2, 0.01), "email": (1, 0.01)}, "auth": {"ip": (2, 0.01)}},
+)
+class TokenBucketThrottleTest(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def _login(self, email, **extra):
+        return self.client.post("/auth/login", {"email": email, "password": "wrong"}, **extra)
+
+    def test_empty_bucket_returns_429_with_retry_after(self):
+        """버스트 용량을 다 쓰면 429 와 다음 토큰까지 남은 초를 Retry-After 로 돌려주는지 확인"""
+        for i in range(2):
+            self.assertNotEqual(
+                self.client.post("/users/email/resend", {"email": f"u{i}@example.com"}).status_code, 429
+            )
+
+        response = self.client.post("/users/email/resend", {"email": "u2@example.com"})
+
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response["Retry-After"], "100")
+
+    def test_email_bucket_limits_across_ips(self):
+        """IP 를 바꿔도 같은 계정(email)에 대한 로그인 시도는 email 버킷으로 막히는지 확인"""
+        self.assertNotEqual(self._login("target@example.com", REMOTE_ADDR="10.0.0.1").status_code, 429)
+
+        self.assertEqual(self._login("Target@example.com", REMOTE_ADDR="10.0.0.2").status_code, 429)
+
+    def test_forwarded_for_cannot_reset_ip_bucket(self):
+        """X-Forwarded-For 를 바꿔 보내도 REMOTE_ADDR 기준 ip 버킷을 새로 받지 못하는지 확인"""
+        for i in range(2):
+            self._login(f"a{i}@example.com", HTTP_X_FORWARDED_FOR=f"203.0.113.{i}")
+
+        self.assertEqual(self._login("a2@example.com", HTTP_X_FORWARDED_FOR="203.0.113.2").status_code, 429)
+
+    @override_settings(REST_FRAMEWORK={**settings.REST_FRAMEWORK, "NUM_PROXIES": 1})
+    def test_behind_proxy_uses_address_added_by_proxy(self):
+        """프록시 뒤에서는 클라이언트가 앞에 붙인 값이 아니라 프록시가 붙인 마지막 주소로 버킷을 나누는지 확인"""
+        for i in range(2):
+            self._login(f"b{i}@example.com", HTTP_X_FORWARDED_FOR=f"198.51.100.{i}, 203.0.113.7")
+
+        self.assertEqual(
+            self._login("b2@example.com", HTTP_X_FORWARDED_FOR="198.51.100.2, 203.0.113.7").status_code, 429
+        )
+        self.assertNotEqual(self._login("b3@example.com", HTTP_X_FORWARDED_FOR="203.0.113.8").status_code, 429)
+
+
+@override_settings(CACHES=REDIS_STUB_CACHES, EMAIL_BLOOM_BITS=1 << 16)
+class EmailBloomTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        User.objects.create_user(
+            email="member@example.com",
+            password="testpassword",
+            username="가입유저",
+            nickname="membernick",
+            phone_number="01012345678",
+        )
+
+    def _available(self, email):
+        return self.client.get("/users/email/exist", {"email": email}).data["available"]
+
+    def test_filter_answers_membership_after_build(self):
+        """필터를 만든 뒤에는 가입된 이메일만 '있을 수 있음'으로 답하고, 없는 이메일은 DB 조회 없이 사용 가능으로 답하는지 확인"""
+        self.assertIsNone(might_contain("member@example.com"))
+        call_command("build_email_bloom", stdout=StringIO())
+
+        self.assertTrue(might_contain(" Member@Example.com "))
+        self.assertFalse(might_contain("nobody@example.com"))
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertTrue(self._available("nobody@example.com"))
+        self.assertEqual(len(ctx.captured_queries), 0)
+        self.assertFalse(self._available("member@example.com"))
+
+    def test_signup_after_build_is_never_reported_available(self):
+        """필터를 만든 뒤 가입한 이메일도 커밋 후 필터에 들어가 '사용 가능'으로 잘못 답하지 않는지 확인"""
+        call_command("build_email_bloom", stdout=StringIO())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            User.objects.create_user(
+                email="late@example.com",
+                password="testpassword",
+                username="늦은가입",
+                nickname="latenick",
+                phone_number="01012345678",
+            )
+
+        self.assertTrue(might_contain("late@example.com"))
+        self.assertFalse(self._available("late@example.com"))
+
+    @override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}})
+    def test_falls_back_to_db_without_redis(self):
+        """Redis 를 쓸 수 없으면 필터 없이 DB 로 가입 여부를 확인하는지 확인"""
+        self.assertIsNone(might_contain("member@example.com"))
+        self.assertFalse(self._available("member@example.com"))
+        self.assertTrue(self._available("nobody@example.com"))
+
+
+class PointLedgerTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="point@example.com",
+            password="testpassword",
+            username="포인트유저",
+            nickname="pointnick",
+            phone_number="01012345678",
+        )
+        for delta in (1000, -300, 500):
+            apply_point_delta(self.user, delta, event_key=None)
+
+    def _backdate(self, point, when):
+        Point.objects.filter(pk=point.pk).update(created_at=when)
+
+    def test_monthly_summary_merges_rollup_and_live_months(self):
+        """마감된 달은 요약 테이블, 이후 달은 원장에서 집계되어 함께 반환되는지 확인"""
+        this_month = timezone.localdate().replace(day=1)
+        last_month = (this_month - timedelta(days=1)).replace(day=1)
+        old_point = apply_point_delta(self.user, 200, event_key=None)
+        self._backdate(old_point, month_start(last_month) + timedelta(days=2))
+        rollup_point_summaries(last_month, this_month)
+
+        summary = get_monthly_summary(self.user)
+
+        self.assertEqual(
+            summary,
+            [
+                {"month": this_month, "earned": 1500, "spent": 300, "entry_count": 3},
+                {"month": last_month, "earned": 200, "spent": 0, "entry_count": 1},
+            ],
+        )
+
+    def test_reconcile_detects_and_fixes_drift(self):
+        """원장 합계와 다른 잔액을 찾아 --fix 로 맞추는지 확인"""
+        User.objects.filter(pk=self.user.pk).update(point_balance=99999)
+
+        self.assertEqual([row[:3] for row in ledger_mismatches()], [(self.user.pk, 99999, 1200)])
+
+        call_command("reconcile_point_balances", "--fix", stdout=StringIO())
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.point_balance, 1200)
+        self.assertEqual(list(ledger_mismatches()), [])
+
+
+@skipUnless(connection.vendor == "postgresql", "동시성 검증은 행 잠금을 지원하는 PostgreSQL 에서만 실행")
+class ApplyPointDeltaConcurrencyTest(TransactionTestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="stress@example.com",
+            password="testpassword",
+            username="동시성유저",
+            nickname="stressnick",
+            phone_number="01012345678",
+        )
+
+    def _run_parallel(self, calls):
+        barrier = threading.Barrier(len(calls))
+        errors = []
+
+        def worker(delta, event_key):
+            try:
+                barrier.wait()
+                apply_point_delta(User(pk=self.user.pk), delta, event_key=event_key)
+            except PointError as e:
+                errors.append(e)
+            finally:
+                connections.close_all()
+
+        threads = [threading.Thread(target=worker, args=call) for call in calls]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        return errors
+
+    def test_parallel_grants_do_not_lose_updates(self):
+        """동시 적립에서 잔액 누락이 없고, 같은 event_key 는 한 번만 반영되는지 확인"""
+        calls = [(10, f"stress:{i}") for i in range(40)] + [(10, "stress:dup")] * 10
+        errors = self._run_parallel(calls)
+
+        self.assertEqual(errors, [])
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.point_balance, 410)
+        self.assertEqual(Point.objects.filter(user=self.user).count(), 41)
+        # 각 내역의 잔액은 1..41 번째 적립 시점의 잔액과 정확히 하나씩 대응해야 함
+        balances = sorted(Point.objects.filter(user=self.user).values_list("balance", flat=True))
+        self.assertEqual(balances, list(range(10, 420, 10)))
+
+    def test_parallel_debits_never_overdraw(self):
+        """동시 차감에서 잔액이 음수가 되지 않고 부족분만 거절되는지 확인"""
+        apply_point_delta(self.user, 100, event_key=None)
+
+        errors = self._run_parallel([(-30, f"debit:{i}") for i in range(10)])
+
+        self.assertEqual(len(errors), 7)
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.point_balance, 10)
+        self.assertEqual(Point.objects.filter(user=self.user, amount=-30).count(), 3)
+
+
+class PointBatchTest(TestCase):
+    def setUp(self):
+        self.users = [
+            User.objects.create_user(
+                email=f"batch{i}@example.com",
+                password="testpassword",
+                username=f"배치유저{i}",
+                nickname=f"batchnick{i}",
+                phone_number="01012345678",
+            )
+            for i in range(5)
+        ]
+        self.user_ids = [user.pk for user in self.users]
+
+    def test_bulk_grant_is_resumable(self):
+        """같은 캠페인을 다시 실행해도 유저마다 한 번만 지급되는지 확인"""
+        granted = sum(grant_points_bulk(self.user_ids[:3], 500, campaign="welcome", chunk_size=2))
+        granted += sum(grant_points_bulk(User.objects.all(), 500, campaign="welcome", chunk_size=2))
+
+        self.assertEqual(granted, 5)
+        self.assertEqual(list(ledger_mismatches()), [])
+        self.assertEqual(
+            set(User.objects.filter(pk__in=self.user_ids).values_list("point_balance", flat=True)), {500}
+        )
+        self.assertTrue(Point.objects.filter(event_key=f"grant:welcome:{self.user_ids[0]}", balance=500).exists())
+
+    def test_expiry_is_capped_by_remaining_balance(self):
+        """소멸 시 남은 잔액 이상은 차감하지 않고, 재실행해도 다시 차감하지 않는지 확인"""
+        past = timezone.now() - timedelta(days=1)
+        list(grant_points_bulk(self.user_ids[:2], 1000, campaign="expiring", expires_at=past))
+        apply_point_delta(self.users[0], -700, event_key=None)
+
+        expired = sum(expire_points()) + sum(expire_points())
+
+        self.assertEqual(expired, 2)
+        self.assertEqual(
+            list(User.objects.filter(pk__in=self.user_ids[:2]).order_by("pk").values_list("point_balance", flat=True)),
+            [0, 0],
+        )
+        self.assertEqual(list(ledger_mismatches()), [])
+        self.assertFalse(Point.objects.filter(expires_at__isnull=False, is_expired=False).exists())
+
+
+class NaverCallbackTest(TestCase):
+    def setUp(self):
+        self.stub = UpstreamStub().start()
+        self.addCleanup(self.stub.stop)
+        self.settings_override = override_settings(
+            NAVER_TOKEN_URL=f"{self.stub.base_url}/oauth2.0/token",
+            NAVER_PROFILE_URL=f"{self.stub.base_url}/v1/nid/me",
+            NAVER_HTTP_TIMEOUT=0.5,
+            NAVER_CALLBACK_DEADLINE=1,
+        )
+        self.settings_override.enable()
+        self.addCleanup(self.settings_override.disable)
+
+    async def test_callback_logs_in_naver_user(self):
+        """비동기 콜백이 토큰/프로필을 받아 유저와 소셜 로그인을 만들고 리다이렉트하는지 확인"""
+        response = await self.async_client.get("/auth/naver/callback/", {"code": "abc", "state": "xyz"})
+
+        self.assertEqual(response.status_code, 302)
+        self.assertIn("refresh_token", response.cookies)
+        user = await User.objects.aget(email="naver-stub@obestore.local")
+        self.assertEqual(user.phone_number, "01000000000")
+        self.assertEqual(user.login_type, "naver")
+        self.assertTrue(await SocialLogin.objects.filter(user=user, access_token="stub-access-abc").aexists())
+
+    async def test_slow_upstream_times_out(self):
+        """업스트림이 타임아웃보다 느리면 기다리지 않고 502 를 돌려주는지 확인"""
+        self.stub.latency = 1.5
+
+        response = await self.async_client.get("/auth/naver/callback/", {"code": "abc"})
+
+        self.assertEqual(response.status_code, 502)
+        self.assertFalse(await User.objects.filter(email="naver-stub@obestore.local").aexists())
+
+
+class MeEndpointTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="me@example.com",
+            password="testpassword",
+            username="내정보유저",
+            nickname="menick",
+            phone_number="01012345678",
+            status="active",
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_me_does_not_query_social_logins(self):
+        """login_type 을 User 에서 바로 읽어 /users/me 에 추가 쿼리가 없는지 확인"""
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get("/users/me")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["login_type"], "email")
+        self.assertEqual(len(ctx.captured_queries), 0)
+
+    def test_unchanged_profile_returns_304(self):
+        """같은 ETag 로 다시 요청하면 304, 프로필이 바뀌면 새 본문을 받는지 확인"""
+        etag = self.client.get("/users/me")["ETag"]
+
+        self.assertEqual(self.client.get("/users/me", HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        self.user.nickname = "changed"
+        response = self.client.get("/users/me", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+
+@override_settings(CACHES=REDIS_STUB_CACHES)
+class UserCacheInvalidationTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(_listener.reset)
+        self.user = User.objects.create_user(
+            email="cached@example.com",
+            password="testpassword",
+            username="캐시유저",
+            nickname="cachenick",
+            phone_number="01012345678",
+            status="active",
+        )
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.user)}")
+
+    def test_snapshot_never_contains_password(self):
+        """Redis 스냅샷과 스냅샷으로 만든 유저에 비밀번호 해시가 없는지 확인"""
+        user = get_cached_user(self.user.pk)
+
+        self.assertNotIn("password", cache.get(f"{USER_CACHE_PREFIX}{self.user.pk}"))
+        self.assertIn("password", user.get_deferred_fields())
+        self.assertEqual(user.email, "cached@example.com")
+
+    def test_status_change_invalidates_cached_user(self):
+        """상태가 바뀌면 커밋 후 캐시된 유저가 버려져 다음 인증부터 바로 반영되는지 확인"""
+        self.assertEqual(self.client.get("/users/me").status_code, 200)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.status = "dormancy"
+            self.user.save()
+
+        self.assertEqual(self.client.get("/users/me").status_code, 401)
+
+    def test_password_change_invalidates_cached_user(self):
+        """비밀번호를 바꾸면 이전 스냅샷을 쓰지 않고 DB 에서 다시 읽는지 확인"""
+        get_cached_user(self.user.pk)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.set_password("newpassword")
+            self.user.nickname = "renamed"
+            self.user.save()
+
+        self.assertIsNone(cache.get(f"{USER_CACHE_PREFIX}{self.user.pk}"))
+        self.assertEqual(get_cached_user(self.user.pk).nickname, "renamed")
+
+    def test_point_update_invalidates_cached_user(self):
+        """save() 를 거치지 않는 포인트 적립도 커밋 후 캐시된 잔액을 갱신하는지 확인"""
+        self.assertEqual(get_cached_user(self.user.pk).point_balance, 0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            apply_point_delta(self.user, 500, event_key="cache-test")
+
+        self.assertEqual(get_cached_user(self.user.pk).point_balance, 500)
+
+    def test_invalidation_message_drops_local_entry(self):
+        """다른 워커가 보낸 무효화 메시지를 받으면 워커 로컬 캐시에서 유저를 지우는지 확인"""
+        _user_cache.set(str(self.user.pk), {"id": self.user.pk})
+
+        _listener.handle(f"user:{self.user.pk}".encode())
+
+        self.assertIsNone(_user_cache.get(str(self.user.pk)))
+
+
+@override_settings(CACHES=REDIS_STUB_CACHES)
+class DefaultAddressTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            email="address@example.com",
+            password="testpassword",
+            username="배송지유저",
+            nickname="addressnick",
+            phone_number="01012345678",
+        )
+        self.request = RequestFactory().post("/users/me/address")
+        self.request.user = self.user
+
+    def _create(self, name, run_on_commit=True, **extra):
+        data = {
+            "address_name": name,
+            "recipient": "수취인",
+            "recipient_phone": "01012345678",
+            "post_code": "12345",
+            "address": "서울시",
+            "detail_address": "101호",
+            **extra,
+        }
+        serializer = AddressSerializer(data=data, context={"request": self.request})
+        serializer.is_valid(raise_exception=True)
+        if not run_on_commit:
+            return serializer.save()
+        # 요청마다 커밋되는 것처럼 커밋 후 캐시 무효화까지 실행한다
+        with self.captureOnCommitCallbacks(execute=True):
+            return serializer.save()
+
+    def _default_names(self):
+        return list(Address.objects.filter(user=self.user, is_default=True).values_list("address_name", flat=True))
+
+    def test_switching_default_keeps_single_default(self):
+        """첫 배송지는 자동으로 기본이 되고, 앞/뒤 id 어느 쪽으로 바꿔도 기본 배송지가 하나만 남는지 확인"""
+        home = self._create("집")
+        office = self._create("회사")
+        self.assertEqual(self._default_names(), ["집"])
+
+        self._create("본가", is_default=True)
+        self.assertEqual(self._default_names(), ["본가"])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            set_default_address(self.user.pk, home.pk)
+        self.assertEqual(self._default_names(), ["집"])
+        self.assertEqual(get_default_address_id(self.user.pk), home.pk)
+
+        serializer = AddressSerializer(office, data={"is_default": True}, partial=True, context={"request": self.request})
+        serializer.is_valid(raise_exception=True)
+        with self.captureOnCommitCallbacks(execute=True):
+            serializer.save()
+        self.assertEqual(self._default_names(), ["회사"])
+        self.assertEqual(get_default_address_id(self.user.pk), office.pk)
+
+    def test_cached_no_default_does_not_steal_default(self):
+        """'기본 배송지 없음'이 캐시된 상태에서 배송지를 추가해도 기존 기본 배송지를 빼앗지 않는지 확인"""
+        self.assertIsNone(get_default_address_id(self.user.pk))
+        # 첫 배송지의 커밋 후 무효화가 아직 실행되지 않아 캐시에는 '없음'이 남아 있다
+        home = self._create("집", run_on_commit=False)
+        self._create("회사")
+
+        self.assertEqual(self._default_names(), ["집"])
+        self.assertEqual(get_default_address_id(self.user.pk), home.pk)
+
+    def test_stale_entry_from_concurrent_reader_is_ignored(self):
+        """커밋 전에 조회한 요청이 무효화 뒤에 '없음'을 저장해도 다음 조회에서 버려지는지 확인"""
+        generation = cache.get(_generation_key(self.user.pk), 0)
+        home = self._create("집")
+        cache.set(_cache_key(self.user.pk), (NO_DEFAULT, generation))
+
+        self.assertEqual(get_default_address_id(self.user.pk), home.pk)
+
+    def test_partial_unique_index_rejects_second_default(self):
+        """기본 배송지를 직접 두 개 만들면 DB 제약에서 거절되는지 확인"""
+        self._create("집")
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Address.objects.create(
+                user=self.user,
+                address_name="회사",
+                recipient="수취인",
+                recipient_phone="01012345678",
+                post_code="12345",
+                address="서울시",
+                detail_address="101호",
+                is_default=True,
+            )
+
+
+class PasswordRehashTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="rehash@example.com",
+            username="재해시유저",
+            nickname="rehash",
+            phone_number="01012345678",
+            status="active",
+        )
+        self.user.password = make_password("testpassword", hasher="pbkdf2_sha256")
+        self.user.save(update_fields=["password"])
+
+    def _login(self, password):
+        serializer = LoginSerializer(
+            data={"email": "rehash@example.com", "password": password},
+            context={"request": RequestFactory().post("/auth/login")},
+        )
+        return serializer.is_valid()
+
+    def test_login_upgrades_legacy_hash(self):
+        """PBKDF2 로 저장된 비밀번호가 로그인 성공 시 설정된 첫 번째 해셔로 재해시되는지 확인"""
+        self.assertFalse(self._login("wrongpassword"))
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith("pbkdf2_sha256$"))
+
+        self.assertTrue(self._login("testpassword"))
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith("argon2$argon2id$"))
+        self.assertIn("m=19456,t=2,p=1", self.user.password)
+        self.assertTrue(self._login("testpassword"))
+
+
+class DatabasePoolTest(TestCase):
+    def test_health_and_pool_stats(self):
+        """헬스 체크는 누구나, 연결 풀 지표는 관리자만 볼 수 있는지 확인"""
+        client = APIClient()
+        self.assertEqual(client.get("/health/").data, {"status": "ok"})
+        self.assertEqual(client.get("/metrics/db-pool/").status_code, 401)
+
+        admin = User.objects.create_user(
+            email="pool-admin@example.com", password="1234", username="관리자", nickname="pooladmin", is_staff=True
+        )
+        client.force_authenticate(admin)
+        response = client.get("/metrics/db-pool/")
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.data["databases"]["default"]["pooled"])
+
+
+@skipUnless(connection.vendor == "postgresql", "연결 풀은 PostgreSQL 에서만 지원")
+class BenchDbPoolTest(TransactionTestCase):
+    def test_bench_modes(self):
+        """bench_db_pool 이 모드마다 요청을 처리하고 끝나면 원래 연결 설정으로 돌아오는지 확인"""
+        original = dict(connection.settings_dict)
+        out = StringIO()
+        call_command("bench_db_pool", "--requests", "3", stdout=out)
+
+        self.assertIn("[none]", out.getvalue())
+        self.assertIn("[pool]", out.getvalue())
+        self.assertEqual(connection.settings_dict, original)
+        self.assertIsNone(connection.pool)
@@ -0,0 +1,27 @@
+from utils.throttling import TokenBucketThrottle
+
+
+class AuthRateThrottle(TokenBucketThrottle):
+    """이메일 인증/재발송, 네이버 로그인 등 인증 없이 호출되는 엔드포인트"""
+
+    scope = "auth"
+
+
+class EmailCheckRateThrottle(TokenBucketThrottle):
+    """가입 폼에서 입력할 때마다 호출되므로 버스트를 넉넉하게 둔다"""
+
+    scope = "email_check"
+
+
+class LoginRateThrottle(TokenBucketThrottle):
+    """비밀번호 해시 전에 IP/계정/전체 시도 횟수를 제한"""
+
+    scope = "login"
+
+
+class SignupRateThrottle(TokenBucketThrottle):
+    scope = "signup"
+
+
+class TokenRefreshRateThrottle(TokenBucketThrottle):
+    scope = "token_refresh"
@@ -2,23 +2,42 @@ from django.urls import path
 
 from .views import NaverCallbackView, NaverLoginView, SessionViewSet, UsersViewSet
 
-users = UsersViewSet.as_view
-session = SessionViewSet.as_view
+
+def _action_view(viewset):
+    """
+    라우터 없이 ViewSet 액션을 직접 연결할 때도 @action 에 지정한 permission_classes / throttle_classes 를 적용한다.
+    (DRF 는 라우터가 만든 URL 에서만 액션 인자를 as_view 에 넘긴다)
+    """
+
+    def as_view(actions):
+        initkwargs = {}
+        for name in set(actions.values()):
+            initkwargs.update(getattr(getattr(viewset, name), "kwargs", {}))
+        return viewset.as_view(actions, **initkwargs)
+
+    return as_view
+
+
+users = _action_view(UsersViewSet)
+session = _action_view(SessionViewSet)
 
 urlpatterns = [
     path("users/signup", users({"post": "signup"}), name="signup"),
     path("users/me", users({"get": "me", "patch": "me", "delete": "me"}), name="me"),
     path("users/email/verify", users({"get": "email_verify"}), name="email_verify"),
+    path("users/email/resend", users({"post": "email_resend"}), name="email_resend"),
     path("users/email/exist", users({"get": "is_email_exist"}), name="is_email_exist"),
     path("auth/login", session({"post": "login"}), name="login"),
     path("auth/logout", session({"post": "logout"}), name="logout"),
     path("token/refresh", session({"post": "token_refresh"}), name="token_refresh"),
+    path("auth/throttle/metrics", session({"get": "throttle_metrics"}), name="throttle_metrics"),
     path(
         "users/me/address",
         users({"get": "address", "post": "address", "patch": "address", "delete": "address"}),
         name="me_address",
     ),
     path("users/me/points", users({"get": "points"}), name="me_points"),
+    path("users/me/points/summary", users({"get": "points_summary"}), name="me_points_summary"),
     path("users/me/points/balance", users({"get": "points_balance"}), name="me_points_balance"),
     path("auth/naver/login/", NaverLoginView.as_view(), name="naver_login"),
     path("auth/naver/callback/", NaverCallbackView.as_view(), name="naver_callback"),
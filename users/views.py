@@ -1,16 +1,19 @@
+import asyncio
+import hashlib
+import json
 import logging
 from urllib.parse import quote
 
-import requests
+import httpx
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.core import signing
-from django.core.mail import EmailMultiAlternatives
+from django.core.cache import cache
 from django.core.signing import BadSignature, SignatureExpired
 from django.http import HttpResponse, HttpResponseRedirect, JsonResponse
 from django.shortcuts import get_object_or_404, redirect
-from django.template.loader import render_to_string
 from django.utils.crypto import get_random_string
+from django.utils.http import parse_etags, quote_etag
 from django.views import View
 from drf_spectacular.utils import OpenApiExample, OpenApiParameter, OpenApiResponse, extend_schema, inline_serializer
 from rest_framework import permissions, serializers, status, viewsets
@@ -21,6 +24,10 @@ from rest_framework.views import APIView
 from rest_framework_simplejwt.exceptions import TokenError
 from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
 
+from utils.db_router import ReplicaReadMixin
+from utils.paginations import PointCursorPagination
+from utils.throttling import throttle_metrics
+
 from .auth import blacklist_jti, is_blacklisted
 from .models import Address, Point, SocialLogin
 from .serializers import (
@@ -29,13 +36,25 @@ from .serializers import (
     MeSerializer,
     MeUpdateSerializer,
     PointListSerializer,
+    PointMonthlySummarySerializer,
     SignUpSerializer,
 )
+from .services.email_bloom import might_contain
+from .services.emails import send_verify_email
+from .services.point_summary import get_monthly_summary
 from .services.points import get_point_balance
+from .throttles import (
+    AuthRateThrottle,
+    EmailCheckRateThrottle,
+    LoginRateThrottle,
+    SignupRateThrottle,
+    TokenRefreshRateThrottle,
+)
 
 User = get_user_model()
 
 EMAIL_VERIFY_SALT = "verify-email"
+EMAIL_RESEND_PREFIX = "email:resend:"
 
 logger = logging.getLogger(__name__)
 
@@ -50,10 +69,28 @@ def parse_email_token(token: str) -> str:
     return data["email"]
 
 
+def _build_verify_url(request, email: str) -> str:
+    code = make_email_token(email)
+    frontend_base = getattr(settings, "FRONTEND_BASE_URL", None)
+    if frontend_base:
+        return f"{frontend_base.rstrip('/')}/users/email/verify?code={code}"
+    return request.build_absolute_uri(f"/users/email/verify?code={code}")
+
+
+def _queue_verify_email(request, user) -> None:
+    verify_url = _build_verify_url(request, user.email)
+    if settings.DEBUG:
+        logger.debug(f"[EMAIL VERIFY URL] {verify_url}")
+    else:
+        send_verify_email(user, verify_url)
+
+
 # 회원가입, 내정보, 이메일인증, 포인트, 배송지
-class UsersViewSet(viewsets.ViewSet):
+class UsersViewSet(ReplicaReadMixin, viewsets.ViewSet):
     permission_classes = (permissions.AllowAny,)
     serializer_class = serializers.Serializer
+    # 포인트 내역/월별 요약만 복제본에서 읽는다. 잔액은 사용 직전 확인용이라 primary 에서 읽는다
+    replica_actions = ("points", "points_summary")
 
     @extend_schema(
         methods=["post"],
@@ -61,41 +98,25 @@ class UsersViewSet(viewsets.ViewSet):
         request=SignUpSerializer,
         responses={201: {"description": "회원가입 완료"}},
     )
-    @action(detail=False, methods=["post"], url_path="signup", permission_classes=[permissions.AllowAny])
+    @action(
+        detail=False,
+        methods=["post"],
+        url_path="signup",
+        permission_classes=[permissions.AllowAny],
+        throttle_classes=[SignupRateThrottle],
+    )
     def signup(self, request):
         ser = SignUpSerializer(data=request.data, context={"request": request})
         ser.is_valid(raise_exception=True)
         user = ser.save()
 
-        # 인증용 토큰 생성
-        code = make_email_token(user.email)
-        frontend_base = getattr(settings, "FRONTEND_BASE_URL", None)
-        if frontend_base:
-            verify_url = f"{frontend_base.rstrip('/')}/users/email/verify?code={code}"
-        else:
-            verify_url = request.build_absolute_uri(f"/users/email/verify?code={code}")
-
-        if settings.DEBUG:
-            logger.debug(f"[EMAIL VERIFY URL] {verify_url}")
-        else:
-            subject = "[ObeStore] 이메일 인증을 완료해주세요."
-            from_email = settings.DEFAULT_FROM_EMAIL
-            to = [user.email]
-            html = render_to_string(
-                "emails/verify_email.html",
-                {
-                    "username": user.username,
-                    "verify_url": verify_url,
-                    "preheader": "버튼을 눌러 ObeStore 이메일 인증을 완료하세요.",
-                },
-            )
-            text = f"다음 링크를 클릭해 인증을 완료하세요:\n{verify_url}"
-
-            msg = EmailMultiAlternatives(subject, text, from_email, to)
-            msg.attach_alternative(html, "text/html")
-            msg.send(fail_silently=False)
+        try:
+            _queue_verify_email(request, user)
+        except Exception:
+            # 메일 큐 장애로 이미 생성된 계정의 가입 응답을 실패시키지 않음 (재발송 API 로 복구 가능)
+            logger.exception("failed to queue verify email for user %s", user.pk)
 
-        return Response({"detail": "회원가입 완료! 이메일 인증을 진행해주세요.","login_type": getattr(user, "_login_type", "email"),}, status=status.HTTP_201_CREATED)
+        return Response({"detail": "회원가입 완료! 이메일 인증을 진행해주세요.","login_type": user.login_type,}, status=status.HTTP_201_CREATED)
 
     @extend_schema(
         methods=["get"],
@@ -121,7 +142,13 @@ class UsersViewSet(viewsets.ViewSet):
     )
     def me(self, request):
         if request.method == "GET":
-            return Response(MeSerializer(request.user).data)
+            data = MeSerializer(request.user).data
+            # 프런트가 페이지마다 호출하므로 변경이 없으면 본문 없이 304 로 응답
+            etag = quote_etag(hashlib.md5(json.dumps(data, sort_keys=True).encode()).hexdigest())
+            headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+            if etag in parse_etags(request.headers.get("If-None-Match", "")):
+                return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+            return Response(data, headers=headers)
 
         if request.method == "PATCH":
             if "password" not in request.data or not request.data.get("password"):
@@ -152,7 +179,13 @@ class UsersViewSet(viewsets.ViewSet):
             400: OpenApiResponse(description="잘못되거나 만료된 코드"),
         },
     )
-    @action(detail=False, methods=["get"], url_path="email/verify", permission_classes=[permissions.AllowAny])
+    @action(
+        detail=False,
+        methods=["get"],
+        url_path="email/verify",
+        permission_classes=[permissions.AllowAny],
+        throttle_classes=[AuthRateThrottle],
+    )
     def email_verify(self, request):
         code = request.query_params.get("code")
         if not code:
@@ -175,6 +208,41 @@ class UsersViewSet(viewsets.ViewSet):
         except (BadSignature, User.DoesNotExist, KeyError, ValueError):
             return Response({"detail": "유효하지 않은 링크입니다."}, status=status.HTTP_400_BAD_REQUEST)
 
+    @extend_schema(
+        methods=["post"],
+        description="이메일 인증 링크 재발송 (가입 여부와 관계없이 같은 응답을 반환)",
+        request=inline_serializer(name="EmailResendRequest", fields={"email": serializers.EmailField()}),
+        responses={
+            200: OpenApiResponse(description="재발송 요청 접수"),
+            429: OpenApiResponse(description="재발송 대기 시간 이내의 재요청"),
+        },
+    )
+    @action(
+        detail=False,
+        methods=["post"],
+        url_path="email/resend",
+        permission_classes=[permissions.AllowAny],
+        throttle_classes=[AuthRateThrottle],
+    )
+    def email_resend(self, request):
+        # 쿨다운 키와 유저 조회가 같은 주소를 보도록 한 번만 정규화한다 (대소문자만 다른 주소는 같은 주소로 본다)
+        email = (request.data.get("email") or "").strip().lower()
+        if not email:
+            return Response({"detail": "email 필드가 필요합니다."}, status=status.HTTP_400_BAD_REQUEST)
+
+        cooldown = getattr(settings, "EMAIL_RESEND_COOLDOWN", 60)
+        if not cache.add(f"{EMAIL_RESEND_PREFIX}{email}", 1, timeout=cooldown):
+            return Response(
+                {"detail": "잠시 후 다시 시도해주세요."},
+                status=status.HTTP_429_TOO_MANY_REQUESTS,
+                headers={"Retry-After": str(cooldown)},
+            )
+
+        user = User.objects.filter(email__iexact=email, status="ready").first()
+        if user is not None:
+            _queue_verify_email(request, user)
+        return Response({"detail": "인증 메일을 다시 보냈습니다. 메일함을 확인해주세요."}, status=200)
+
     @extend_schema(
         methods=["get"],
         description="이메일 중복 여부 검사",
@@ -201,10 +269,17 @@ class UsersViewSet(viewsets.ViewSet):
             ]
         ),
     )
-    @action(detail=False, methods=["get"], url_path="email/exist", permission_classes=[permissions.AllowAny])
+    @action(
+        detail=False,
+        methods=["get"],
+        url_path="email/exist",
+        permission_classes=[permissions.AllowAny],
+        throttle_classes=[EmailCheckRateThrottle],
+    )
     def is_email_exist(self, request):
         if typed_email := request.query_params.get("email"):
-            if not User.objects.filter(email=typed_email).exists():
+            # Bloom 필터에 없으면 확실히 미가입이므로 DB 를 조회하지 않음
+            if might_contain(typed_email) is False or not User.objects.filter(email=typed_email).exists():
                 return Response({"available": True, "detail": "사용 가능한 이메일입니다."})
             return Response({"available": False, "detail": "이미 사용 중입니다."})
         return Response({"available": False, "detail": "이메일을 입력해주세요."})
@@ -212,13 +287,26 @@ class UsersViewSet(viewsets.ViewSet):
     # 포인트 내역 조회..
     @extend_schema(
         methods=["get"],
-        description="로그인된 사용자의 포인트 내역 조회",
+        description="로그인된 사용자의 포인트 내역 조회 (커서 페이지네이션, 최신순)",
         responses={200: OpenApiResponse(response=PointListSerializer(many=True))},
     )
     @action(detail=False, methods=["get"], url_path="me/points", permission_classes=[permissions.IsAuthenticated])
     def points(self, request):
-        qs = Point.objects.filter(user=request.user).order_by("-created_at", "-id")
-        return Response(PointListSerializer(qs, many=True).data, status=200)
+        paginator = PointCursorPagination()
+        page = paginator.paginate_queryset(Point.objects.filter(user=request.user), request, view=self)
+        return paginator.get_paginated_response(PointListSerializer(page, many=True).data)
+
+    # 월별 포인트 요약
+    @extend_schema(
+        methods=["get"],
+        description="로그인된 사용자의 월별 포인트 적립/사용 합계 (최신순)",
+        responses={200: OpenApiResponse(response=PointMonthlySummarySerializer(many=True))},
+    )
+    @action(
+        detail=False, methods=["get"], url_path="me/points/summary", permission_classes=[permissions.IsAuthenticated]
+    )
+    def points_summary(self, request):
+        return Response(PointMonthlySummarySerializer(get_monthly_summary(request.user), many=True).data, status=200)
 
     # 포인트 잔액 조회
     @extend_schema(
@@ -324,7 +412,7 @@ class SessionViewSet(viewsets.ViewSet):
             400: OpenApiResponse(description="유효하지 않은 로그인 정보"),
         },
     )
-    @action(detail=False, methods=["post"])
+    @action(detail=False, methods=["post"], throttle_classes=[LoginRateThrottle])
     def login(self, request):
         ser = LoginSerializer(data=request.data, context={"request": request})
         ser.is_valid(raise_exception=True)
@@ -396,7 +484,7 @@ class SessionViewSet(viewsets.ViewSet):
         },
         tags=["session"],
     )
-    @action(detail=False, methods=["post"], url_path="token/refresh")
+    @action(detail=False, methods=["post"], url_path="token/refresh", throttle_classes=[TokenRefreshRateThrottle])
     def token_refresh(self, request):
         refresh = request.data.get("refresh") or request.COOKIES.get("refresh_token")
         if not refresh:
@@ -409,9 +497,29 @@ class SessionViewSet(viewsets.ViewSet):
         except TokenError:
             return Response({"detail": "유효하지 않은 refresh 토큰입니다."}, status=400)
 
+    @extend_schema(
+        methods=["get"],
+        description="인증 엔드포인트 요청 제한 지표 (관리자 전용). scope 별 허용 횟수와 차원(ip/email/route)별 거절 횟수",
+        responses={200: OpenApiResponse(description="scope -> {allowed, denied:<차원>} 카운터")},
+        tags=["session"],
+    )
+    @action(
+        detail=False,
+        methods=["get"],
+        url_path="throttle/metrics",
+        permission_classes=[permissions.IsAdminUser],
+    )
+    def throttle_metrics(self, request):
+        try:
+            return Response(throttle_metrics(), status=200)
+        except Exception:
+            logger.warning("failed to read throttle metrics", exc_info=True)
+            return Response({"detail": "지표를 불러올 수 없습니다."}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+
 
 class NaverLoginView(APIView):
     permission_classes = [AllowAny]
+    throttle_classes = [AuthRateThrottle]
 
     @extend_schema(
         summary="네이버 로그인",
@@ -428,7 +536,7 @@ class NaverLoginView(APIView):
         request.session["naver_oauth_state"] = state
 
         naver_auth_url = (
-            "https://nid.naver.com/oauth2.0/authorize"
+            f"{settings.NAVER_AUTHORIZE_URL}"
             f"?response_type=code"
             f"&client_id={client_id}"
             f"&redirect_uri={redirect_uri}"
@@ -439,7 +547,12 @@ class NaverLoginView(APIView):
 
 
 class NaverCallbackView(View):
-    def get(self, request):
+    """
+    async 뷰: 네이버 API 를 기다리는 동안 워커(이벤트 루프)가 다른 요청을 처리할 수 있다.
+    토큰 -> 프로필 호출은 서로 의존하므로 순차적으로 하되, 각 호출과 전체 흐름에 타임아웃을 둔다.
+    """
+
+    async def get(self, request):
         code = request.GET.get("code")
         state = request.GET.get("state")
         secure = not settings.DEBUG
@@ -447,26 +560,32 @@ class NaverCallbackView(View):
         if not code:
             return JsonResponse({"error": "Missing authorization code."}, status=400)
 
-        token_url = "https://nid.naver.com/oauth2.0/token"
-        data = {
+        params = {
             "grant_type": "authorization_code",
             "client_id": settings.NAVER_CLIENT_ID,
             "client_secret": settings.NAVER_CLIENT_SECRET,
             "code": code,
             "state": state,
         }
+        timeout = httpx.Timeout(settings.NAVER_HTTP_TIMEOUT, connect=settings.NAVER_HTTP_CONNECT_TIMEOUT)
 
-        token_response = requests.get(token_url, params=data)
-        token_data = token_response.json()
+        try:
+            async with asyncio.timeout(settings.NAVER_CALLBACK_DEADLINE):
+                async with httpx.AsyncClient(timeout=timeout) as client:
+                    token_response = await client.get(settings.NAVER_TOKEN_URL, params=params)
+                    token_data = token_response.json()
 
-        access_token = token_data.get("access_token")
-        if not access_token:
-            return HttpResponse("Failed to get Naver access token", status=400)
+                    access_token = token_data.get("access_token")
+                    if not access_token:
+                        return HttpResponse("Failed to get Naver access token", status=400)
 
-        profile_url = "https://openapi.naver.com/v1/nid/me"
-        headers = {"Authorization": f"Bearer {access_token}"}
-        profile_response = requests.get(profile_url, headers=headers)
-        profile_data = profile_response.json()
+                    profile_response = await client.get(
+                        settings.NAVER_PROFILE_URL, headers={"Authorization": f"Bearer {access_token}"}
+                    )
+                    profile_data = profile_response.json()
+        except (TimeoutError, httpx.HTTPError, ValueError):
+            logger.warning("naver oauth upstream failed", exc_info=True)
+            return HttpResponse("Naver login is temporarily unavailable", status=502)
 
         user_info = profile_data.get("response", {})
         email = user_info.get("email")
@@ -477,21 +596,26 @@ class NaverCallbackView(View):
         if not email:
             return HttpResponse("Email not provided", status=400)
 
-        user, created = User.objects.get_or_create(
+        user, created = await User.objects.aget_or_create(
             email=email,
             defaults={
                 "username": name,
                 "nickname": nickname,
                 "phone_number": phone_number,
                 "status": "active",
+                "login_type": "naver",
             },
         )
         if created:
             user.set_unusable_password()
-            user.save()
+            await user.asave()
+        elif user.login_type != "naver":
+            # 이메일로 가입한 계정이 네이버로 연동되는 경우
+            user.login_type = "naver"
+            await user.asave(update_fields=["login_type"])
 
         provider_user_id = user_info.get("id")
-        SocialLogin.objects.update_or_create(
+        await SocialLogin.objects.aupdate_or_create(
             user=user,
             provider="naver",
             provider_user_id=provider_user_id,
@@ -509,4 +633,4 @@ class NaverCallbackView(View):
         )
 
         response.set_cookie("refresh_token", str(refresh), httponly=True, samesite="None", secure=secure, path="/")
-        return response
\ No newline at end of file
+        return response
@@ -0,0 +1,64 @@
+import logging
+import os
+
+from django.db import DatabaseError, connection, connections
+from drf_spectacular.utils import OpenApiResponse, extend_schema
+from rest_framework import permissions, status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+logger = logging.getLogger(__name__)
+
+
+def pool_stats() -> dict:
+    """
+    현재 프로세스의 DB alias 별 연결 풀 지표 (psycopg_pool get_stats).
+    대기 요청 수/누적 대기 시간(requests_waiting, requests_wait_ms), 연결 사용 시간(usage_ms) 등.
+    풀을 쓰지 않는 alias 는 CONN_MAX_AGE 설정만 돌려준다.
+    """
+    stats = {}
+    for alias in connections:
+        conn = connections[alias]
+        pool = getattr(conn, "pool", None)
+        if pool is None:
+            stats[alias] = {
+                "pooled": False,
+                "conn_max_age": conn.settings_dict.get("CONN_MAX_AGE"),
+                "conn_health_checks": conn.settings_dict.get("CONN_HEALTH_CHECKS"),
+            }
+        else:
+            stats[alias] = {"pooled": True, **pool.get_stats()}
+    return stats
+
+
+class HealthCheckView(APIView):
+    """로드밸런서용 헬스 체크. DB 에 SELECT 1 한 번만 보낸다."""
+
+    authentication_classes = []
+    permission_classes = [permissions.AllowAny]
+
+    @extend_schema(
+        summary="헬스 체크",
+        description="DB 연결을 확인합니다.",
+        responses={200: OpenApiResponse(description="{status: ok}"), 503: OpenApiResponse(description="DB 연결 실패")},
+    )
+    def get(self, request):
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+        except DatabaseError:
+            logger.warning("health check failed", exc_info=True)
+            return Response({"status": "unavailable"}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+        return Response({"status": "ok"})
+
+
+class DatabasePoolStatsView(APIView):
+    permission_classes = [permissions.IsAdminUser]
+
+    @extend_schema(
+        summary="DB 연결 풀 지표",
+        description="요청을 처리한 워커 프로세스(pid)의 DB 연결 풀 지표 (관리자 전용). 풀은 워커마다 따로 있다.",
+        responses={200: OpenApiResponse(description="{pid, databases: alias -> 풀 지표}")},
+    )
+    def get(self, request):
+        return Response({"pid": os.getpid(), "databases": pool_stats()})
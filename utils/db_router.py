@@ -0,0 +1,142 @@
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework.permissions import SAFE_METHODS
+
+logger = logging.getLogger(__name__)
+
+PIN_KEY_PREFIX = "db:pin:"
+
+# 현재 요청(스레드/코루틴)의 조회를 복제본으로 보낼지 여부. ReplicaReadMixin 이 켠다
+_replica_reads = ContextVar("replica_reads", default=False)
+
+
+@contextmanager
+def replica_reads(enabled: bool = True):
+    token = _replica_reads.set(enabled)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+def read_from_primary():
+    """복제본 조회 중이라도 최신 값이 필요한 곳(캐시 재생성 등)에서 primary 로 읽는다."""
+    return replica_reads(False)
+
+
+class PrimaryReplicaRouter:
+    """
+    settings.READ_REPLICA_ALIAS 가 있고 replica_reads 가 켜진 동안만 조회를 복제본으로 보낸다.
+    쓰기는 복제본에서 읽은 객체라도 항상 default 로 보낸다.
+    """
+
+    def db_for_read(self, model, **hints):
+        alias = getattr(settings, "READ_REPLICA_ALIAS", None)
+        if alias and _replica_reads.get():
+            return alias
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # 복제본은 default 의 사본이므로 어느 쪽에서 읽은 객체끼리도 연결할 수 있다
+        return True
+
+
+def _pin_key(user_id) -> str:
+    return f"{PIN_KEY_PREFIX}{user_id}"
+
+
+def pin_to_primary(user_id) -> None:
+    try:
+        cache.set(_pin_key(user_id), 1, timeout=getattr(settings, "REPLICA_PIN_SECONDS", 5))
+    except Exception:
+        logger.warning("failed to pin user %s to primary", user_id, exc_info=True)
+
+
+def is_pinned(user_id) -> bool:
+    try:
+        return cache.get(_pin_key(user_id)) is not None
+    except Exception:
+        # 쓰기 직후인지 알 수 없으면 자신이 쓴 내용이 안 보이는 일이 없도록 primary 로 읽는다
+        logger.warning("replica pin unavailable; reading from primary", exc_info=True)
+        return True
+
+
+class PrimaryPinMiddleware:
+    """
+    로그인 유저가 쓰기 요청(POST/PUT/PATCH/DELETE)을 보내면 REPLICA_PIN_SECONDS 동안 조회를 primary 로 고정한다.
+    복제 지연 동안 방금 쓴 주문/리뷰가 목록에서 안 보이는 일을 막는다 (read-your-writes).
+    ASGI 에서 async 뷰 앞에 sync 미들웨어가 끼어 요청마다 스레드를 쓰지 않도록 async 도 지원한다.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        response = self.get_response(request)
+        if self._is_write(request):
+            self._pin(request)
+        return response
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        if self._is_write(request):
+            # request.user 가 아직 평가되지 않은 lazy 객체일 수 있어 스레드에서 확인한다
+            await sync_to_async(self._pin)(request)
+        return response
+
+    @staticmethod
+    def _is_write(request) -> bool:
+        return request.method not in SAFE_METHODS and bool(getattr(settings, "READ_REPLICA_ALIAS", None))
+
+    @staticmethod
+    def _pin(request) -> None:
+        # DRF 인증(JWT)은 뷰에서 일어나지만 Request.user 를 설정할 때 Django request.user 에도 반영된다
+        user = getattr(request, "user", None)
+        if user is not None and user.is_authenticated:
+            pin_to_primary(user.pk)
+
+
+class ReplicaReadMixin:
+    """
+    조회 전용 액션을 복제본에서 읽도록 하는 뷰 믹스인.
+    replica_actions 로 대상 ViewSet 액션을 정하고, None 이면 안전한 메서드(GET/HEAD/OPTIONS) 전체가 대상이다.
+    쓰기 직후 primary 로 고정된 유저는 복제본을 쓰지 않는다.
+    """
+
+    replica_actions = None
+
+    def use_replica(self, request) -> bool:
+        if request.method not in SAFE_METHODS:
+            return False
+        if self.replica_actions is not None and getattr(self, "action", None) not in self.replica_actions:
+            return False
+        user = request.user
+        return not (user.is_authenticated and is_pinned(user.pk))
+
+    def initial(self, request, *args, **kwargs):
+        # 인증/권한 확인은 primary 에서 끝낸 뒤 뷰 본문의 조회만 복제본으로 보낸다
+        super().initial(request, *args, **kwargs)
+        if getattr(settings, "READ_REPLICA_ALIAS", None) and self.use_replica(request):
+            self._replica_token = _replica_reads.set(True)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        token = self.__dict__.pop("_replica_token", None)
+        if token is not None:
+            _replica_reads.reset(token)
+        return super().finalize_response(request, response, *args, **kwargs)
@@ -0,0 +1,23 @@
+from io import BytesIO
+
+from PIL import Image, ImageOps
+
+
+def render_webp_variants(data: bytes, sizes: dict[str, int], quality: int = 80) -> dict[str, bytes]:
+    """
+    원본 이미지 바이트에서 긴 변이 sizes[name] 픽셀 이하인 WebP 이미지를 만들어 {name: bytes} 로 돌려준다.
+    프로세스 풀에서 실행되므로 Django 에 의존하지 않는다. 원본보다 크게 늘리지는 않는다.
+    """
+    with Image.open(BytesIO(data)) as source:
+        image = ImageOps.exif_transpose(source)
+        has_alpha = image.mode in ("RGBA", "LA") or (image.mode == "P" and "transparency" in image.info)
+        image = image.convert("RGBA" if has_alpha else "RGB")
+
+    variants = {}
+    for name, max_side in sizes.items():
+        variant = image.copy()
+        variant.thumbnail((max_side, max_side), Image.Resampling.LANCZOS)
+        buffer = BytesIO()
+        variant.save(buffer, format="WEBP", quality=quality, method=4)
+        variants[name] = buffer.getvalue()
+    return variants
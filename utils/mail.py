@@ -0,0 +1,110 @@
+import logging
+import smtplib
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+
+from utils import task_queue
+
+logger = logging.getLogger(__name__)
+
+MAIL_QUEUE = "mail"
+
+
+def queue_mail(subject: str, body: str, to, *, html: str | None = None, from_email: str | None = None) -> None:
+    """트랜잭션 메일을 발송 큐에 넣는다. 실제 발송은 run_mail_worker 가 담당."""
+    task_queue.enqueue(
+        MAIL_QUEUE,
+        {
+            "subject": subject,
+            "body": body,
+            "html": html,
+            "from_email": from_email or settings.DEFAULT_FROM_EMAIL,
+            "to": list(to),
+            "attempts": 0,
+        },
+    )
+
+
+def _build_message(payload: dict, connection) -> EmailMultiAlternatives:
+    message = EmailMultiAlternatives(
+        payload["subject"], payload["body"], payload.get("from_email"), payload["to"], connection=connection
+    )
+    if payload.get("html"):
+        message.attach_alternative(payload["html"], "text/html")
+    return message
+
+
+def deliver_batch(payloads: list[dict], connection=None) -> list[dict]:
+    """
+    하나의 SMTP 연결로 메일 여러 통을 보내고, 발송에 실패한 payload 목록을 돌려준다.
+    이미 열린 연결을 넘기면 닫지 않고 그대로 두며, 여기서 연 연결만 배치가 끝날 때 닫는다.
+    """
+    connection = connection or get_connection(fail_silently=False)
+    try:
+        opened = connection.open()
+    except (smtplib.SMTPException, OSError):
+        logger.warning("failed to open mail connection", exc_info=True)
+        return list(payloads)
+
+    failed = []
+    try:
+        for payload in payloads:
+            try:
+                connection.send_messages([_build_message(payload, connection)])
+            except smtplib.SMTPServerDisconnected:
+                # 서버가 유휴 연결을 끊은 경우 한 번만 다시 연결해서 재시도
+                try:
+                    connection.close()
+                    connection.open()
+                    connection.send_messages([_build_message(payload, connection)])
+                except (smtplib.SMTPException, OSError):
+                    logger.warning("failed to send mail to %s", payload["to"], exc_info=True)
+                    failed.append(payload)
+            except (smtplib.SMTPException, OSError):
+                logger.warning("failed to send mail to %s", payload["to"], exc_info=True)
+                failed.append(payload)
+    finally:
+        if opened:
+            connection.close()
+    return failed
+
+
+def retry_later(payload: dict) -> None:
+    payload = {**payload, "attempts": payload.get("attempts", 0) + 1}
+    max_attempts = getattr(settings, "MAIL_QUEUE_MAX_ATTEMPTS", 5)
+    if payload["attempts"] >= max_attempts:
+        logger.error("mail to %s dropped after %s attempts", payload["to"], payload["attempts"])
+        task_queue.dead_letter(MAIL_QUEUE, payload)
+        return
+    delay = getattr(settings, "MAIL_QUEUE_RETRY_BASE_DELAY", 30) * 2 ** (payload["attempts"] - 1)
+    task_queue.schedule_retry(MAIL_QUEUE, payload, delay)
+
+
+def run_mail_worker(*, batch_size: int | None = None, poll_timeout: int = 5, once: bool = False) -> None:
+    """큐가 바쁜 동안에는 SMTP 연결 하나를 배치 사이에서도 재사용하고, 한가해지면 닫는다."""
+    batch_size = batch_size or getattr(settings, "MAIL_QUEUE_BATCH_SIZE", 50)
+    connection = None
+    while True:
+        payloads = task_queue.dequeue_batch(MAIL_QUEUE, batch_size, timeout=poll_timeout)
+        if not payloads:
+            if connection is not None:
+                connection.close()
+                connection = None
+            if once:
+                return
+            continue
+
+        if connection is None:
+            connection = get_connection(fail_silently=False)
+            try:
+                # 워커가 직접 연 연결은 deliver_batch 가 배치 끝에 닫지 않는다
+                connection.open()
+            except (smtplib.SMTPException, OSError):
+                logger.warning("failed to open mail connection", exc_info=True)
+                connection = None
+                for payload in payloads:
+                    retry_later(payload)
+                continue
+        for payload in deliver_batch(payloads, connection):
+            retry_later(payload)
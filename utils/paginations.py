@@ -0,0 +1,19 @@
+from rest_framework.pagination import CursorPagination
+
+
+class CreatedAtCursorPagination(CursorPagination):
+    """
+    created_at 역순 커서 페이지네이션.
+    OFFSET 없이 (created_at, id) 인덱스를 타므로 내역이 길어져도 뒤쪽 페이지 비용이 같다.
+    """
+
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    ordering = ("-created_at", "-id")
+
+
+class PointCursorPagination(CreatedAtCursorPagination):
+    """포인트 내역은 한 화면에 더 많이 보여준다."""
+
+    page_size = 30
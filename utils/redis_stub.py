@@ -0,0 +1,15 @@
+from fakeredis import FakeConnection
+
+# 테스트용 CACHES. django-redis 가 실제 Redis 서버 대신 프로세스 안의 fakeredis 서버에 연결한다.
+# Lua 스크립트, 집합/비트 명령, pub/sub 까지 같은 명령으로 동작하므로 Redis 가 없는 환경에서도
+# 캐시 실패 시 우회하는 경로가 아니라 캐시를 실제로 쓰는 경로를 테스트할 수 있다. 테스트마다 cache.clear() 로 비운다.
+REDIS_STUB_CACHES = {
+    "default": {
+        "BACKEND": "django_redis.cache.RedisCache",
+        "LOCATION": "redis://redis-stub:6379/1",
+        "OPTIONS": {
+            "CLIENT_CLASS": "django_redis.client.DefaultClient",
+            "CONNECTION_POOL_KWARGS": {"connection_class": FakeConnection},
+        },
+    }
+}
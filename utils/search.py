@@ -0,0 +1,50 @@
+import re
+
+WORD_RE = re.compile(r"\w+")
+HANGUL_RE = re.compile(r"[가-힣]+")
+
+
+def _bigrams(run: str) -> list[str]:
+    return [run[i : i + 2] for i in range(len(run) - 1)]
+
+
+def _pieces(word: str) -> list[str]:
+    """한글 부분과 나머지(영문/숫자) 부분으로 나눈다."""
+    return [piece for piece in re.split(f"({HANGUL_RE.pattern})", word) if piece]
+
+
+def _dedupe(tokens) -> list:
+    return list(dict.fromkeys(tokens))
+
+
+def document_tokens(text: str) -> list[str]:
+    """
+    검색 대상 문서의 토큰. 단어 자체와 단어 안 한글의 2글자 조각(bigram)을 함께 넣는다.
+    한국어는 조사/어미가 붙어 띄어쓰기 단위로는 잘 맞지 않으므로 "배송이 빨라요" 를 "빨라" 로도 찾을 수 있게 한다.
+    관련도 계산에 등장 횟수가 쓰이므로 중복은 없애지 않는다.
+    """
+    tokens = []
+    for word in WORD_RE.findall(text.lower()):
+        tokens.append(word)
+        pieces = _pieces(word)
+        if len(pieces) > 1:
+            tokens += pieces  # "갤럭시s24" -> "갤럭시", "s24"
+        for piece in pieces:
+            if HANGUL_RE.fullmatch(piece) and len(piece) > 2:
+                tokens += _bigrams(piece)
+    return tokens
+
+
+def query_tokens(text: str) -> list[tuple[str, bool]]:
+    """
+    검색어 토큰과 접두어 검색 여부. 두 글자 이상 한글은 bigram 으로 쪼개 정확히 맞추고,
+    한 글자 한글이나 영문/숫자는 접두어로 찾는다.
+    """
+    tokens = []
+    for word in WORD_RE.findall(text.lower()):
+        for piece in _pieces(word):
+            if HANGUL_RE.fullmatch(piece) and len(piece) >= 2:
+                tokens += [(bigram, False) for bigram in _bigrams(piece)]
+            else:
+                tokens.append((piece, True))
+    return _dedupe(tokens)
@@ -0,0 +1,114 @@
+import socketserver
+import threading
+from email import message_from_bytes
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    """메일을 저장만 하는 최소한의 SMTP 세션 (AUTH/TLS 미지원)."""
+
+    def reply(self, line: str):
+        self.wfile.write(f"{line}\r\n".encode())
+
+    def handle(self):
+        sink = self.server.sink
+        sink.record_connection()
+        self.reply("220 smtp-sink ready")
+        mail_from, rcpt_to = None, []
+        while True:
+            raw = self.rfile.readline()
+            if not raw:
+                return
+            command, _, arg = raw.decode(errors="replace").strip().partition(" ")
+            command = command.upper()
+
+            if command in ("EHLO", "HELO"):
+                self.reply("250 smtp-sink")
+            elif command == "MAIL":
+                mail_from, rcpt_to = arg.partition(":")[2].strip(" <>"), []
+                self.reply("250 OK")
+            elif command == "RCPT":
+                address = arg.partition(":")[2].strip(" <>")
+                if address in sink.reject_recipients:
+                    self.reply("550 mailbox unavailable")
+                else:
+                    rcpt_to.append(address)
+                    self.reply("250 OK")
+            elif command == "DATA":
+                if not rcpt_to:
+                    self.reply("503 need RCPT")
+                    continue
+                self.reply("354 end data with <CR><LF>.<CR><LF>")
+                lines = []
+                while True:
+                    line = self.rfile.readline()
+                    if not line or line in (b".\r\n", b".\n"):
+                        break
+                    lines.append(line[1:] if line.startswith(b"..") else line)
+                sink.record_message(mail_from, rcpt_to, message_from_bytes(b"".join(lines)))
+                mail_from, rcpt_to = None, []
+                self.reply("250 OK")
+            elif command == "RSET":
+                mail_from, rcpt_to = None, []
+                self.reply("250 OK")
+            elif command == "NOOP":
+                self.reply("250 OK")
+            elif command == "QUIT":
+                self.reply("221 bye")
+                return
+            else:
+                self.reply("502 command not implemented")
+
+
+class _ThreadingSMTPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class SMTPSink:
+    """
+    테스트/부하 측정용 로컬 SMTP 서버.
+    받은 메일과 연결 수를 기록해서 연결 재사용 여부를 확인할 수 있다.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, reject_recipients=()):
+        self.reject_recipients = set(reject_recipients)
+        self.messages = []
+        self.connection_count = 0
+        self._lock = threading.Lock()
+        self._server = _ThreadingSMTPServer((host, port), _SMTPHandler)
+        self._server.sink = self
+        self._thread = None
+
+    @property
+    def host(self) -> str:
+        return self._server.server_address[0]
+
+    @property
+    def port(self) -> int:
+        return self._server.server_address[1]
+
+    def record_connection(self):
+        with self._lock:
+            self.connection_count += 1
+
+    def record_message(self, mail_from, rcpt_to, message):
+        with self._lock:
+            self.messages.append({"from": mail_from, "to": list(rcpt_to), "message": message})
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name="smtp-sink", daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        self._server.serve_forever()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
@@ -0,0 +1,54 @@
+import json
+import time
+
+from django_redis import get_redis_connection
+
+QUEUE_PREFIX = "queue:"
+
+
+def _redis():
+    return get_redis_connection("default")
+
+
+def _key(queue: str, suffix: str = "") -> str:
+    return f"{QUEUE_PREFIX}{queue}{suffix}"
+
+
+def enqueue(queue: str, payload: dict) -> None:
+    _redis().lpush(_key(queue), json.dumps(payload, ensure_ascii=False))
+
+
+def dequeue_batch(queue: str, max_items: int, timeout: int = 5) -> list[dict]:
+    """최대 timeout 초 동안 첫 작업을 기다린 뒤, 이미 쌓여 있는 작업을 max_items 개까지 한 번에 꺼낸다."""
+    redis = _redis()
+    promote_due(queue)
+
+    first = redis.brpop(_key(queue), timeout=timeout)
+    if first is None:
+        return []
+    raw_items = [first[1]]
+    if max_items > 1:
+        raw_items += redis.rpop(_key(queue), max_items - 1) or []
+    return [json.loads(raw) for raw in raw_items]
+
+
+def schedule_retry(queue: str, payload: dict, delay: float) -> None:
+    _redis().zadd(_key(queue, ":delayed"), {json.dumps(payload, ensure_ascii=False): time.time() + delay})
+
+
+def promote_due(queue: str) -> int:
+    """재시도 시각이 지난 작업을 본 큐로 옮긴다."""
+    redis = _redis()
+    delayed_key = _key(queue, ":delayed")
+    due = redis.zrangebyscore(delayed_key, "-inf", time.time())
+    moved = 0
+    for raw in due:
+        # 여러 워커가 동시에 옮겨도 zrem 에 성공한 워커만 큐에 넣는다
+        if redis.zrem(delayed_key, raw):
+            redis.lpush(_key(queue), raw)
+            moved += 1
+    return moved
+
+
+def dead_letter(queue: str, payload: dict) -> None:
+    _redis().lpush(_key(queue, ":dead"), json.dumps(payload, ensure_ascii=False))
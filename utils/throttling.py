@@ -0,0 +1,160 @@
+import hashlib
+import logging
+
+from django.conf import settings
+from django_redis import get_redis_connection
+from rest_framework.exceptions import ParseError
+from rest_framework.throttling import BaseThrottle
+
+logger = logging.getLogger(__name__)
+
+BUCKET_PREFIX = "throttle:bucket:"
+METRICS_PREFIX = "throttle:metrics:"
+
+# 여러 토큰 버킷(ip/email/route)을 한 번에 검사한다.
+# 모든 버킷에 토큰이 있을 때만 각각 하나씩 소비하고, 하나라도 비어 있으면 아무것도 소비하지 않는다.
+# KEYS = 버킷 키 n개 + 지표 해시, ARGV = 버킷마다 (용량, 초당 충전량, 차원 이름)
+# 시계는 Redis TIME 을 써서 서버 간 시각 차이에 영향받지 않게 한다.
+TOKEN_BUCKET_LUA = """
+local n = #KEYS - 1
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+
+local tokens = {}
+local denied = nil
+local wait = 0
+for i = 1, n do
+    local capacity = tonumber(ARGV[3 * i - 2])
+    local rate = tonumber(ARGV[3 * i - 1])
+    local state = redis.call('HMGET', KEYS[i], 'tokens', 'ts')
+    local current = tonumber(state[1])
+    local ts = tonumber(state[2])
+    if current == nil then
+        current = capacity
+        ts = now
+    end
+    current = math.min(capacity, current + math.max(0, now - ts) * rate)
+    tokens[i] = current
+    if current < 1 then
+        local needed = (1 - current) / rate
+        if needed > wait then
+            wait = needed
+            denied = ARGV[3 * i]
+        end
+    end
+end
+
+local allowed = 1
+if denied then
+    allowed = 0
+end
+for i = 1, n do
+    local capacity = tonumber(ARGV[3 * i - 2])
+    local rate = tonumber(ARGV[3 * i - 1])
+    redis.call('HSET', KEYS[i], 'tokens', tokens[i] - allowed, 'ts', now)
+    redis.call('PEXPIRE', KEYS[i], math.ceil(capacity / rate * 1000) + 1000)
+end
+
+if allowed == 1 then
+    redis.call('HINCRBY', KEYS[n + 1], 'allowed', 1)
+else
+    redis.call('HINCRBY', KEYS[n + 1], 'denied:' .. denied, 1)
+end
+return {allowed, tostring(wait), denied or ''}
+"""
+
+_script = None
+
+
+def _redis():
+    return get_redis_connection("default")
+
+
+def _bucket_script():
+    global _script
+    if _script is None:
+        _script = _redis().register_script(TOKEN_BUCKET_LUA)
+    return _script
+
+
+def throttle_metrics() -> dict[str, dict[str, int]]:
+    """scope 별 허용/거절(차원별) 횟수"""
+    scopes = list(settings.TOKEN_BUCKET_RATES)
+    pipe = _redis().pipeline(transaction=False)
+    for scope in scopes:
+        pipe.hgetall(f"{METRICS_PREFIX}{scope}")
+    return {
+        scope: {field.decode(): int(value) for field, value in counters.items()}
+        for scope, counters in zip(scopes, pipe.execute())
+    }
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """
+    Redis 토큰 버킷 기반 요청 제한. scope 별로 settings.TOKEN_BUCKET_RATES 에
+    차원(ip / email / route)마다 (버스트 용량, 초당 충전 토큰 수)를 지정한다.
+
+    - ip: 클라이언트 IP 별. REST_FRAMEWORK["NUM_PROXIES"] 만큼의 프록시가 붙인 X-Forwarded-For 값만 믿는다
+    - email: 요청 본문의 email 별 (여러 IP 에서 한 계정을 노리는 경우)
+    - route: 엔드포인트 전체 합계 (비밀번호 해시 등 CPU 를 쓰는 작업의 총량 상한)
+
+    뷰 본문보다 먼저 실행되므로 해시 계산 전에 요청을 걸러낸다. Redis 장애 시에는 요청을 막지 않는다.
+    """
+
+    scope = None
+
+    def __init__(self):
+        self._wait = None
+
+    def get_rates(self) -> dict[str, tuple[int, float]]:
+        return settings.TOKEN_BUCKET_RATES[self.scope]
+
+    def get_email(self, request) -> str | None:
+        try:
+            email = request.data.get("email")
+        except (ParseError, AttributeError):
+            return None
+        if not isinstance(email, str) or not email.strip():
+            return None
+        return email.strip().lower()
+
+    def get_bucket_ident(self, dimension: str, request, view) -> str | None:
+        if dimension == "ip":
+            return self.get_ident(request)
+        if dimension == "email":
+            email = self.get_email(request)
+            # 키에 이메일 원문을 남기지 않음
+            return hashlib.sha1(email.encode()).hexdigest() if email else None
+        if dimension == "route":
+            match = getattr(request, "resolver_match", None)
+            return match.view_name if match and match.view_name else request.path
+        raise ValueError(f"unknown throttle dimension: {dimension}")
+
+    def allow_request(self, request, view):
+        keys, args = [], []
+        for dimension, (capacity, refill_rate) in self.get_rates().items():
+            ident = self.get_bucket_ident(dimension, request, view)
+            if ident is None:
+                continue
+            keys.append(f"{BUCKET_PREFIX}{self.scope}:{dimension}:{ident}")
+            args += [capacity, refill_rate, dimension]
+        if not keys:
+            return True
+
+        try:
+            allowed, wait, denied_by = _bucket_script()(
+                keys=[*keys, f"{METRICS_PREFIX}{self.scope}"], args=args, client=_redis()
+            )
+        except Exception:
+            logger.warning("token bucket throttle unavailable; allowing request", exc_info=True)
+            return True
+
+        if not allowed:
+            if isinstance(denied_by, bytes):
+                denied_by = denied_by.decode()
+            logger.info("throttled %s by %s bucket", self.scope, denied_by)
+        self._wait = float(wait)
+        return bool(allowed)
+
+    def wait(self):
+        return self._wait
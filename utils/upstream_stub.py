@@ -0,0 +1,171 @@
+import json
+import threading
+import time
+from fnmatch import fnmatchcase
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+def _naver_token(path: str, query: dict, body: dict, payments: dict) -> tuple[int, dict]:
+    if not query.get("code"):
+        return 200, {"error": "invalid_request", "error_description": "no code"}
+    return 200, {
+        "access_token": f"stub-access-{query['code']}",
+        "refresh_token": f"stub-refresh-{query['code']}",
+        "token_type": "bearer",
+        "expires_in": "3600",
+    }
+
+
+def _naver_profile(path: str, query: dict, body: dict, payments: dict) -> tuple[int, dict]:
+    return 200, {
+        "resultcode": "00",
+        "message": "success",
+        "response": {
+            "id": "stub-naver-id",
+            "email": "naver-stub@obestore.local",
+            "name": "네이버스텁",
+            "nickname": "naverstub",
+            "mobile": "010-0000-0000",
+        },
+    }
+
+
+def _toss_confirm(path: str, query: dict, body: dict, payments: dict) -> tuple[int, dict]:
+    payment_key = body.get("paymentKey") or ""
+    if not (payment_key and body.get("orderId") and body.get("amount")):
+        return 400, {"code": "INVALID_REQUEST", "message": "필수 파라미터 누락"}
+    # "fail" 로 시작하는 paymentKey 는 카드사 거절로 응답한다
+    if payment_key.startswith("fail"):
+        return 400, {"code": "REJECT_CARD_PAYMENT", "message": "한도초과 혹은 잔액부족으로 결제에 실패했습니다."}
+    payment = {
+        "paymentKey": payment_key,
+        "orderId": body["orderId"],
+        "status": "DONE",
+        "totalAmount": body["amount"],
+        "receipt": {"url": f"https://stub.tosspayments.local/receipt/{payment_key}"},
+    }
+    # 토스처럼 이미 승인한 paymentKey 를 다시 승인하려 하면 거절한다
+    if payments.setdefault(payment_key, payment) is not payment:
+        return 400, {"code": "ALREADY_PROCESSED_PAYMENT", "message": "이미 처리된 결제 입니다."}
+    return 200, payment
+
+
+def _toss_payment(path: str, query: dict, body: dict, payments: dict) -> tuple[int, dict]:
+    payment = payments.get(path.split("/")[3])
+    if payment is None:
+        return 404, {"code": "NOT_FOUND_PAYMENT", "message": "존재하지 않는 결제 정보 입니다."}
+    return 200, payment
+
+
+def _toss_cancel(path: str, query: dict, body: dict, payments: dict) -> tuple[int, dict]:
+    payment = payments.get(path.split("/")[3])
+    if payment is not None:
+        payment["status"] = "CANCELED"
+    return 200, {"status": "CANCELED", "cancels": [{"cancelReason": body.get("cancelReason", "")}]}
+
+
+# (method, path) -> handler(path, query, body, payments) -> (status, json). path 에는 * 를 쓸 수 있다
+# payments 는 스텁 서버마다 따로 두는 승인 내역 (paymentKey -> 결제 객체)
+ROUTES = {
+    ("GET", "/oauth2.0/token"): _naver_token,
+    ("GET", "/v1/nid/me"): _naver_profile,
+    ("POST", "/v1/payments/confirm"): _toss_confirm,
+    ("GET", "/v1/payments/*"): _toss_payment,
+    ("POST", "/v1/payments/*/cancel"): _toss_cancel,
+}
+
+
+def _route(method: str, path: str):
+    handler = ROUTES.get((method, path))
+    if handler is not None:
+        return handler
+    for (route_method, pattern), handler in ROUTES.items():
+        if route_method == method and fnmatchcase(path, pattern):
+            return handler
+    return None
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    def _dispatch(self, method: str):
+        parsed = urlparse(self.path)
+        handler = _route(method, parsed.path)
+        if handler is None:
+            status, payload = 404, {"error": "not_found"}
+        else:
+            query = {key: values[0] for key, values in parse_qs(parsed.query).items()}
+            length = int(self.headers.get("Content-Length") or 0)
+            body = json.loads(self.rfile.read(length) or b"{}") if length else {}
+            status, payload = handler(parsed.path, query, body, self.server.payments)
+
+        # 처리는 먼저 하고 응답만 늦춘다. 클라이언트가 타임아웃으로 끊어도 승인은 된 상태로 남는다
+        if self.server.latency:
+            time.sleep(self.server.latency)
+
+        data = json.dumps(payload, ensure_ascii=False).encode()
+        try:
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class UpstreamStub:
+    """
+    외부 API(네이버 OAuth, 토스페이먼츠 결제 승인/조회/취소)를 흉내 내는 로컬 HTTP 서버.
+    latency 초만큼 응답을 지연시켜 업스트림이 느릴 때 워커가 묶이는지 측정할 때 사용한다.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency: float = 0.0, verbose: bool = False):
+        self._server = ThreadingHTTPServer((host, port), _StubHandler)
+        self._server.daemon_threads = True
+        self._server.latency = latency
+        self._server.verbose = verbose
+        self._server.payments = {}
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def payments(self) -> dict:
+        return self._server.payments
+
+    @property
+    def latency(self) -> float:
+        return self._server.latency
+
+    @latency.setter
+    def latency(self, value: float):
+        self._server.latency = value
+
+    def start(self):
+        threading.Thread(target=self._server.serve_forever, name="upstream-stub", daemon=True).start()
+        return self
+
+    def serve_forever(self):
+        self._server.serve_forever()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-19 18:28
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0003_product_rating_counters'),
+        ('wishlists', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='wishlist',
+            index=models.Index(fields=['user', '-created_at', '-id'], name='wishlist_user_created_idx'),
+        ),
+    ]
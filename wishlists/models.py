@@ -13,6 +13,7 @@ class Wishlist(TimestampModel):
         verbose_name = "찜"
         verbose_name_plural = "찜 목록"
         constraints = [models.UniqueConstraint(fields=["user", "product"], name="unique_user_product")]
+        indexes = [models.Index(fields=["user", "-created_at", "-id"], name="wishlist_user_created_idx")]
 
     def __str__(self):
         return f"[찜] {self.user.nickname} - {self.product.product_name}"
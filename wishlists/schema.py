@@ -1,4 +1,5 @@
-from drf_spectacular.utils import OpenApiResponse, extend_schema
+from drf_spectacular.utils import OpenApiResponse, extend_schema, inline_serializer
+from rest_framework import serializers
 
 from wishlists.serializers import WishlistSerializer
 
@@ -7,7 +8,16 @@ wishlists_schema = {
         summary="찜 목록 추가", description="상품을 찜 목록에 추가합니다.", responses=OpenApiResponse(WishlistSerializer)
     ),
     "list": extend_schema(
-        summary="찜 목록 조회", description="찜 목록을 조회합니다.", responses=OpenApiResponse(WishlistSerializer)
+        summary="찜 목록 조회",
+        description="찜 목록을 최근에 찜한 순으로 조회합니다. 커서 페이지네이션(next/previous)을 사용합니다.",
+        responses=OpenApiResponse(WishlistSerializer),
+    ),
+    "ids": extend_schema(
+        summary="찜한 상품 id 목록",
+        description="찜한 상품 id 만 돌려줍니다. 상품 카드의 찜 표시를 한 번에 채울 때 사용합니다.",
+        responses=inline_serializer(
+            name="WishlistIds", fields={"product_ids": serializers.ListField(child=serializers.IntegerField())}
+        ),
     ),
     "destroy": extend_schema(
         summary="찜 목록 삭제", description="찜 목록을 삭제합니다.", responses=OpenApiResponse(WishlistSerializer)
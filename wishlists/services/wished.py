@@ -0,0 +1,137 @@
+import logging
+
+from django.conf import settings
+from django.db import transaction
+from django_redis import get_redis_connection
+
+from utils.db_router import read_from_primary
+from wishlists.models import Wishlist
+
+logger = logging.getLogger(__name__)
+
+WISHED_KEY_PREFIX = "wishlists:wished:"
+WISHED_GENERATION_PREFIX = "wishlists:wished-gen:"
+# 찜이 하나도 없는 유저도 "집합이 만들어져 있음"을 알 수 있게 항상 넣어 두는 값 (상품 id 는 1부터)
+SENTINEL = "0"
+
+# 찜이 바뀔 때마다 generation 을 올리고, 집합이 이미 만들어져 있을 때만 추가/삭제한다.
+# 키가 없을 때 SADD 하면 센티널 없이 일부만 담긴 집합이 생겨 나머지 찜이 빠진 것으로 보이기 때문
+# KEYS = 집합, generation / ARGV = SADD|SREM, 상품 id, TTL
+UPDATE_LUA = """
+redis.call('INCR', KEYS[2])
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return 0
+end
+redis.call(ARGV[1], KEYS[1], ARGV[2])
+redis.call('EXPIRE', KEYS[1], ARGV[3])
+return 1
+"""
+
+# DB 를 읽기 전에 본 generation 이 그대로일 때만 집합을 새로 쓴다. 읽는 사이에 찜이 바뀌었으면
+# (키가 없어 UPDATE_LUA 도 건너뛰었으므로) 지난 값으로 덮어쓰지 않고 다음 조회에서 다시 만든다.
+# KEYS = 집합, generation / ARGV = 읽기 전 generation, TTL, 센티널과 상품 id...
+REBUILD_LUA = """
+if (redis.call('GET', KEYS[2]) or '0') ~= ARGV[1] then
+    return 0
+end
+redis.call('DEL', KEYS[1])
+for i = 3, #ARGV do
+    redis.call('SADD', KEYS[1], ARGV[i])
+end
+redis.call('EXPIRE', KEYS[1], ARGV[2])
+return 1
+"""
+
+_scripts = {}
+
+
+def _redis():
+    return get_redis_connection("default")
+
+
+def _run_script(redis, lua: str, keys, args):
+    script = _scripts.get(lua)
+    if script is None:
+        script = _scripts[lua] = redis.register_script(lua)
+    return script(keys=keys, args=args, client=redis)
+
+
+def _key(user_id) -> str:
+    return f"{WISHED_KEY_PREFIX}{user_id}"
+
+
+def _generation_key(user_id) -> str:
+    return f"{WISHED_GENERATION_PREFIX}{user_id}"
+
+
+def _ttl() -> int:
+    return getattr(settings, "WISHED_PRODUCT_IDS_TTL", 60 * 60 * 24)
+
+
+def _rebuild(redis, user_id) -> set[int]:
+    generation = (redis.get(_generation_key(user_id)) or b"0").decode()
+    # 복제본 조회 중이라도 지연된 값으로 캐시를 채우지 않도록 primary 에서 읽는다
+    with read_from_primary():
+        product_ids = set(Wishlist.objects.filter(user_id=user_id).values_list("product_id", flat=True))
+    _run_script(
+        redis, REBUILD_LUA, [_key(user_id), _generation_key(user_id)], [generation, _ttl(), SENTINEL, *product_ids]
+    )
+    return product_ids
+
+
+def wished_product_ids(user_id) -> set[int]:
+    """유저가 찜한 상품 id 전체. 집합이 없으면 DB 에서 다시 만든다."""
+    try:
+        redis = _redis()
+        members = redis.smembers(_key(user_id))
+        if not members:
+            return _rebuild(redis, user_id)
+        return {int(member) for member in members} - {int(SENTINEL)}
+    except Exception:
+        logger.warning("wished product id cache unavailable; reading wishlist from db", exc_info=True)
+        return set(Wishlist.objects.filter(user_id=user_id).values_list("product_id", flat=True))
+
+
+def wished_among(user_id, product_ids) -> set[int]:
+    """
+    product_ids 중 유저가 찜한 id 집합. SMISMEMBER 한 번으로 목록 전체를 확인한다.
+    집합이 없으면 DB 에서 다시 만들고, Redis 를 쓸 수 없으면 DB 에서 목록 범위만 조회한다.
+    """
+    product_ids = list(dict.fromkeys(product_ids))
+    if not product_ids:
+        return set()
+    key = _key(user_id)
+    try:
+        redis = _redis()
+        pipe = redis.pipeline(transaction=False)
+        pipe.exists(key)
+        pipe.smismember(key, product_ids)
+        exists, flags = pipe.execute()
+        if not exists:
+            return _rebuild(redis, user_id) & set(product_ids)
+        return {product_id for product_id, flag in zip(product_ids, flags) if flag}
+    except Exception:
+        logger.warning("wished product id cache unavailable; reading wishlist from db", exc_info=True)
+        return set(
+            Wishlist.objects.filter(user_id=user_id, product_id__in=product_ids).values_list("product_id", flat=True)
+        )
+
+
+def _update(command: str, user_id, product_id) -> None:
+    try:
+        _run_script(_redis(), UPDATE_LUA, [_key(user_id), _generation_key(user_id)], [command, product_id, _ttl()])
+    except Exception:
+        # 반영하지 못했으면 집합을 지워 다음 조회 때 DB 에서 다시 만들게 한다
+        logger.warning("failed to %s wished product %s for user %s", command, product_id, user_id, exc_info=True)
+        try:
+            _redis().delete(_key(user_id))
+        except Exception:
+            logger.warning("failed to drop wished product ids for user %s", user_id, exc_info=True)
+
+
+def add_wished(user_id, product_id) -> None:
+    transaction.on_commit(lambda: _update("SADD", user_id, product_id), robust=True)
+
+
+def remove_wished(user_id, product_id) -> None:
+    transaction.on_commit(lambda: _update("SREM", user_id, product_id), robust=True)
@@ -0,0 +1,11 @@
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from wishlists.models import Wishlist
+from wishlists.services.wished import remove_wished
+
+
+@receiver(post_delete, sender=Wishlist)
+def remove_wished_on_delete(sender, instance: Wishlist, **kwargs):
+    # 찜 취소뿐 아니라 상품/유저 삭제(cascade), 관리자 삭제로 지워진 찜도 캐시된 id 집합에서 뺀다
+    remove_wished(instance.user_id, instance.product_id)
@@ -1 +1,153 @@
-# Create your tests here.
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from products.models import Brand, BrandImage, Category, Product, ProductImage, Tag
+from users.models import User
+from utils.redis_stub import REDIS_STUB_CACHES
+from wishlists.models import Wishlist
+from wishlists.services import wished
+
+
+# dev 설정의 S3 대신 로컬 저장소로 이미지 URL 을 만든다
+@override_settings(
+    STORAGES={
+        "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+        "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+    }
+)
+class WishlistListQueryTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email="wish@example.com", password="1234", nickname="wish", username="찜")
+        self.other = User.objects.create_user(
+            email="other@example.com", password="1234", nickname="other", username="다른"
+        )
+        self.category = Category.objects.create(category_name="카테고리")
+        self.tag = Tag.objects.create(tag_name="태그")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def _wish_products(self, count):
+        for _ in range(count):
+            index = Product.objects.count()
+            brand = Brand.objects.create(brand_name=f"브랜드{index}")
+            BrandImage.objects.create(brand=brand, brand_image="brands/sample.jpg")
+            product = Product.objects.create(
+                product_name=f"상품{index}",
+                product_value="1000",
+                product_stock="5",
+                category=self.category,
+                tag=self.tag,
+                brand=brand,
+            )
+            ProductImage.objects.create(
+                product=product, product_card_image="products/card.jpg", product_explain_image="products/explain.jpg"
+            )
+            Wishlist.objects.create(user=self.user, product=product)
+            Wishlist.objects.create(user=self.other, product=product)
+
+    def _list_queries(self, params=None):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get("/users/me/wishlist/", params or {})
+        self.assertEqual(response.status_code, 200)
+        return response, len(ctx.captured_queries)
+
+    def test_list_query_count_does_not_grow_with_rows(self):
+        """찜한 상품 수가 늘어나도 찜 목록 쿼리 수가 같고, 찜 수/찜 여부가 맞는지 확인"""
+        self._wish_products(2)
+        response, small = self._list_queries()
+        self.assertEqual(len(response.data["results"]), 2)
+
+        self._wish_products(6)
+        response, large = self._list_queries()
+        self.assertEqual(len(response.data["results"]), 8)
+        self.assertEqual(small, large)
+
+        product = response.data["results"][0]["product"]
+        self.assertEqual(product["product_name"], "상품7")
+        self.assertEqual(product["wishes"], 2)
+        self.assertTrue(product["is_wished"])
+        self.assertEqual(product["brand_name"], "브랜드7")
+        self.assertEqual(len(product["product_image"]), 1)
+        self.assertEqual(len(product["brand_image"]), 1)
+
+    def test_cursor_pagination(self):
+        """page_size 로 나눠 받고 next 커서로 나머지를 이어 받는지 확인"""
+        self._wish_products(3)
+        response, _ = self._list_queries({"page_size": 2})
+        self.assertEqual(len(response.data["results"]), 2)
+        next_page = self.client.get(response.data["next"])
+        self.assertEqual(len(next_page.data["results"]), 1)
+        self.assertIsNone(next_page.data["next"])
+
+
+@override_settings(
+    STORAGES={
+        "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+        "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+    },
+    CACHES=REDIS_STUB_CACHES,
+)
+class WishedProductIdsTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            email="ids@example.com", password="1234", nickname="ids", username="아이디"
+        )
+        self.products = [
+            Product.objects.create(product_name=f"상품{i}", product_value="1000", product_stock="5") for i in range(3)
+        ]
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_ids_follow_wishlist_changes(self):
+        """찜 추가/삭제가 id 목록과 상품 목록/상세의 찜 표시에 반영되는지 확인"""
+        first, second, third = self.products
+        self._wish(first)
+        self.assertEqual(self.client.get("/users/me/wishlist/ids/").data, {"product_ids": [first.pk]})
+        # 집합이 만들어진 뒤의 추가/삭제는 커밋 후 그 자리에서 반영된다
+        self._wish(third)
+        self.assertEqual(self.client.get("/users/me/wishlist/ids/").data, {"product_ids": [first.pk, third.pk]})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(self.client.delete(f"/users/me/wishlist/{third.pk}/").status_code, 204)
+        self.assertEqual(self.client.get("/users/me/wishlist/ids/").data, {"product_ids": [first.pk]})
+
+        response = self.client.get("/products/")
+        flags = {item["id"]: item["is_wished"] for item in response.data}
+        self.assertEqual(flags, {first.pk: True, second.pk: False, third.pk: False})
+        self.assertTrue(self.client.get(f"/products/{first.pk}/").data["is_wished"])
+        self.assertFalse(APIClient().get("/products/").data[0]["is_wished"])
+
+    def test_stale_rebuild_does_not_overwrite_later_change(self):
+        """DB 를 읽는 사이에 찜이 바뀌면 그 전에 읽은 목록으로 집합을 채우지 않는지 확인"""
+        product = self.products[0]
+        redis = wished._redis()
+        keys = [wished._key(self.user.pk), wished._generation_key(self.user.pk)]
+        # 집합이 없는 상태에서 다시 만들기 시작해 빈 찜 목록을 읽어 둔 시점
+        generation = (redis.get(keys[1]) or b"0").decode()
+
+        self._wish(product)
+        written = wished._run_script(redis, wished.REBUILD_LUA, keys, [generation, 60, wished.SENTINEL])
+
+        self.assertEqual(written, 0)
+        self.assertFalse(redis.exists(keys[0]))
+        self.assertEqual(self.client.get("/users/me/wishlist/ids/").data, {"product_ids": [product.pk]})
+
+    def test_cascade_delete_removes_wished_id(self):
+        """찜 취소 API 밖에서(상품 삭제 cascade) 지워진 찜도 id 목록에서 빠지는지 확인"""
+        first, second, _ = self.products
+        self._wish(first)
+        self._wish(second)
+        self.assertEqual(self.client.get("/users/me/wishlist/ids/").data, {"product_ids": [first.pk, second.pk]})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            second.delete()
+        self.assertEqual(self.client.get("/users/me/wishlist/ids/").data, {"product_ids": [first.pk]})
+
+    def _wish(self, product):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post("/users/me/wishlist/", {"product_id": product.pk})
+        self.assertEqual(response.status_code, 201)
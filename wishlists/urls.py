@@ -4,9 +4,11 @@ from django.urls import path
 from .views import WishlistViewSet
 
 wishlist = WishlistViewSet.as_view({"get": "list", "post": "create"})
+wishlist_ids = WishlistViewSet.as_view({"get": "ids"})
 wishlist_detail = WishlistViewSet.as_view({"delete": "destroy"})
 
 urlpatterns = [
     path("users/me/wishlist/", wishlist, name="wishlist-list"),
+    path("users/me/wishlist/ids/", wishlist_ids, name="wishlist-ids"),
     path("users/me/wishlist/<int:pk>/", wishlist_detail, name="wishlist-delete"),
 ]
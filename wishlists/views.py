@@ -1,24 +1,43 @@
 # wishlist/views.py
+from django.db.models import Count, Prefetch
 from rest_framework import permissions, status, viewsets
 from rest_framework.response import Response
 
 from products.models import Product
+from utils.paginations import CreatedAtCursorPagination
 
 from .models import Wishlist
 from .schema import wishlists_schema
 from .serializers import WishlistSerializer
+from .services.wished import add_wished, wished_product_ids
 
 
 class WishlistViewSet(viewsets.ViewSet):
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = WishlistSerializer
 
+    def get_queryset(self):
+        # 중첩된 ProductListSerializer 가 쓰는 연관 객체와 찜 수를 페이지 크기와 상관없이 고정된 쿼리 수로 가져온다
+        products = (
+            Product.objects.select_related("category", "tag", "brand")
+            .prefetch_related("product_images", "brand__brand_images")
+            .annotate(wish_count=Count("wishlist_relations"))
+        )
+        return Wishlist.objects.filter(user=self.request.user).prefetch_related(Prefetch("product", queryset=products))
+
     # GET /users/me/wishlist
     @wishlists_schema["list"]
     def list(self, request):
-        queryset = Wishlist.objects.filter(user=request.user)
-        serializer = WishlistSerializer(queryset, many=True, context={"request": request})
-        return Response(serializer.data)
+        paginator = CreatedAtCursorPagination()
+        page = paginator.paginate_queryset(self.get_queryset(), request, view=self)
+        # 내 찜 목록의 상품은 모두 찜한 상품이므로 상품마다 찜 여부를 조회하지 않는다
+        serializer = WishlistSerializer(page, many=True, context={"request": request, "is_wished": True})
+        return paginator.get_paginated_response(serializer.data)
+
+    # GET /users/me/wishlist/ids
+    @wishlists_schema["ids"]
+    def ids(self, request):
+        return Response({"product_ids": sorted(wished_product_ids(request.user.pk))})
 
     # POST /users/me/wishlist
     @wishlists_schema["create"]
@@ -48,6 +67,7 @@ class WishlistViewSet(viewsets.ViewSet):
                 {"type": "Conflict", "detail": "이미 찜 목록에 있음"},
                 status=status.HTTP_409_CONFLICT,
             )
+        add_wished(request.user.pk, int(product_id))
 
         return Response(
             {"CreateSuccess": True},
@@ -59,7 +79,7 @@ class WishlistViewSet(viewsets.ViewSet):
     def destroy(self, request, pk=None):
         try:
             wishlist_item = Wishlist.objects.get(product_id=pk, user=request.user)
-            wishlist_item.delete()
+            wishlist_item.delete()  # 캐시된 id 집합은 post_delete 시그널이 갱신한다
             return Response(status=status.HTTP_204_NO_CONTENT)
         except Wishlist.DoesNotExist:
             return Response(